@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+"""
+Fingerprinted, precompressed static assets
+
+The build step copies every file under static/ to STATIC_BUILD_DIR under a
+content-hashed name (css/style.css -> css/style.1a2b3c4d5e6f.css), writes
+gzip and (when the brotli package is installed) brotli variants of text
+assets next to it, and records the mapping in manifest.json. AssetFiles
+serves hashed names with `Cache-Control: immutable`, a strong ETag and the
+best precompressed variant for the request's Accept-Encoding; unhashed
+paths fall back to plain StaticFiles. Templates link assets through
+asset_url() so every deploy busts exactly the files that changed.
+
+The build runs on startup whenever a source file is newer than the
+manifest, or explicitly with:
+
+    python assets.py
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are built without it
+    brotli = None
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).parent / "static"
+STATIC_URL = "/static"
+MANIFEST_NAME = "manifest.json"
+
+# Content hash characters kept in file names
+HASH_LENGTH = 12
+
+# Text formats worth precompressing (images are already compressed)
+COMPRESSIBLE_SUFFIXES = {
+    ".css",
+    ".js",
+    ".json",
+    ".svg",
+    ".txt",
+    ".html",
+    ".ico",
+    ".webmanifest",
+}
+
+# Variants smaller than this fraction of the original are kept
+MIN_COMPRESSION_RATIO = 0.9
+
+# Accept-Encoding token -> file suffix, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+
+
+@dataclass(frozen=True)
+class Asset:
+    """One fingerprinted file and its precompressed variants"""
+
+    source: str  # e.g. "css/style.css"
+    path: str  # e.g. "css/style.1a2b3c4d5e6f.css"
+    digest: str
+    encodings: Tuple[str, ...]
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        """Strong ETag; each encoding is a distinct representation"""
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+
+def _hashed_name(path: Path, digest: str) -> str:
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write via a temp file so concurrent workers never see partial files"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+def preferred_encoding(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """Pick the best available encoding the client accepts"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(token.strip())
+    for encoding, _ in ENCODINGS:
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return None
+
+
+class StaticAssets:
+    """Builds and looks up fingerprinted assets"""
+
+    def __init__(
+        self,
+        source_dir: Path = STATIC_DIR,
+        build_dir: Optional[str] = None,
+        url_prefix: str = STATIC_URL,
+    ):
+        self.source_dir = Path(source_dir)
+        self.build_dir = Path(build_dir or settings.STATIC_BUILD_DIR)
+        self.url_prefix = url_prefix
+        self.by_source: Dict[str, Asset] = {}
+        self.by_path: Dict[str, Asset] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.build_dir / MANIFEST_NAME
+
+    def _sources(self):
+        for path in sorted(self.source_dir.rglob("*")):
+            if path.is_file() and not path.name.startswith("."):
+                yield path
+
+    def build(self) -> int:
+        """Fingerprint and precompress every source file; returns the count"""
+        files = {}
+        for path in self._sources():
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            relative = path.relative_to(self.source_dir)
+            hashed = relative.parent / _hashed_name(relative, digest)
+            target = self.build_dir / hashed
+            encodings = []
+
+            if not target.exists():
+                write_atomic(target, data)
+            if path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                variants = [("gzip", ".gz", lambda d: gzip.compress(d, 9, mtime=0))]
+                if brotli is not None:
+                    variants.insert(0, ("br", ".br", lambda d: brotli.compress(d, quality=11)))
+                for encoding, suffix, compress in variants:
+                    variant = target.with_name(target.name + suffix)
+                    if not variant.exists():
+                        compressed = compress(data)
+                        if len(compressed) >= len(data) * MIN_COMPRESSION_RATIO:
+                            continue
+                        write_atomic(variant, compressed)
+                    encodings.append(encoding)
+
+            files[relative.as_posix()] = {
+                "path": hashed.as_posix(),
+                "digest": digest,
+                "encodings": encodings,
+            }
+
+        write_atomic(
+            self.manifest_path,
+            json.dumps({"files": files}, indent=2, sort_keys=True).encode(),
+        )
+        self._index(files)
+        return len(files)
+
+    def _index(self, files: Dict[str, Dict]):
+        self.by_source = {
+            source: Asset(source, entry["path"], entry["digest"], tuple(entry["encodings"]))
+            for source, entry in files.items()
+        }
+        self.by_path = {asset.path: asset for asset in self.by_source.values()}
+
+    def is_stale(self) -> bool:
+        """True if there is no manifest or any source changed since the build"""
+        try:
+            built_at = self.manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            return True
+        return any(path.stat().st_mtime > built_at for path in self._sources())
+
+    def load(self):
+        """Load the manifest, rebuilding it first if it is missing or stale"""
+        if self.is_stale():
+            count = self.build()
+            logger.info(f"Built {count} static assets into {self.build_dir}")
+            return
+        self._index(json.loads(self.manifest_path.read_text())["files"])
+
+    def url(self, source: str) -> str:
+        """URL of the fingerprinted asset, or the plain static URL if unknown"""
+        source = source.lstrip("/")
+        asset = self.by_source.get(source)
+        return f"{self.url_prefix}/{asset.path if asset else source}"
+
+    def lookup(self, path: str) -> Optional[Asset]:
+        """Find the asset served at a hashed path"""
+        return self.by_path.get(path.replace(os.sep, "/"))
+
+
+class AssetFiles(StaticFiles):
+    """StaticFiles that serves fingerprinted assets with immutable caching"""
+
+    def __init__(self, assets: StaticAssets, **kwargs):
+        super().__init__(directory=assets.source_dir, **kwargs)
+        self.assets = assets
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self.assets.lookup(path)
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        encoding = preferred_encoding(
+            request_headers.get("accept-encoding", ""), asset.encodings
+        )
+        headers = {
+            "cache-control": IMMUTABLE_CACHE_CONTROL,
+            "etag": asset.etag(encoding),
+            "vary": "Accept-Encoding",
+        }
+        # The name is fingerprinted, so any variant's ETag means unchanged
+        if_none_match = request_headers.get("if-none-match", "")
+        if asset.digest in if_none_match or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+
+        file_path = self.assets.build_dir / asset.path
+        media_type = mimetypes.guess_type(asset.path)[0] or "application/octet-stream"
+        if encoding:
+            suffix = dict(ENCODINGS)[encoding]
+            file_path = file_path.with_name(file_path.name + suffix)
+            headers["content-encoding"] = encoding
+
+        return FileResponse(
+            file_path,
+            media_type=media_type,
+            headers=headers,
+            method=scope["method"],
+        )
+
+
+# Create global static assets instance
+static_assets = StaticAssets()
+
+
+def main():
+    """Command line entry point"""
+    logging.basicConfig(level=logging.INFO)
+    count = static_assets.build()
+    encodings = "gzip and brotli" if brotli is not None else "gzip"
+    logger.info(f"✅ Built {count} static assets ({encodings}) into {static_assets.build_dir}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Conditional GET support for polled JSON endpoints
+
+Handlers derive a weak ETag (and optionally Last-Modified) from something
+cheaper than the response body, typically the inquiry store's change
+counter, and check it before loading or serializing anything:
+
+    etag = weak_etag("inquiries", version.version)
+    cached = not_modified(request, etag, version.changed_at)
+    if cached:
+        return cached
+    set_validators(response, etag, version.changed_at)
+
+ETags are weak because the JSON is equivalent rather than byte-identical
+across workers (key order, float formatting).
+
+Last-Modified has one-second resolution (and the change counter's timestamp
+may too), so a second write in the same second would leave it unchanged. It
+is therefore only sent once its second has passed: any client holding a
+Last-Modified date then fetched after every write in that second, and a
+later write always moves the date forward. Until then clients revalidate
+with the ETag alone.
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Clients may keep a copy but must revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+# How old a modification time must be before it is used as a validator: its
+# own second plus slack for clock differences between database and app
+LAST_MODIFIED_SETTLE = timedelta(seconds=2)
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from version components"""
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in (_opaque(tag) for tag in if_none_match.split(","))
+
+
+def settled(last_modified: Optional[datetime]) -> bool:
+    """True if no further write can share last_modified's second"""
+    return (
+        last_modified is not None
+        and datetime.now(timezone.utc) - last_modified >= LAST_MODIFIED_SETTLE
+    )
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"etag": etag, "cache-control": CACHE_CONTROL}
+    if settled(last_modified):
+        headers["last-modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def set_validators(
+    response: Response, etag: str, last_modified: Optional[datetime] = None
+):
+    """Attach ETag, Last-Modified and Cache-Control to a response"""
+    response.headers.update(validator_headers(etag, last_modified))
+
+
+def not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """
+    Return a 304 response if the client's copy is still current, else None
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    it is absent, to whole-second precision, and once last_modified has
+    settled (see LAST_MODIFIED_SETTLE).
+    """
+    headers = validator_headers(etag, last_modified)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and settled(last_modified):
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is not None and last_modified.replace(microsecond=0) <= since:
+            return Response(status_code=304, headers=headers)
+    return None
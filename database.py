@@ -2,28 +2,94 @@
 Database configuration and session management
 """
 
-from sqlalchemy import create_engine
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Enum, create_engine, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
 
+# Async drivers used for each sync database URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """Connection pool options from settings, shared by both engines"""
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if _is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
+def async_database_url(url: str) -> str:
+    """Translate a sync DATABASE_URL into its async driver equivalent"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=(
-        {"check_same_thread": False}
-        if settings.DATABASE_URL.startswith("sqlite")
-        else {}
-    ),
-)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory, created on first use so sync-only tools
+# (init_db.py, lead_scoring.py) do not need the async drivers installed
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
 # Create base class for models
 Base = declarative_base()
 
 
+def get_async_engine() -> AsyncEngine:
+    """Return the shared async engine, creating it on first use"""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL),
+            **engine_options(settings.DATABASE_URL),
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    """Open a new async session on the shared async engine"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory()
+
+
+async def dispose_async_engine():
+    """Close pooled async connections (call on shutdown)"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
 def get_db():
     """
     Dependency to get database session
@@ -36,11 +102,56 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency to get an async database session
+    Yields async session and closes it after use
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def upgrade_schema(engine: Engine):
+    """
+    Bring an existing database up to date with the models (idempotent)
+
+    create_all() only creates missing tables, so indexes added to existing
+    tables are created here, and on PostgreSQL new enum members are added to
+    their native enum types.
+    """
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+    if engine.dialect.name != "postgresql":
+        return  # Other backends store enums as plain strings
+
+    enum_types = {
+        column.type.name: column.type
+        for table in Base.metadata.sorted_tables
+        for column in table.columns
+        if isinstance(column.type, Enum) and column.type.native_enum
+    }
+    # ADD VALUE cannot run inside a transaction block before PostgreSQL 12
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        quote = conn.dialect.identifier_preparer.quote
+        for name, enum_type in enum_types.items():
+            for value in enum_type.enums:
+                literal = value.replace("'", "''")
+                conn.execute(text(f"ALTER TYPE {quote(name)} ADD VALUE IF NOT EXISTS '{literal}'"))
+
+
 def init_db():
     """
-    Initialize database by creating all tables
+    Initialize database by creating all tables and upgrading existing ones
     """
-    from models import ContactInquiry, EmailLog  # Import models to register them
+    from models import ContactInquiry, EmailLog, EmailJob, ChangeCounter  # Import models to register them
+    from inquiry_store import install_change_counter
+    from search import install_search_index
 
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    install_search_index(engine)
+    install_change_counter(engine)
     print("Database tables created successfully!")
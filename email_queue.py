@@ -0,0 +1,225 @@
+"""
+Background email delivery queue
+
+Submissions queue notification and confirmation jobs as EmailJob rows (in
+the same transaction as the inquiry, see InquiryStore.create_many), and a
+pool of asyncio workers drains them off the request path. SMTP sends run in
+the threadpool, failed deliveries are retried with exponential backoff, and
+because jobs live in the database they survive restarts and are shared by
+every worker process.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from database import AsyncSessionLocal, SessionLocal
+from email_service import EmailService, email_service
+from models import ContactInquiry, EmailJob, EmailJobStatus
+
+logger = logging.getLogger(__name__)
+
+INQUIRY_EMAIL_TYPES = ("inquiry_notification", "inquiry_confirmation")
+
+
+class EmailQueue:
+    """Database-backed email job queue with an asyncio worker pool"""
+
+    def __init__(
+        self,
+        service: EmailService = email_service,
+        session_factory: sessionmaker = SessionLocal,
+        async_session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    ):
+        self.service = service
+        self.session_factory = session_factory
+        self.async_session_factory = async_session_factory
+        self.workers = settings.EMAIL_QUEUE_WORKERS
+        self.max_attempts = settings.EMAIL_QUEUE_MAX_ATTEMPTS
+        self.retry_base_seconds = settings.EMAIL_QUEUE_RETRY_BASE_SECONDS
+        self.poll_seconds = settings.EMAIL_QUEUE_POLL_SECONDS
+        self.lock_timeout = timedelta(seconds=settings.EMAIL_QUEUE_LOCK_TIMEOUT_SECONDS)
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    # ---- Producer side ----
+
+    async def enqueue(
+        self, inquiry_id: int, email_types: Iterable[str] = INQUIRY_EMAIL_TYPES
+    ) -> List[int]:
+        """Persist delivery jobs for an inquiry and wake the workers"""
+        now = datetime.now()
+        async with self.async_session_factory() as db:
+            jobs = [
+                EmailJob(
+                    email_type=email_type,
+                    inquiry_id=inquiry_id,
+                    status=EmailJobStatus.PENDING,
+                    attempts=0,
+                    next_attempt_at=now,
+                )
+                for email_type in email_types
+            ]
+            db.add_all(jobs)
+            await db.commit()
+            job_ids = [job.id for job in jobs]
+
+        self.notify()
+        return job_ids
+
+    def notify(self):
+        """Wake idle workers in this process to pick up newly queued jobs"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def depth(self) -> int:
+        """Number of jobs still waiting to be delivered"""
+        async with self.async_session_factory() as db:
+            return await db.scalar(
+                select(func.count(EmailJob.id)).where(
+                    EmailJob.status.in_(
+                        [EmailJobStatus.PENDING, EmailJobStatus.SENDING]
+                    )
+                )
+            ) or 0
+
+    # ---- Consumer side ----
+
+    def recover(self):
+        """Return jobs abandoned mid-send (e.g. by a crashed worker) to the queue"""
+        cutoff = datetime.now() - self.lock_timeout
+        with self.session_factory() as db:
+            result = db.execute(
+                update(EmailJob)
+                .where(
+                    EmailJob.status == EmailJobStatus.SENDING,
+                    EmailJob.locked_at < cutoff,
+                )
+                .values(status=EmailJobStatus.PENDING, locked_at=None)
+            )
+            db.commit()
+            if result.rowcount:
+                logger.warning(f"Requeued {result.rowcount} stalled email jobs")
+
+    def claim(self) -> Optional[int]:
+        """Atomically take the oldest due job, returning its id"""
+        now = datetime.now()
+        with self.session_factory() as db:
+            candidates = db.scalars(
+                select(EmailJob.id)
+                .where(
+                    EmailJob.status == EmailJobStatus.PENDING,
+                    EmailJob.next_attempt_at <= now,
+                )
+                .order_by(EmailJob.next_attempt_at)
+                .limit(self.workers)
+            ).all()
+
+            for job_id in candidates:
+                # Only one worker (in any process) wins the status transition
+                result = db.execute(
+                    update(EmailJob)
+                    .where(
+                        EmailJob.id == job_id,
+                        EmailJob.status == EmailJobStatus.PENDING,
+                    )
+                    .values(status=EmailJobStatus.SENDING, locked_at=now)
+                )
+                db.commit()
+                if result.rowcount:
+                    return job_id
+        return None
+
+    def deliver(self, job_id: int) -> bool:
+        """Send a claimed job and record the outcome on it"""
+        with self.session_factory() as db:
+            job = db.get(EmailJob, job_id)
+            inquiry = db.get(ContactInquiry, job.inquiry_id)
+            job.attempts = (job.attempts or 0) + 1
+
+            error = None
+            try:
+                if inquiry is None:
+                    raise LookupError(f"Inquiry {job.inquiry_id} not found")
+                if job.email_type == "inquiry_notification":
+                    success = self.service.send_inquiry_notification_to_admin(inquiry, db)
+                elif job.email_type == "inquiry_confirmation":
+                    success = self.service.send_inquiry_confirmation(inquiry, db)
+                else:
+                    raise ValueError(f"Unknown email type: {job.email_type}")
+                if not success:
+                    error = "SMTP delivery failed"
+            except Exception as e:
+                success = False
+                error = str(e)
+
+            now = datetime.now()
+            job.locked_at = None
+            if success:
+                job.status = EmailJobStatus.SENT
+                job.completed_at = now
+                job.last_error = None
+            elif job.attempts >= self.max_attempts:
+                job.status = EmailJobStatus.FAILED
+                job.completed_at = now
+                job.last_error = error
+                logger.error(f"Email job #{job.id} failed permanently: {error}")
+            else:
+                delay = self.retry_base_seconds * 2 ** (job.attempts - 1)
+                job.status = EmailJobStatus.PENDING
+                job.next_attempt_at = now + timedelta(seconds=delay)
+                job.last_error = error
+                logger.warning(
+                    f"Email job #{job.id} attempt {job.attempts} failed, retrying in {delay}s"
+                )
+            db.commit()
+            return success
+
+    async def _worker(self):
+        """Drain due jobs, sleeping until notified or the next poll"""
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                job_id = await run_in_threadpool(self.claim)
+                if job_id is not None:
+                    await run_in_threadpool(self.deliver, job_id)
+                    continue
+            except Exception as e:
+                logger.error(f"Email queue worker error: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self):
+        """Start the worker pool on the running event loop"""
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        await run_in_threadpool(self.recover)
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float = 10.0):
+        """Let in-flight deliveries finish, then stop the workers"""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if self._tasks:
+            done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        self._tasks = []
+
+
+# Create global email queue instance
+email_queue = EmailQueue()
@@ -3,20 +3,39 @@ Email service for sending notifications
 """
 
 import smtplib
+from dataclasses import dataclass
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Sequence
 from datetime import datetime
 import logging
-from jinja2 import Template
+
+from sqlalchemy import insert
 
 from config import settings
+from email_templates import SERVICE_NAMES, email_templates
+from metrics import smtp_send_seconds
 from models import EmailLog, ContactInquiry
+from smtp_pool import DISCONNECT_ERRORS, SMTPConnectionPool
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class OutgoingEmail:
+    """A rendered email ready to send, plus what to record in EmailLog"""
+
+    to_email: str
+    subject: str
+    body_html: str
+    body_text: Optional[str] = None
+    reply_to: Optional[str] = None
+    recipient_name: Optional[str] = None
+    email_type: str = "general"
+    inquiry_id: Optional[int] = None
+
+
 class EmailService:
     """Service for handling email notifications"""
 
@@ -29,6 +48,34 @@ class EmailService:
         self.from_name = settings.SMTP_FROM_NAME
         self.admin_email = settings.ADMIN_EMAIL
         self.enabled = settings.SEND_EMAIL_NOTIFICATIONS
+        self.transport = SMTPConnectionPool()
+
+    def build_message(
+        self,
+        to_email: str,
+        subject: str,
+        body_html: str,
+        body_text: Optional[str] = None,
+        reply_to: Optional[str] = None,
+    ) -> MIMEMultipart:
+        """Build the MIME message for an email"""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = f"{self.from_name} <{self.from_email}>"
+        msg["To"] = to_email
+
+        if reply_to:
+            msg["Reply-To"] = reply_to
+
+        # Add plain text part
+        if body_text:
+            text_part = MIMEText(body_text, "plain")
+            msg.attach(text_part)
+
+        # Add HTML part
+        html_part = MIMEText(body_html, "html")
+        msg.attach(html_part)
+        return msg
 
     def send_email(
         self,
@@ -39,7 +86,7 @@ class EmailService:
         reply_to: Optional[str] = None,
     ) -> bool:
         """
-        Send an email using SMTP
+        Send an email using the pooled SMTP transport
 
         Args:
             to_email: Recipient email address
@@ -56,30 +103,10 @@ class EmailService:
             return True
 
         try:
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = f"{self.from_name} <{self.from_email}>"
-            msg["To"] = to_email
-
-            if reply_to:
-                msg["Reply-To"] = reply_to
-
-            # Add plain text part
-            if body_text:
-                text_part = MIMEText(body_text, "plain")
-                msg.attach(text_part)
-
-            # Add HTML part
-            html_part = MIMEText(body_html, "html")
-            msg.attach(html_part)
-
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                if self.smtp_user and self.smtp_password:
-                    server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            msg = self.build_message(to_email, subject, body_html, body_text, reply_to)
+
+            # Send email over a pooled, already authenticated connection
+            self.transport.send_message(msg)
 
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -88,150 +115,102 @@ class EmailService:
             logger.error(f"Failed to send email to {to_email}: {str(e)}")
             return False
 
-    def send_inquiry_notification_to_admin(
-        self, inquiry: ContactInquiry, db: Session
-    ) -> bool:
+    def send_many(
+        self, emails: Sequence[OutgoingEmail], db: Optional[Session] = None
+    ) -> List[bool]:
         """
-        Send notification to admin about new inquiry
+        Send a batch of emails over a single SMTP session
+
+        A message the server rejects is marked failed and the session carries
+        on; if the connection drops, the rest of the batch continues on a
+        fresh one. When a session is given, every EmailLog row is written in
+        one bulk insert and commit.
 
         Args:
-            inquiry: ContactInquiry object
-            db: Database session
+            emails: Rendered emails to send
+            db: Database session for EmailLog rows (optional)
 
         Returns:
-            True if email sent successfully
+            Per-email success flags, in the same order as `emails`
         """
-        subject = f"New Inquiry from {inquiry.get_full_name()} - {inquiry.company_name or 'Individual'}"
+        results = [False] * len(emails)
 
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-                .header { background: linear-gradient(135deg, #8B5CF6 0%, #A855F7 100%); color: white; padding: 20px; border-radius: 8px 8px 0 0; }
-                .content { background: #f9f9f9; padding: 20px; border-radius: 0 0 8px 8px; }
-                .field { margin-bottom: 15px; }
-                .label { font-weight: bold; color: #555; }
-                .value { color: #333; margin-left: 10px; }
-                .message-box { background: white; padding: 15px; border-left: 4px solid #8B5CF6; margin: 20px 0; }
-                .lead-score { display: inline-block; padding: 5px 10px; border-radius: 20px; color: white; font-weight: bold; }
-                .high-score { background: #10b981; }
-                .medium-score { background: #f59e0b; }
-                .low-score { background: #ef4444; }
-                .cta-button { display: inline-block; padding: 10px 20px; background: #8B5CF6; color: white; text-decoration: none; border-radius: 5px; margin-top: 15px; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h2>🎯 New Inquiry Received!</h2>
-                    <p>Lead Score: <span class="lead-score {{ 'high-score' if lead_score >= 70 else 'medium-score' if lead_score >= 40 else 'low-score' }}">{{ lead_score }}%</span></p>
-                </div>
-                <div class="content">
-                    <h3>Contact Information</h3>
-                    <div class="field">
-                        <span class="label">Name:</span>
-                        <span class="value">{{ full_name }}</span>
-                    </div>
-                    <div class="field">
-                        <span class="label">Email:</span>
-                        <span class="value"><a href="mailto:{{ email }}">{{ email }}</a></span>
-                    </div>
-                    {% if phone %}
-                    <div class="field">
-                        <span class="label">Phone:</span>
-                        <span class="value"><a href="tel:{{ phone }}">{{ phone }}</a></span>
-                    </div>
-                    {% endif %}
-                    
-                    <h3>Company Details</h3>
-                    {% if company_name %}
-                    <div class="field">
-                        <span class="label">Company:</span>
-                        <span class="value">{{ company_name }}</span>
-                    </div>
-                    {% endif %}
-                    {% if company_website %}
-                    <div class="field">
-                        <span class="label">Website:</span>
-                        <span class="value"><a href="{{ company_website }}">{{ company_website }}</a></span>
-                    </div>
-                    {% endif %}
-                    {% if company_size %}
-                    <div class="field">
-                        <span class="label">Company Size:</span>
-                        <span class="value">{{ company_size }} employees</span>
-                    </div>
-                    {% endif %}
-                    {% if industry %}
-                    <div class="field">
-                        <span class="label">Industry:</span>
-                        <span class="value">{{ industry }}</span>
-                    </div>
-                    {% endif %}
-                    
-                    <h3>Project Information</h3>
-                    <div class="field">
-                        <span class="label">Service Interested:</span>
-                        <span class="value">{{ service_interested }}</span>
-                    </div>
-                    {% if project_timeline %}
-                    <div class="field">
-                        <span class="label">Timeline:</span>
-                        <span class="value">{{ project_timeline }}</span>
-                    </div>
-                    {% endif %}
-                    {% if budget_range %}
-                    <div class="field">
-                        <span class="label">Budget:</span>
-                        <span class="value">{{ budget_range }}</span>
-                    </div>
-                    {% endif %}
-                    
-                    <h3>Message</h3>
-                    <div class="message-box">
-                        {{ message }}
-                    </div>
-                    
-                    <div class="field">
-                        <span class="label">Submitted:</span>
-                        <span class="value">{{ submitted_at }}</span>
-                    </div>
-                    
-                    {% if utm_source or lead_source %}
-                    <h3>Attribution</h3>
-                    {% if lead_source %}
-                    <div class="field">
-                        <span class="label">Lead Source:</span>
-                        <span class="value">{{ lead_source }}</span>
-                    </div>
-                    {% endif %}
-                    {% if utm_source %}
-                    <div class="field">
-                        <span class="label">Campaign:</span>
-                        <span class="value">{{ utm_source }} / {{ utm_medium }} / {{ utm_campaign }}</span>
-                    </div>
-                    {% endif %}
-                    {% endif %}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        if not self.enabled:
+            logger.info(f"Email notifications disabled. Would send {len(emails)} emails")
+            results = [True] * len(emails)
+        else:
+            pending = 0
+            reconnects = 0
+            while pending < len(emails) and reconnects <= 1:
+                try:
+                    with self.transport.connection() as server:
+                        while pending < len(emails):
+                            email = emails[pending]
+                            results[pending] = self._send_in_session(server, email)
+                            pending += 1
+                except DISCONNECT_ERRORS as e:
+                    # The message in flight is retried on the next connection
+                    logger.warning(f"SMTP session dropped mid-batch: {str(e)}")
+                    reconnects += 1
+                except Exception as e:
+                    logger.error(f"SMTP batch session failed: {str(e)}")
+                    break
+
+            sent = sum(results)
+            logger.info(f"Batch sent {sent}/{len(emails)} emails")
+
+        if db is not None:
+            self.log_emails(db, emails, results)
+        return results
+
+    def _send_in_session(self, server: smtplib.SMTP, email: OutgoingEmail) -> bool:
+        """Send one email on an open session; raises only if the connection drops"""
+        msg = self.build_message(
+            email.to_email,
+            email.subject,
+            email.body_html,
+            email.body_text,
+            email.reply_to,
+        )
+        try:
+            with smtp_send_seconds.time():
+                server.send_message(msg)
+            return True
+        except DISCONNECT_ERRORS:
+            raise
+        except smtplib.SMTPException as e:
+            logger.error(f"Failed to send email to {email.to_email}: {str(e)}")
+            # Clear the failed transaction so the session can be reused
+            server.rset()
+            return False
 
-        # Prepare template context
-        service_names = {
-            "ai_audit": "AI Opportunity Audit",
-            "chatbot_llm": "Custom AI Chatbots & LLM Integration",
-            "data_strategy": "Data Strategy & Architecture",
-            "process_automation": "Process Automation",
-            "ai_training": "AI Training & Change Management",
-            "ongoing_support": "Ongoing AI Support",
-            "other": "Other / General Inquiry",
-        }
+    def log_emails(
+        self, db: Session, emails: Iterable[OutgoingEmail], results: Iterable[bool]
+    ):
+        """Record sent emails in EmailLog with one bulk insert and commit"""
+        now = datetime.now()
+        rows = [
+            {
+                "recipient_email": email.to_email,
+                "recipient_name": email.recipient_name,
+                "subject": email.subject,
+                "body": email.body_html,
+                "email_type": email.email_type,
+                "inquiry_id": email.inquiry_id,
+                "sent_successfully": success,
+                "sent_at": now if success else None,
+            }
+            for email, success in zip(emails, results)
+        ]
+        if rows:
+            db.execute(insert(EmailLog), rows)
+            db.commit()
+
+    def build_inquiry_notification(self, inquiry: ContactInquiry) -> OutgoingEmail:
+        """Render the admin notification for an inquiry"""
+        subject = f"New Inquiry from {inquiry.get_full_name()} - {inquiry.company_name or 'Individual'}"
 
+        # Prepare template context
         context = {
             "full_name": inquiry.get_full_name(),
             "email": inquiry.email,
@@ -240,7 +219,7 @@ class EmailService:
             "company_website": inquiry.company_website,
             "company_size": inquiry.company_size,
             "industry": inquiry.industry,
-            "service_interested": service_names.get(
+            "service_interested": SERVICE_NAMES.get(
                 (
                     inquiry.service_interested.value
                     if inquiry.service_interested
@@ -259,188 +238,119 @@ class EmailService:
             "utm_campaign": inquiry.utm_campaign,
         }
 
-        # Render template
-        template = Template(html_template)
-        html_body = template.render(**context)
+        # Render precompiled template
+        html_body = email_templates.render("inquiry_notification", **context)
 
-        # Send email
-        success = self.send_email(
+        return OutgoingEmail(
             to_email=self.admin_email,
             subject=subject,
             body_html=html_body,
             reply_to=inquiry.email,
-        )
-
-        # Log email
-        email_log = EmailLog(
-            recipient_email=self.admin_email,
             recipient_name=settings.ADMIN_NAME,
-            subject=subject,
-            body=html_body,
             email_type="inquiry_notification",
             inquiry_id=inquiry.id,
-            sent_successfully=success,
-            sent_at=datetime.now() if success else None,
         )
-        db.add(email_log)
-        db.commit()
 
-        return success
-
-    def send_inquiry_confirmation(self, inquiry: ContactInquiry, db: Session) -> bool:
-        """
-        Send confirmation email to the person who submitted the inquiry
-
-        Args:
-            inquiry: ContactInquiry object
-            db: Database session
-
-        Returns:
-            True if email sent successfully
-        """
+    def build_inquiry_confirmation(self, inquiry: ContactInquiry) -> OutgoingEmail:
+        """Render the confirmation sent to the person who submitted an inquiry"""
         subject = "Thank you for contacting Chuco AI"
 
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-                .header { background: linear-gradient(135deg, #8B5CF6 0%, #A855F7 100%); color: white; padding: 30px; border-radius: 8px 8px 0 0; text-align: center; }
-                .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 8px 8px; }
-                .cta-button { display: inline-block; padding: 12px 25px; background: #8B5CF6; color: white; text-decoration: none; border-radius: 25px; margin: 20px 0; }
-                .footer { text-align: center; margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #666; }
-                .services-list { background: white; padding: 20px; border-radius: 8px; margin: 20px 0; }
-                .service-item { padding: 10px 0; border-bottom: 1px solid #eee; }
-                .service-item:last-child { border-bottom: none; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>Welcome to Chuco AI!</h1>
-                    <p>Your AI Transformation Journey Starts Here</p>
-                </div>
-                <div class="content">
-                    <h2>Hi {{ first_name }},</h2>
-                    
-                    <p>Thank you for reaching out to Chuco AI! We've received your inquiry and are excited about the possibility of helping {{ company_name if company_name else 'your business' }} leverage AI to streamline operations and boost revenue.</p>
-                    
-                    <p><strong>What happens next?</strong></p>
-                    <ul>
-                        <li>Our team will review your inquiry within 24 hours</li>
-                        <li>We'll reach out to schedule a free consultation call</li>
-                        <li>During the call, we'll discuss your specific needs and how AI can help</li>
-                        <li>You'll receive a customized proposal based on your requirements</li>
-                    </ul>
-                    
-                    {% if service_interested and service_interested != 'other' %}
-                    <p>Based on your interest in <strong>{{ service_name }}</strong>, here's a quick overview of how we can help:</p>
-                    
-                    <div class="services-list">
-                        {% if service_interested == 'ai_audit' %}
-                        <div class="service-item">
-                            <strong>AI Opportunity Audit:</strong> We'll analyze your current workflows, identify automation opportunities, and create a roadmap for AI implementation tailored to your business.
-                        </div>
-                        {% elif service_interested == 'chatbot_llm' %}
-                        <div class="service-item">
-                            <strong>Custom AI Chatbots & LLM Integration:</strong> We'll build intelligent chatbots that understand your business, handle customer inquiries, and generate qualified leads 24/7.
-                        </div>
-                        {% elif service_interested == 'data_strategy' %}
-                        <div class="service-item">
-                            <strong>Data Strategy & Architecture:</strong> We'll design and implement robust data systems that make your business AI-ready and unlock insights from your data.
-                        </div>
-                        {% elif service_interested == 'process_automation' %}
-                        <div class="service-item">
-                            <strong>Process Automation:</strong> We'll automate repetitive tasks, streamline workflows, and free up your team to focus on high-value activities.
-                        </div>
-                        {% elif service_interested == 'ai_training' %}
-                        <div class="service-item">
-                            <strong>AI Training & Change Management:</strong> We'll ensure your team is equipped to leverage AI tools effectively with hands-on training and support.
-                        </div>
-                        {% elif service_interested == 'ongoing_support' %}
-                        <div class="service-item">
-                            <strong>Ongoing AI Support:</strong> We'll provide continuous optimization, maintenance, and expansion of your AI implementations to ensure long-term success.
-                        </div>
-                        {% endif %}
-                    </div>
-                    {% endif %}
-                    
-                    <p><strong>While you wait, here are some resources you might find helpful:</strong></p>
-                    <ul>
-                        <li><a href="https://chuco.ai/#services">Explore our full range of AI services</a></li>
-                        <li><a href="https://chuco.ai/#about">Learn about our 15+ years of experience</a></li>
-                    </ul>
-                    
-                    <p>If you have any immediate questions, feel free to reach out:</p>
-                    <p>
-                        📧 Email: <a href="mailto:yo@chuco.ai">yo@chuco.ai</a><br>
-                        📞 Phone: <a href="tel:+18449152828">(844) 915-2828</a>
-                    </p>
-                    
-                    <center>
-                        <a href="https://chuco.ai" class="cta-button">Visit Our Website</a>
-                    </center>
-                    
-                    <div class="footer">
-                        <p><strong>Chuco AI</strong><br>
-                        Transforming businesses through intelligent automation<br>
-                        El Paso, Texas</p>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
         # Prepare template context
-        service_names = {
-            "ai_audit": "AI Opportunity Audit",
-            "chatbot_llm": "Custom AI Chatbots & LLM Integration",
-            "data_strategy": "Data Strategy & Architecture",
-            "process_automation": "Process Automation",
-            "ai_training": "AI Training & Change Management",
-            "ongoing_support": "Ongoing AI Support",
-        }
-
         context = {
             "first_name": inquiry.first_name,
             "company_name": inquiry.company_name,
             "service_interested": (
                 inquiry.service_interested.value if inquiry.service_interested else None
             ),
-            "service_name": service_names.get(
+            "service_name": SERVICE_NAMES.get(
                 inquiry.service_interested.value if inquiry.service_interested else "",
                 "",
             ),
         }
 
-        # Render template
-        template = Template(html_template)
-        html_body = template.render(**context)
-
-        # Send email
-        success = self.send_email(
-            to_email=inquiry.email, subject=subject, body_html=html_body
-        )
+        # Render precompiled template
+        html_body = email_templates.render("inquiry_confirmation", **context)
 
-        # Log email
-        email_log = EmailLog(
-            recipient_email=inquiry.email,
-            recipient_name=inquiry.get_full_name(),
+        return OutgoingEmail(
+            to_email=inquiry.email,
             subject=subject,
-            body=html_body,
+            body_html=html_body,
+            recipient_name=inquiry.get_full_name(),
             email_type="inquiry_confirmation",
             inquiry_id=inquiry.id,
-            sent_successfully=success,
-            sent_at=datetime.now() if success else None,
         )
-        db.add(email_log)
-        db.commit()
 
+    def _send_and_log(self, email: OutgoingEmail, db: Session) -> bool:
+        success = self.send_email(
+            to_email=email.to_email,
+            subject=email.subject,
+            body_html=email.body_html,
+            body_text=email.body_text,
+            reply_to=email.reply_to,
+        )
+        self.log_emails(db, [email], [success])
         return success
 
+    def send_inquiry_notification_to_admin(
+        self, inquiry: ContactInquiry, db: Session
+    ) -> bool:
+        """
+        Send notification to admin about new inquiry
+
+        Args:
+            inquiry: ContactInquiry object
+            db: Database session
+
+        Returns:
+            True if email sent successfully
+        """
+        return self._send_and_log(self.build_inquiry_notification(inquiry), db)
+
+    def send_inquiry_confirmation(self, inquiry: ContactInquiry, db: Session) -> bool:
+        """
+        Send confirmation email to the person who submitted the inquiry
+
+        Args:
+            inquiry: ContactInquiry object
+            db: Database session
+
+        Returns:
+            True if email sent successfully
+        """
+        return self._send_and_log(self.build_inquiry_confirmation(inquiry), db)
+
+    def send_inquiry_emails(
+        self,
+        inquiries: Iterable[ContactInquiry],
+        db: Session,
+        email_types: Iterable[str] = ("inquiry_confirmation",),
+    ) -> List[bool]:
+        """
+        Render and send inquiry emails for many inquiries as one batch
+
+        Useful for re-sending confirmations across a backlog: one SMTP
+        session and one EmailLog commit instead of one per inquiry.
+
+        Args:
+            inquiries: ContactInquiry objects
+            db: Database session
+            email_types: "inquiry_notification" and/or "inquiry_confirmation"
+
+        Returns:
+            Per-email success flags
+        """
+        builders = {
+            "inquiry_notification": self.build_inquiry_notification,
+            "inquiry_confirmation": self.build_inquiry_confirmation,
+        }
+        email_types = list(email_types)
+        emails = [
+            builders[email_type](inquiry)
+            for inquiry in inquiries
+            for email_type in email_types
+        ]
+        return self.send_many(emails, db)
+
 
 # Create global email service instance
 email_service = EmailService()
@@ -0,0 +1,77 @@
+"""
+Email template registry
+
+Email bodies live in templates/email/ and are rendered through one shared
+jinja2 Environment. Each template is compiled once (at startup via warm(),
+or on first use) and memoized, and compiled bytecode is cached on disk so
+new workers skip parsing too; rendering is then just substitution.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
+
+from config import settings
+from metrics import template_render_seconds
+
+TEMPLATE_DIR = Path(__file__).parent / "templates" / "email"
+
+# Display names for ServiceType values
+SERVICE_NAMES = {
+    "ai_audit": "AI Opportunity Audit",
+    "chatbot_llm": "Custom AI Chatbots & LLM Integration",
+    "data_strategy": "Data Strategy & Architecture",
+    "process_automation": "Process Automation",
+    "ai_training": "AI Training & Change Management",
+    "ongoing_support": "Ongoing AI Support",
+    "other": "Other / General Inquiry",
+}
+
+
+class EmailTemplates:
+    """Compile-once registry of email templates"""
+
+    def __init__(
+        self, directory: Path = TEMPLATE_DIR, cache_dir: Optional[str] = None
+    ):
+        cache_dir = cache_dir or settings.EMAIL_TEMPLATE_CACHE_DIR or None
+        if cache_dir:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.env = Environment(
+            loader=FileSystemLoader(str(directory)),
+            bytecode_cache=FileSystemBytecodeCache(cache_dir),
+            autoescape=select_autoescape(["html"]),
+            # Templates only change on deploy; skip the per-render mtime check
+            auto_reload=False,
+        )
+        self._templates: Dict[str, Template] = {}
+
+    def get(self, name: str) -> Template:
+        """Return the compiled template, compiling it on first use"""
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.env.get_template(f"{name}.html")
+        return template
+
+    def render(self, name: str, **context: Any) -> str:
+        """Render a template by name"""
+        template = self.get(name)
+        with template_render_seconds.time():
+            return template.render(**context)
+
+    def warm(self):
+        """Compile every template up front"""
+        for path in self.directory.glob("*.html"):
+            self.get(path.stem)
+
+
+# Create global email template registry
+email_templates = EmailTemplates()
@@ -0,0 +1,160 @@
+"""
+Streaming CSV/NDJSON exports of inquiries and email logs
+
+Rows are read through a server-side cursor in yield_per chunks and encoded
+one chunk at a time, so memory stays flat no matter how large the table is.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from inquiry_store import INQUIRY_FIELDS, inquiry_to_dict, VALID_STATUSES
+from models import ContactInquiry, EmailLog, InquiryStatus
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows fetched from the cursor per round trip
+EXPORT_CHUNK_SIZE = 1000
+
+# Export columns, in order; the CSV header is written even when no rows match
+INQUIRY_EXPORT_FIELDS = [*INQUIRY_FIELDS, "id", "status", "timestamp", "updated_at"]
+EMAIL_LOG_EXPORT_FIELDS = [
+    "id",
+    "recipient_email",
+    "recipient_name",
+    "subject",
+    "email_type",
+    "inquiry_id",
+    "sent_successfully",
+    "error_message",
+    "created_at",
+    "sent_at",
+]
+
+
+def email_log_to_dict(log: EmailLog) -> Dict[str, Any]:
+    """Serialize an EmailLog row for export"""
+    return {
+        "id": log.id,
+        "recipient_email": log.recipient_email,
+        "recipient_name": log.recipient_name,
+        "subject": log.subject,
+        "email_type": log.email_type,
+        "inquiry_id": log.inquiry_id,
+        "sent_successfully": log.sent_successfully,
+        "error_message": log.error_message,
+        "created_at": log.created_at.isoformat() if log.created_at else None,
+        "sent_at": log.sent_at.isoformat() if log.sent_at else None,
+    }
+
+
+def _encode_ndjson(rows: List[Dict[str, Any]], fields: List[str]) -> str:
+    return "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+def _csv_header(fields: List[str]) -> str:
+    buffer = io.StringIO()
+    csv.DictWriter(buffer, fieldnames=fields).writeheader()
+    return buffer.getvalue()
+
+
+def _encode_csv(rows: List[Dict[str, Any]], fields: List[str]) -> str:
+    buffer = io.StringIO()
+    csv.DictWriter(buffer, fieldnames=fields).writerows(rows)
+    return buffer.getvalue()
+
+
+ENCODERS = {"csv": _encode_csv, "ndjson": _encode_ndjson}
+
+
+async def stream_rows(
+    query, serialize: Callable[[Any], Dict[str, Any]], fields: List[str], fmt: str
+) -> AsyncIterator[bytes]:
+    """Yield encoded chunks of a query's rows from a server-side cursor"""
+    encode = ENCODERS[fmt]
+    if fmt == "csv":
+        # Sent before the query runs, so an empty export still has its header
+        yield _csv_header(fields).encode()
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(
+            query.execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        async for partition in result.partitions():
+            rows = [serialize(row) for row in partition]
+            yield encode(rows, fields).encode()
+
+
+def _date_bounds(
+    start_date: Optional[date], end_date: Optional[date]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Turn an inclusive date range into half-open datetime bounds"""
+    start = datetime.combine(start_date, time.min) if start_date else None
+    end = datetime.combine(end_date + timedelta(days=1), time.min) if end_date else None
+    return start, end
+
+
+def inquiry_export_query(
+    status: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """Build the filtered inquiry export query, oldest first"""
+    query = select(ContactInquiry).order_by(ContactInquiry.id)
+    if status:
+        if status not in VALID_STATUSES:
+            raise ValueError(f"Invalid status. Must be one of: {VALID_STATUSES}")
+        query = query.where(ContactInquiry.status == InquiryStatus(status))
+    start, end = _date_bounds(start_date, end_date)
+    if start:
+        query = query.where(ContactInquiry.created_at >= start)
+    if end:
+        query = query.where(ContactInquiry.created_at < end)
+    return query
+
+
+def email_log_export_query(
+    status: Optional[str] = None,
+    email_type: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """Build the filtered email log export query; status is "sent" or "failed\""""
+    query = select(EmailLog).order_by(EmailLog.id)
+    if status:
+        if status not in ("sent", "failed"):
+            raise ValueError("Invalid status. Must be one of: ['sent', 'failed']")
+        query = query.where(EmailLog.sent_successfully.is_(status == "sent"))
+    if email_type:
+        query = query.where(EmailLog.email_type == email_type)
+    start, end = _date_bounds(start_date, end_date)
+    if start:
+        query = query.where(EmailLog.created_at >= start)
+    if end:
+        query = query.where(EmailLog.created_at < end)
+    return query
+
+
+def stream_inquiries(fmt: str, **filters) -> AsyncIterator[bytes]:
+    """Stream filtered inquiries as CSV or NDJSON"""
+    return stream_rows(
+        inquiry_export_query(**filters), inquiry_to_dict, INQUIRY_EXPORT_FIELDS, fmt
+    )
+
+
+def stream_email_logs(fmt: str, **filters) -> AsyncIterator[bytes]:
+    """Stream filtered email logs as CSV or NDJSON"""
+    return stream_rows(
+        email_log_export_query(**filters),
+        email_log_to_dict,
+        EMAIL_LOG_EXPORT_FIELDS,
+        fmt,
+    )
@@ -0,0 +1,177 @@
+"""
+Cached dependency health checks for liveness and readiness probes
+
+A single background task checks the database (SELECT 1), SMTP (NOOP on a
+pooled connection) and the email queue depth every
+HEALTH_CHECK_INTERVAL_SECONDS, each bounded by HEALTH_CHECK_TIMEOUT_SECONDS.
+Probes only read the last report, so however often a load balancer polls,
+each worker runs at most one check of each dependency per interval and
+never holds more than one extra database connection for it.
+
+Readiness requires the database and a recent report; an unreachable SMTP
+server or a backed-up email queue only marks the service degraded, since
+queued emails are retried. The first round runs in the background too, so a
+slow dependency never delays startup; until it completes the status is
+"starting" and the readiness probe answers 503.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from database import AsyncSessionLocal
+from email_queue import EmailQueue, email_queue
+from email_service import EmailService, email_service
+from smtp_pool import PoolExhausted
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+DEGRADED = "degraded"
+ERROR = "error"
+DISABLED = "disabled"
+STARTING = "starting"
+
+
+@dataclass
+class HealthReport:
+    """Outcome of one round of dependency checks"""
+
+    checks: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    checked_at: Optional[datetime] = None
+    completed_at: float = 0.0  # time.monotonic() when the round finished
+
+    @property
+    def database_connected(self) -> bool:
+        return self.checks.get("database", {}).get("status") == OK
+
+    @property
+    def status(self) -> str:
+        if self.checked_at is None:
+            return STARTING
+        if not self.database_connected:
+            return "unhealthy"
+        if any(check["status"] not in (OK, DISABLED) for check in self.checks.values()):
+            return DEGRADED
+        return "healthy"
+
+
+class HealthMonitor:
+    """Runs dependency checks in the background and serves the cached report"""
+
+    def __init__(
+        self,
+        queue: EmailQueue = email_queue,
+        service: EmailService = email_service,
+        session_factory=AsyncSessionLocal,
+        interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_queue_depth: Optional[int] = None,
+    ):
+        self.queue = queue
+        self.service = service
+        self.session_factory = session_factory
+        self.interval = interval or settings.HEALTH_CHECK_INTERVAL_SECONDS
+        self.timeout = timeout or settings.HEALTH_CHECK_TIMEOUT_SECONDS
+        self.max_queue_depth = max_queue_depth or settings.HEALTH_MAX_QUEUE_DEPTH
+        self.report = HealthReport()
+        self._task: Optional[asyncio.Task] = None
+
+    async def check_database(self) -> Dict[str, Any]:
+        async with self.session_factory() as db:
+            await db.execute(text("SELECT 1"))
+        return {"status": OK}
+
+    def _smtp_noop(self) -> Dict[str, Any]:
+        # Bound the slot wait and every socket operation (connect, login,
+        # NOOP) by part of the check timeout rather than SMTP_TIMEOUT, so the
+        # worker thread is not left blocked after the check has given up
+        budget = self.timeout / 2
+        try:
+            with self.service.transport.connection(wait=budget, timeout=budget) as server:
+                code, _ = server.noop()
+        except PoolExhausted as e:
+            return {"status": DEGRADED, "error": str(e)}
+        if code != 250:
+            raise ConnectionError(f"SMTP NOOP returned {code}")
+        return {"status": OK}
+
+    async def check_smtp(self) -> Dict[str, Any]:
+        if not self.service.enabled:
+            return {"status": DISABLED}
+        return await run_in_threadpool(self._smtp_noop)
+
+    async def check_queue(self) -> Dict[str, Any]:
+        depth = await self.queue.depth()
+        status = OK if depth <= self.max_queue_depth else DEGRADED
+        return {"status": status, "depth": depth}
+
+    async def _run_check(self, check: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = {"status": ERROR, "error": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            result = {"status": ERROR, "error": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    async def refresh(self) -> HealthReport:
+        """Run every check concurrently and replace the cached report"""
+        names = ("database", "smtp", "email_queue")
+        results = await asyncio.gather(
+            self._run_check(self.check_database),
+            self._run_check(self.check_smtp),
+            self._run_check(self.check_queue),
+        )
+        report = HealthReport(dict(zip(names, results)), datetime.now(), time.monotonic())
+        if report.status != self.report.status and self.report.checked_at is not None:
+            logger.warning(f"Health changed from {self.report.status} to {report.status}")
+        self.report = report
+        return report
+
+    @property
+    def fresh(self) -> bool:
+        """True if the last report finished recently enough to trust"""
+        return (
+            self.report.checked_at is not None
+            and time.monotonic() - self.report.completed_at <= self.interval * 3
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self.fresh and self.report.database_connected
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health check round failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        """Start checking in the background; the first round runs right away"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# Create global health monitor instance
+health_monitor = HealthMonitor()
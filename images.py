@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+"""
+Responsive, modern-format image variants
+
+Source images under static/ are resized with Pillow to the widths listed in
+IMAGE_PRESETS and re-encoded as AVIF (when a Pillow AVIF plugin is
+installed), WebP and the original format. Variants are rendered lazily on
+first request into IMAGE_CACHE_DIR, or all at once with:
+
+    python images.py
+
+ImageFiles serves /static/img/<digest>/<width>/<source> with the best format
+the client's Accept header allows. The digest is the source's content hash,
+so responses are immutable and change URL whenever the source does.
+Templates use image_url() and image_srcset() to link them.
+"""
+
+import asyncio
+import io
+import logging
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from assets import (
+    HASH_LENGTH,
+    IMMUTABLE_CACHE_CONTROL,
+    StaticAssets,
+    static_assets,
+    write_atomic,
+)
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+IMAGE_URL = "/static/img"
+
+# Widths (CSS pixels x density) rendered for each source image
+IMAGE_PRESETS: Dict[str, Tuple[int, ...]] = {
+    # Header logo is 40px high (~92px wide): 1x, 2x, 3x
+    "images/logos/chuco-ai-logo.png": (92, 184, 276),
+    "images/favicons/favicon-16x16.png": (16,),
+    "images/favicons/favicon-32x32.png": (32,),
+    "images/favicons/apple-touch-icon.png": (180,),
+    "images/favicons/android-chrome-192x192.png": (192,),
+    "images/favicons/android-chrome-512x512.png": (16, 32, 48, 192, 512),
+}
+
+# Format -> (Pillow format, media type, save options)
+FORMATS = {
+    "avif": ("AVIF", "image/avif", {"quality": 60}),
+    "webp": ("WEBP", "image/webp", {"quality": 82, "method": 6}),
+    "png": ("PNG", "image/png", {"optimize": True}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+@lru_cache(maxsize=None)
+def modern_formats() -> Tuple[str, ...]:
+    """Modern formats in order of preference, when Pillow can write them"""
+    # Pillow is imported on first use so it stays off the app's import path
+    from PIL import Image, features
+
+    try:
+        import pillow_avif  # noqa: F401  Registers the AVIF plugin with Pillow
+    except ImportError:  # Optional: AVIF variants are skipped without it
+        pass
+
+    Image.init()
+    return tuple(
+        name
+        for name, supported in (
+            ("avif", "AVIF" in Image.SAVE),
+            ("webp", features.check("webp")),
+        )
+        if supported
+    )
+
+
+def source_format(source: str) -> str:
+    """Fallback format for a source: its own, as png or jpeg"""
+    return "jpeg" if Path(source).suffix.lower() in (".jpg", ".jpeg") else "png"
+
+
+def preferred_format(accept: str, source: str) -> str:
+    """Best format for an Accept header; modern formats must be listed explicitly"""
+    accepted = {part.split(";")[0].strip() for part in accept.lower().split(",")}
+    for name in modern_formats():
+        if FORMATS[name][1] in accepted:
+            return name
+    return source_format(source)
+
+
+class ImageVariants:
+    """Renders and locates resized, re-encoded copies of source images"""
+
+    def __init__(
+        self,
+        assets: StaticAssets = static_assets,
+        cache_dir: Optional[str] = None,
+        presets: Dict[str, Tuple[int, ...]] = IMAGE_PRESETS,
+    ):
+        self.assets = assets
+        self.cache_dir = Path(cache_dir or settings.IMAGE_CACHE_DIR)
+        self.presets = presets
+        self._locks: Dict[Path, asyncio.Lock] = {}
+
+    def digest(self, source: str) -> Optional[str]:
+        asset = self.assets.by_source.get(source)
+        return asset.digest[:HASH_LENGTH] if asset else None
+
+    def url(self, source: str, width: int) -> str:
+        """URL of a variant; the plain static URL if the source is unknown"""
+        digest = self.digest(source)
+        if digest is None or width not in self.presets.get(source, ()):
+            return self.assets.url(source)
+        return f"{IMAGE_URL}/{digest}/{width}/{source}"
+
+    def srcset(self, source: str, width: int) -> str:
+        """srcset of the 1x/2x/3x variants available for a display width"""
+        widths = self.presets.get(source, ())
+        return ", ".join(
+            f"{self.url(source, width * density)} {density}x"
+            for density in (1, 2, 3)
+            if width * density in widths
+        )
+
+    def path(self, source: str, width: int, fmt: str) -> Path:
+        stem = Path(source).with_suffix("")
+        return self.cache_dir / f"{stem}.{self.digest(source)}.{width}.{fmt}"
+
+    def render(self, source: str, width: int, fmt: str) -> Path:
+        """Resize and encode one variant (blocking)"""
+        from PIL import Image, ImageOps
+
+        target = self.path(source, width, fmt)
+        pillow_format, _, options = FORMATS[fmt]
+        with Image.open(self.assets.source_dir / source) as image:
+            image = ImageOps.exif_transpose(image)
+            if width < image.width:
+                height = max(1, round(image.height * width / image.width))
+                image = image.resize((width, height), Image.LANCZOS)
+            if pillow_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            buffer = io.BytesIO()
+            image.save(buffer, pillow_format, **options)
+        write_atomic(target, buffer.getvalue())
+        return target
+
+    async def ensure(self, source: str, width: int, fmt: str) -> Path:
+        """Return a variant's path, rendering it once on first request"""
+        target = self.path(source, width, fmt)
+        if target.exists():
+            return target
+        lock = self._locks.setdefault(target, asyncio.Lock())
+        async with lock:
+            if not target.exists():
+                await run_in_threadpool(self.render, source, width, fmt)
+        self._locks.pop(target, None)
+        return target
+
+    def build(self) -> int:
+        """Render every preset variant that is not cached yet"""
+        count = 0
+        for source, widths in self.presets.items():
+            if self.digest(source) is None:
+                logger.warning(f"Image source not found: {source}")
+                continue
+            for width in widths:
+                for fmt in modern_formats() + (source_format(source),):
+                    if not self.path(source, width, fmt).exists():
+                        self.render(source, width, fmt)
+                        count += 1
+        return count
+
+
+class ImageFiles:
+    """ASGI app serving negotiated image variants under IMAGE_URL"""
+
+    def __init__(self, images: ImageVariants):
+        self.images = images
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        response = await self.get_response(scope)
+        await response(scope, receive, send)
+
+    async def get_response(self, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            return PlainTextResponse("Method Not Allowed", status_code=405)
+
+        try:
+            digest, width, source = scope["path"].lstrip("/").split("/", 2)
+            width = int(width)
+        except ValueError:
+            return PlainTextResponse("Not Found", status_code=404)
+        current = self.images.digest(source)
+        if current is None or width not in self.images.presets.get(source, ()):
+            return PlainTextResponse("Not Found", status_code=404)
+
+        request_headers = Headers(scope=scope)
+        fmt = preferred_format(request_headers.get("accept", ""), source)
+        etag = f'"{current}-{width}-{fmt}"'
+        headers = {
+            # Only URLs naming the current source content may be cached forever
+            "cache-control": IMMUTABLE_CACHE_CONTROL if digest == current else "no-cache",
+            "etag": etag,
+            "vary": "Accept",
+        }
+        if etag in request_headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        path = await self.images.ensure(source, width, fmt)
+        return FileResponse(
+            path, media_type=FORMATS[fmt][1], headers=headers, method=scope["method"]
+        )
+
+
+# Create global image variants instance
+image_variants = ImageVariants()
+
+
+def main():
+    """Command line entry point"""
+    logging.basicConfig(level=logging.INFO)
+    static_assets.load()
+    count = image_variants.build()
+    formats = ", ".join(modern_formats()) or "no modern formats"
+    logger.info(f"✅ Rendered {count} image variants ({formats}) into {image_variants.cache_dir}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+"""
+Bulk import of historical leads into ContactInquiry
+
+Legacy leads from spreadsheets and other CRMs are streamed from CSV or NDJSON,
+validated with schemas.ContactFormCreate a batch at a time, scored with the
+lead scorer in batch mode and written with one multi-row INSERT and commit
+per batch. Bad rows are reported by line number and do not stop the import.
+Rows may carry a created_at (or exported timestamp) column to keep their
+original date and a status column (an InquiryStatus value, "new" if blank)
+to keep their pipeline stage. Run init_db.py first, then:
+
+    python import_leads.py leads.csv
+    python import_leads.py leads.ndjson --batch-size 2000 --source hubspot
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
+
+from config import settings
+from database import SessionLocal
+from inquiry_store import VALID_STATUSES, coerce_service
+from lead_scoring import SCORED_FIELDS, LeadScorer, lead_scorer
+from models import ContactInquiry, InquiryStatus
+from schemas import ContactFormCreate
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Row errors kept for the report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Uploads larger than this are spooled to disk instead of memory
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+# Columns that may carry a lead's original creation date
+CREATED_AT_COLUMNS = ("created_at", "timestamp")
+
+_form_batch = TypeAdapter(List[ContactFormCreate])
+
+Row = Tuple[int, Dict[str, Any]]
+
+# (line number, validated form, created_at, status) for a row ready to insert
+ValidRow = Tuple[int, ContactFormCreate, Optional[datetime], InquiryStatus]
+
+
+@dataclass
+class ImportResult:
+    """Running totals for one import"""
+
+    imported: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def add_error(self, line: int, message: str):
+        """Count a failed row, keeping the first MAX_REPORTED_ERRORS by line"""
+        self.failed += 1
+        errors = self.errors
+        if len(errors) >= MAX_REPORTED_ERRORS and line >= errors[-1]["line"]:
+            return
+        # Errors arrive in line order per stage, not overall; the sort is stable
+        errors.append({"line": line, "error": message})
+        errors.sort(key=lambda error: error["line"])
+        del errors[MAX_REPORTED_ERRORS:]
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.imported + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors,
+        }
+
+
+def read_rows(stream: TextIO, fmt: str, result: ImportResult) -> Iterator[Row]:
+    """Yield (line number, row) pairs; unparseable lines are recorded as failed"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "ndjson":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                result.add_error(line_no, f"Invalid JSON: {e.msg}")
+                continue
+            if not isinstance(row, dict):
+                result.add_error(line_no, "Expected a JSON object")
+                continue
+            yield line_no, row
+    else:
+        raise ValueError(f"Invalid format. Must be one of: {list(IMPORT_FORMATS)}")
+
+
+def _clean(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Trim strings and treat blank cells as missing"""
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:  # Extra CSV cells beyond the header
+            continue
+        if isinstance(value, str):
+            value = value.strip() or None
+        cleaned[key.strip()] = value
+    return cleaned
+
+
+def _created_at(row: Dict[str, Any]) -> Optional[datetime]:
+    for column in CREATED_AT_COLUMNS:
+        value = row.pop(column, None)
+        if value:
+            return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    return None
+
+
+def _status(row: Dict[str, Any]) -> InquiryStatus:
+    value = row.pop("status", None)
+    if value is None:
+        return InquiryStatus.NEW
+    return InquiryStatus(str(value).lower())
+
+
+class LeadImporter:
+    """Validates, scores and bulk-inserts batches of legacy leads"""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        lead_source: Optional[str] = None,
+        session_factory=SessionLocal,
+        scorer: LeadScorer = lead_scorer,
+    ):
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.lead_source = lead_source or settings.IMPORT_LEAD_SOURCE
+        self.session_factory = session_factory
+        self.scorer = scorer
+
+    def validate(self, batch: List[Row], result: ImportResult) -> List[ValidRow]:
+        """Validate a batch at once, recording and dropping invalid rows"""
+        lines, rows, dates, statuses = [], [], [], []
+        for line, row in batch:
+            row = _clean(row)
+            try:
+                created_at = _created_at(row)
+            except (TypeError, ValueError):
+                result.add_error(line, "created_at: Invalid date")
+                continue
+            try:
+                status = _status(row)
+            except ValueError:
+                result.add_error(line, f"status: Must be one of: {VALID_STATUSES}")
+                continue
+            lines.append(line)
+            rows.append(row)
+            dates.append(created_at)
+            statuses.append(status)
+
+        try:
+            forms = _form_batch.validate_python(rows)
+        except ValidationError as e:
+            # Errors are located by list index; report them and revalidate
+            # the remaining rows, which are then known to be valid
+            messages: Dict[int, str] = {}
+            for error in e.errors():
+                index, *loc = error["loc"]
+                messages.setdefault(
+                    index, f"{'.'.join(str(part) for part in loc)}: {error['msg']}"
+                )
+            for index, message in sorted(messages.items()):
+                result.add_error(lines[index], message)
+            keep = [i for i in range(len(rows)) if i not in messages]
+            forms = _form_batch.validate_python([rows[i] for i in keep])
+            lines = [lines[i] for i in keep]
+            dates = [dates[i] for i in keep]
+            statuses = [statuses[i] for i in keep]
+
+        return list(zip(lines, forms, dates, statuses))
+
+    def build_rows(self, valid: List[ValidRow]) -> List[Dict[str, Any]]:
+        """Score validated forms in batch and turn them into insert values"""
+        forms = [form for _, form, _, _ in valid]
+        scores = self.scorer.score_batch(
+            {name: [getattr(form, name) for form in forms] for name in SCORED_FIELDS}
+        )
+        now = datetime.now()
+        rows = []
+        for (_, form, created_at, status), score in zip(valid, scores):
+            values = form.model_dump()
+            values["service_interested"] = coerce_service(form.service_interested)
+            values["lead_source"] = form.lead_source or self.lead_source
+            values["lead_score"] = float(score)
+            values["status"] = status
+            values["created_at"] = created_at or now
+            rows.append(values)
+        return rows
+
+    def write(self, rows: List[Dict[str, Any]]):
+        """Insert one batch in its own transaction"""
+        # A Core insert keeps the batch as one executemany; the ORM bulk path
+        # splits it wherever rows leave different columns empty
+        with self.session_factory() as db:
+            db.execute(insert(ContactInquiry.__table__), rows)
+            db.commit()
+
+    def import_batch(self, batch: List[Row], result: ImportResult):
+        valid = self.validate(batch, result)
+        if not valid:
+            return
+        try:
+            self.write(self.build_rows(valid))
+        except Exception as e:
+            logger.error(f"Failed to import batch at line {batch[0][0]}: {str(e)}")
+            for line, *_ in valid:
+                result.add_error(line, f"Database error: {str(e)}")
+            return
+        result.imported += len(valid)
+
+    def import_rows(
+        self,
+        rows: Iterable[Row],
+        result: Optional[ImportResult] = None,
+        progress: Optional[Callable[[ImportResult], None]] = None,
+    ) -> ImportResult:
+        """Import (line number, row) pairs, committing every batch_size rows"""
+        result = result or ImportResult()
+        started = time.perf_counter()
+        batch: List[Row] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.import_batch(batch, result)
+                batch = []
+                result.elapsed = time.perf_counter() - started
+                if progress:
+                    progress(result)
+        if batch:
+            self.import_batch(batch, result)
+        result.elapsed = time.perf_counter() - started
+        if progress:
+            progress(result)
+        return result
+
+    def import_file(
+        self,
+        stream: TextIO,
+        fmt: str = "csv",
+        progress: Optional[Callable[[ImportResult], None]] = None,
+    ) -> ImportResult:
+        """Import a CSV or NDJSON text stream"""
+        result = ImportResult()
+        return self.import_rows(read_rows(stream, fmt, result), result, progress)
+
+    async def import_upload(
+        self, chunks: AsyncIterator[bytes], fmt: str = "csv"
+    ) -> ImportResult:
+        """
+        Import an uploaded request body
+
+        The body is spooled (to disk once it outgrows IMPORT_SPOOL_BYTES) and
+        then imported in a worker thread so the event loop stays free.
+        """
+        from starlette.concurrency import run_in_threadpool
+
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"Invalid format. Must be one of: {list(IMPORT_FORMATS)}")
+
+        with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as spool:
+            async for chunk in chunks:
+                spool.write(chunk)
+            spool.seek(0)
+            stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+            try:
+                return await run_in_threadpool(self.import_file, stream, fmt)
+            finally:
+                stream.detach()
+
+
+# Create global lead importer instance
+lead_importer = LeadImporter()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Import legacy leads into Chuco AI")
+    parser.add_argument("path", help="CSV or NDJSON file, or - for stdin")
+    parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        help="Input format (default: from the file extension, else csv)",
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    parser.add_argument(
+        "--source",
+        default=settings.IMPORT_LEAD_SOURCE,
+        help="lead_source for rows that do not set one",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    fmt = args.format or (
+        "ndjson" if Path(args.path).suffix.lower() in (".ndjson", ".jsonl") else "csv"
+    )
+    importer = LeadImporter(batch_size=args.batch_size, lead_source=args.source)
+
+    def report(result: ImportResult):
+        logger.info(
+            f"Imported {result.imported} leads, {result.failed} failed "
+            f"({result.rows_per_second:,.0f} rows/s)"
+        )
+
+    if args.path == "-":
+        result = importer.import_file(sys.stdin, fmt, progress=report)
+    else:
+        with open(args.path, newline="", encoding="utf-8-sig") as stream:
+            result = importer.import_file(stream, fmt, progress=report)
+
+    for error in result.errors:
+        logger.warning(f"Line {error['line']}: {error['error']}")
+    if result.failed > len(result.errors):
+        logger.warning(f"...and {result.failed - len(result.errors)} more failed rows")
+    logger.info(
+        f"✅ Imported {result.imported} leads in {result.elapsed:.1f}s "
+        f"({result.rows_per_second:,.0f} rows/s)"
+    )
+    return 1 if result.failed and not result.imported else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
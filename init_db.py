@@ -11,8 +11,10 @@ from pathlib import Path
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from database import init_db, engine
+from database import init_db, engine, upgrade_schema
 from models import Base
+from inquiry_store import install_change_counter
+from search import install_search_index
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +26,9 @@ def create_tables():
     try:
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+        install_search_index(engine)
+        install_change_counter(engine)
         logger.info("✅ Database tables created successfully!")
 
         # List created tables
@@ -0,0 +1,173 @@
+"""
+Incrementally maintained inquiry statistics for the admin dashboard
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import settings
+from inquiry_store import InquiryStore, inquiry_store
+
+
+class InquiryStats:
+    """
+    Running totals for GET /api/stats
+
+    Counters are updated as inquiries are created and change status, so a
+    stats read is O(1) instead of a rescan of every inquiry. Each worker
+    keeps its own counters, so they are built from the store on first use
+    (the startup warm-up usually gets there first) and resynced every
+    `resync_seconds` to pick up other workers' writes.
+
+    Requests keep updating the counters while a rebuild's query runs, so the
+    rebuild reconciles them before swapping the counters in:
+
+    - Created inquiries are identified by id. Those the query counted (id up
+      to the highest it saw) are never added again; those created during
+      the rebuild that it missed are replayed on top of the new counters.
+      On PostgreSQL a lower id may commit after a higher one, and such a
+      row is only picked up by the next resync.
+    - A status change cannot be placed before or after the query, so status
+      updates are bracketed with status_change() and a rebuild that
+      overlaps one retries; after `attempts` it keeps the live counters
+      until the next resync.
+    """
+
+    def __init__(
+        self,
+        store: InquiryStore = inquiry_store,
+        resync_seconds: Optional[int] = None,
+    ):
+        self.store = store
+        self.resync_seconds = (
+            settings.STATS_RESYNC_SECONDS if resync_seconds is None else resync_seconds
+        )
+        self._lock = threading.Lock()
+        self._rebuild_lock = asyncio.Lock()
+        self._reset({}, 0.0, {})
+        self._synced_at: Optional[float] = None
+        # Highest inquiry id already included by a rebuild
+        self._max_id = 0
+        # Inquiries recorded while a rebuild's query is in flight
+        self._pending: Optional[List[Dict[str, Any]]] = None
+        # Bumped when a status change starts or ends; open ones counted apart
+        self._status_generation = 0
+        self._status_changes_open = 0
+
+    def _reset(
+        self,
+        status_counts: Dict[str, int],
+        score_sum: float,
+        day_counts: Dict[str, int],
+    ):
+        self.total = sum(status_counts.values())
+        self.by_status = Counter(status_counts)
+        self.by_day = Counter(day_counts)
+        self.score_sum = score_sum
+
+    async def rebuild(self, attempts: int = 3) -> bool:
+        """Reload every counter from the store; returns True if they were swapped in"""
+        async with self._rebuild_lock:
+            for _ in range(attempts):
+                with self._lock:
+                    self._pending = []
+                    generation = self._status_generation
+                try:
+                    status_counts, score_sum, day_counts, max_id = (
+                        await self.store.aggregates()
+                    )
+                finally:
+                    with self._lock:
+                        pending, self._pending = self._pending, None
+
+                with self._lock:
+                    if (
+                        self._status_generation != generation
+                        or self._status_changes_open
+                    ):
+                        continue  # A status change overlapped the query
+                    self._reset(status_counts, score_sum, day_counts)
+                    self._max_id = max(self._max_id, max_id)
+                    for inquiry in pending:
+                        if inquiry["id"] > self._max_id:
+                            self._add(inquiry)
+                    self._synced_at = time.monotonic()
+                    return True
+            return False
+
+    def _add(self, inquiry: Dict[str, Any]):
+        created_at = datetime.fromisoformat(inquiry["timestamp"])
+        self.total += 1
+        self.by_status[inquiry["status"]] += 1
+        self.by_day[created_at.date().isoformat()] += 1
+        self.score_sum += inquiry.get("lead_score") or 0
+
+    def record_created(self, inquiry: Dict[str, Any]):
+        """Account for a newly stored inquiry"""
+        with self._lock:
+            if inquiry["id"] <= self._max_id:
+                return  # Already counted by a rebuild
+            self._add(inquiry)
+            if self._pending is not None:
+                self._pending.append(inquiry)
+
+    @contextmanager
+    def status_change(self) -> Iterator[None]:
+        """Bracket a status update in the store and its record_status_change()"""
+        with self._lock:
+            self._status_generation += 1
+            self._status_changes_open += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._status_generation += 1
+                self._status_changes_open -= 1
+
+    def record_status_change(self, previous_status: Optional[str], status: str):
+        """Move one inquiry from its previous status bucket to the new one"""
+        if previous_status == status:
+            return
+        with self._lock:
+            if previous_status is not None:
+                self.by_status[previous_status] -= 1
+                if self.by_status[previous_status] <= 0:
+                    del self.by_status[previous_status]
+            self.by_status[status] += 1
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """Return the stats payload, resyncing first if the counters are stale"""
+        if self._synced_at is None or (
+            self.resync_seconds
+            and time.monotonic() - self._synced_at >= self.resync_seconds
+        ):
+            await self.rebuild()
+
+        with self._lock:
+            return {
+                "total_inquiries": self.total,
+                "today_inquiries": self.by_day.get(date.today().isoformat(), 0),
+                "average_lead_score": round(self.score_sum / max(self.total, 1), 1),
+                "by_status": dict(self.by_status),
+            }
+
+    @staticmethod
+    def digest(stats: Dict[str, Any]) -> str:
+        """Short fingerprint of a snapshot, for use as an ETag"""
+        key = repr(
+            sorted(
+                (name, sorted(value.items()) if isinstance(value, dict) else value)
+                for name, value in stats.items()
+            )
+        )
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+# Create global stats instance
+inquiry_stats = InquiryStats()
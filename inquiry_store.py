@@ -0,0 +1,435 @@
+"""
+Persistent inquiry storage backed by the ContactInquiry table
+"""
+
+import base64
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import AsyncSessionLocal
+from metrics import db_write_seconds
+from models import (
+    ChangeCounter,
+    ContactInquiry,
+    EmailJob,
+    EmailJobStatus,
+    InquiryStatus,
+    ServiceType,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Columns copied straight from a submission onto a ContactInquiry row
+INQUIRY_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "company_name",
+    "company_website",
+    "company_size",
+    "industry",
+    "annual_revenue",
+    "service_interested",
+    "message",
+    "project_timeline",
+    "budget_range",
+    "preferred_contact_method",
+    "best_time_to_contact",
+    "lead_source",
+    "utm_source",
+    "utm_medium",
+    "utm_campaign",
+    "lead_score",
+    "ip_address",
+    "user_agent",
+)
+
+VALID_STATUSES = [status.value for status in InquiryStatus]
+
+# Largest page the admin list endpoints will return
+MAX_PAGE_SIZE = 200
+
+
+def coerce_service(value: Optional[str]) -> ServiceType:
+    """Map a submitted service value onto ServiceType, defaulting to OTHER"""
+    if isinstance(value, ServiceType):
+        return value
+    try:
+        return ServiceType(value)
+    except ValueError:
+        return ServiceType.OTHER
+
+
+def inquiry_to_dict(inquiry: ContactInquiry) -> Dict[str, Any]:
+    """Serialize a ContactInquiry row into the admin API payload"""
+    data = {field: getattr(inquiry, field) for field in INQUIRY_FIELDS}
+    data["service_interested"] = (
+        inquiry.service_interested.value if inquiry.service_interested else None
+    )
+    data["id"] = inquiry.id
+    data["status"] = inquiry.status.value if inquiry.status else None
+    data["timestamp"] = inquiry.created_at.isoformat() if inquiry.created_at else None
+    data["updated_at"] = inquiry.updated_at.isoformat() if inquiry.updated_at else None
+    return data
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(created_at: datetime, inquiry_id: int) -> str:
+    """Build an opaque cursor pointing just past (created_at, id)"""
+    raw = f"{created_at.isoformat()}|{inquiry_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, inquiry_id = (
+            base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at), int(inquiry_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+@dataclass(frozen=True)
+class StoreVersion:
+    """Position of the inquiry table in its change history"""
+
+    version: int
+    changed_at: Optional[datetime]  # UTC
+
+
+def _change_counter_ddl(dialect: str, table: str) -> List[str]:
+    bump = (
+        f"UPDATE change_counters SET version = version + 1, "
+        f"changed_at = CURRENT_TIMESTAMP WHERE name = '{table}';"
+    )
+    if dialect == "sqlite":
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} "
+            f"ON {table} BEGIN {bump} END"
+            for suffix, event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))
+        ]
+    # Once per statement, so a bulk insert or update bumps the counter once
+    return [
+        "CREATE OR REPLACE FUNCTION bump_change_counter() RETURNS trigger AS $$ "
+        "BEGIN UPDATE change_counters SET version = version + 1, "
+        "changed_at = CURRENT_TIMESTAMP WHERE name = TG_TABLE_NAME; "
+        "RETURN NULL; END $$ LANGUAGE plpgsql",
+        f"DROP TRIGGER IF EXISTS {table}_version ON {table}",
+        f"CREATE TRIGGER {table}_version AFTER INSERT OR UPDATE OR DELETE "
+        f"ON {table} FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter()",
+    ]
+
+
+def install_change_counter(engine: Engine):
+    """Create the triggers that version contact_inquiries (idempotent)"""
+    dialect = engine.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        logger.warning(f"Change counters are not supported on {dialect}")
+        return
+
+    table = ContactInquiry.__tablename__
+    with engine.begin() as conn:
+        exists = conn.execute(
+            select(ChangeCounter.name).where(ChangeCounter.name == table)
+        ).first()
+        if not exists:
+            conn.execute(ChangeCounter.__table__.insert().values(name=table, version=0))
+        for statement in _change_counter_ddl(dialect, table):
+            conn.execute(text(statement))
+
+
+class InquiryStore:
+    """
+    Inquiry storage engine on top of the shared database engine
+
+    Lookups go through the primary key, and list/count queries are served by
+    the secondary indexes on status, created_at and email, so every gunicorn
+    worker sees the same data and nothing is lost on restart. All methods use
+    async sessions so handlers never block the event loop on the database.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def build(data: Dict[str, Any]) -> ContactInquiry:
+        """Build a new ContactInquiry row from submitted values"""
+        values = {field: data.get(field) for field in INQUIRY_FIELDS}
+        values["service_interested"] = coerce_service(values["service_interested"])
+        values["message"] = values["message"] or ""
+        return ContactInquiry(
+            **values,
+            status=InquiryStatus.NEW,
+            created_at=data.get("created_at") or datetime.now(),
+        )
+
+    @staticmethod
+    async def _add_email_jobs(
+        db: AsyncSession, inquiries: List[ContactInquiry], email_types: Sequence[str]
+    ):
+        """Queue delivery jobs for new inquiries in the same transaction"""
+        if not email_types:
+            return
+        await db.flush()  # Assigns the inquiry IDs
+        now = datetime.now()
+        db.add_all(
+            EmailJob(
+                email_type=email_type,
+                inquiry_id=inquiry.id,
+                status=EmailJobStatus.PENDING,
+                attempts=0,
+                next_attempt_at=now,
+            )
+            for inquiry in inquiries
+            for email_type in email_types
+        )
+
+    async def create(
+        self, data: Dict[str, Any], email_types: Sequence[str] = ()
+    ) -> Dict[str, Any]:
+        """Insert a new inquiry (and its email jobs) and return its serialized form"""
+        async with self.session_factory() as db:
+            inquiry = self.build(data)
+            db.add(inquiry)
+            with db_write_seconds.time():
+                await self._add_email_jobs(db, [inquiry], email_types)
+                await db.commit()
+            await db.refresh(inquiry)
+            return inquiry_to_dict(inquiry)
+
+    async def create_many(
+        self,
+        items: List[Dict[str, Any]],
+        durable: bool = True,
+        email_types: Sequence[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert many inquiries in one transaction, returning them in order
+
+        The rows go out as a single multi-row INSERT ... RETURNING, followed
+        by one for the `email_types` jobs of every inquiry, so a lead is never
+        stored without its emails queued (or the reverse). With durable=False
+        the commit is not waited on for disk sync (synchronous_commit=off on
+        PostgreSQL, synchronous=OFF on SQLite), trading the last few
+        milliseconds of writes on a crash for throughput.
+        """
+        async with self.session_factory() as db:
+            if not durable:
+                await _set_commit_sync(db, False)
+            try:
+                inquiries = [self.build(data) for data in items]
+                db.add_all(inquiries)
+                with db_write_seconds.time():
+                    await self._add_email_jobs(db, inquiries, email_types)
+                    await db.commit()
+            finally:
+                if not durable:
+                    await _set_commit_sync(db, True)
+            return [inquiry_to_dict(inquiry) for inquiry in inquiries]
+
+    async def version(self) -> Optional[StoreVersion]:
+        """
+        Current change counter for the inquiry table
+
+        Every insert, update or delete, from any worker or tool, moves it
+        forward, so it can validate anything derived from stored inquiries.
+        None if the counter has not been installed (see init_db).
+        """
+        async with self.session_factory() as db:
+            row = (
+                await db.execute(
+                    select(ChangeCounter.version, ChangeCounter.changed_at).where(
+                        ChangeCounter.name == ContactInquiry.__tablename__
+                    )
+                )
+            ).first()
+        if row is None:
+            return None
+        version, changed_at = row
+        if changed_at is not None and changed_at.tzinfo is None:
+            # SQLite returns CURRENT_TIMESTAMP (UTC) without an offset
+            changed_at = changed_at.replace(tzinfo=timezone.utc)
+        return StoreVersion(version, changed_at)
+
+    async def get(self, inquiry_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch a single inquiry by primary key"""
+        async with self.session_factory() as db:
+            inquiry = await db.get(ContactInquiry, inquiry_id)
+            return inquiry_to_dict(inquiry) if inquiry else None
+
+    async def update_status(
+        self, inquiry_id: int, status: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Set the status of an inquiry
+
+        Returns (previous status, updated inquiry), or (None, None) if the
+        inquiry does not exist.
+        """
+        async with self.session_factory() as db:
+            inquiry = await db.get(ContactInquiry, inquiry_id)
+            if inquiry is None:
+                return None, None
+
+            previous_status = inquiry.status.value if inquiry.status else None
+            inquiry.status = InquiryStatus(status)
+            inquiry.updated_at = datetime.now()
+            await db.commit()
+            await db.refresh(inquiry)
+            return previous_status, inquiry_to_dict(inquiry)
+
+    async def count(self, status: Optional[str] = None) -> int:
+        """Count inquiries, optionally restricted to one status"""
+        if status and status not in VALID_STATUSES:
+            return 0
+
+        async with self.session_factory() as db:
+            query = select(func.count(ContactInquiry.id))
+            if status:
+                query = query.where(ContactInquiry.status == InquiryStatus(status))
+            return await db.scalar(query) or 0
+
+    async def list(
+        self, status: Optional[str] = None, limit: int = 50, offset: int = 0
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return (total, page) of inquiries, newest first"""
+        if status and status not in VALID_STATUSES:
+            return 0, []
+
+        async with self.session_factory() as db:
+            query = select(ContactInquiry)
+            total_query = select(func.count(ContactInquiry.id))
+            if status:
+                condition = ContactInquiry.status == InquiryStatus(status)
+                query = query.where(condition)
+                total_query = total_query.where(condition)
+
+            query = (
+                query.order_by(
+                    ContactInquiry.created_at.desc(), ContactInquiry.id.desc()
+                )
+                .offset(offset)
+                .limit(limit)
+            )
+            total = await db.scalar(total_query) or 0
+            page = [inquiry_to_dict(inquiry) for inquiry in await db.scalars(query)]
+            return total, page
+
+    async def page(
+        self,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Return (page, next_cursor) of inquiries, newest first
+
+        Seeks directly to the cursor position on the (status, created_at, id)
+        index, so each page costs O(limit) regardless of how deep it is.
+        next_cursor is None once the last page has been reached.
+        """
+        position = decode_cursor(cursor) if cursor else None
+        if status and status not in VALID_STATUSES:
+            return [], None
+
+        async with self.session_factory() as db:
+            query = select(ContactInquiry)
+            if status:
+                query = query.where(ContactInquiry.status == InquiryStatus(status))
+            if position:
+                created_at, inquiry_id = position
+                query = query.where(
+                    or_(
+                        ContactInquiry.created_at < created_at,
+                        and_(
+                            ContactInquiry.created_at == created_at,
+                            ContactInquiry.id < inquiry_id,
+                        ),
+                    )
+                )
+
+            query = query.order_by(
+                ContactInquiry.created_at.desc(), ContactInquiry.id.desc()
+            ).limit(limit + 1)
+            rows = list(await db.scalars(query))
+
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                # An empty page consumed nothing, so resume from the same place
+                next_cursor = (
+                    encode_cursor(rows[-1].created_at, rows[-1].id) if rows else cursor
+                )
+            return [inquiry_to_dict(inquiry) for inquiry in rows], next_cursor
+
+    async def aggregates(self) -> Tuple[Dict[str, int], float, Dict[str, int], int]:
+        """
+        Return (per-status counts, lead score sum, per-day counts, highest id)
+
+        Everything comes from one grouped query, so the figures describe the
+        same set of rows; the highest id tells callers which inquiries were
+        counted.
+        """
+        day = func.date(ContactInquiry.created_at)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(
+                    ContactInquiry.status,
+                    day,
+                    func.count(ContactInquiry.id),
+                    func.coalesce(func.sum(ContactInquiry.lead_score), 0),
+                    func.max(ContactInquiry.id),
+                ).group_by(ContactInquiry.status, day)
+            )
+            rows = result.all()
+
+        status_counts: Dict[str, int] = {}
+        day_counts: Dict[str, int] = {}
+        score_sum = 0.0
+        max_id = 0
+        for status, created_day, count, scores, group_max_id in rows:
+            status_counts[status.value] = status_counts.get(status.value, 0) + count
+            day_counts[str(created_day)] = day_counts.get(str(created_day), 0) + count
+            score_sum += float(scores)
+            max_id = max(max_id, group_max_id)
+        return status_counts, score_sum, day_counts, max_id
+
+    async def find_by_email(self, email: str) -> List[Dict[str, Any]]:
+        """Return every inquiry submitted from an email address"""
+        async with self.session_factory() as db:
+            query = (
+                select(ContactInquiry)
+                .where(ContactInquiry.email == email)
+                .order_by(ContactInquiry.created_at.desc())
+            )
+            return [inquiry_to_dict(inquiry) for inquiry in await db.scalars(query)]
+
+
+async def _set_commit_sync(db: AsyncSession, durable: bool):
+    """Toggle whether commits wait for the disk flush on this connection"""
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        # SET LOCAL only lasts for the current transaction
+        if not durable:
+            await db.execute(text("SET LOCAL synchronous_commit TO OFF"))
+    elif dialect == "sqlite":
+        # Connection-wide, so it is switched back after the commit
+        await db.execute(text(f"PRAGMA synchronous = {'FULL' if durable else 'OFF'}"))
+
+
+# Create global inquiry store instance
+inquiry_store = InquiryStore()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+"""
+Lead scoring engine
+
+All scoring weights live in the declarative SCORING_RULES table below, which
+is compiled into per-field lookup maps. The same compiled table scores single
+submissions (LeadScorer.score), many inquiries at once in columnar form
+(LeadScorer.score_batch, vectorized with NumPy when it is installed), and the
+whole backlog after a weight change (rescore, also runnable as a CLI):
+
+    python lead_scoring.py rescore --chunk-size 1000
+"""
+
+import argparse
+import logging
+import sys
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: batch scoring falls back to plain Python
+    np = None
+
+logger = logging.getLogger(__name__)
+
+BASE_SCORE = 50
+MAX_SCORE = 100
+
+# Rule kinds:
+#   "present": points if the field has a value
+#   "exact":   points for the value, looked up in a dict
+#   "contains": points for the first substring found in the value
+#   "min_length": points if the value is longer than the threshold
+SCORING_RULES: Tuple[Dict[str, Any], ...] = (
+    # Company information
+    {"field": "company_name", "kind": "present", "points": 10},
+    {"field": "company_website", "kind": "present", "points": 5},
+    # Company size
+    {
+        "field": "company_size",
+        "kind": "contains",
+        "points": (("50+", 15), ("100+", 15), ("20-49", 10), ("10-19", 5)),
+    },
+    # Timeline (urgency); form option values and legacy labels
+    {
+        "field": "project_timeline",
+        "kind": "exact",
+        "points": {
+            "Immediate (ASAP)": 25,
+            "Immediate": 25,
+            "1-2 months": 20,
+            "1-3 months": 20,
+            "3-6 months": 10,
+            "6+ months": 5,
+            "6-12 months": 5,
+        },
+    },
+    # Budget, highest band first
+    {
+        "field": "budget_range",
+        "kind": "contains",
+        "points": (
+            ("$100,000+", 30),
+            ("100k", 30),
+            ("$50,000", 25),
+            ("50k", 25),
+            ("$25,000", 20),
+            ("25k", 20),
+            ("$10,000", 15),
+            ("10k", 15),
+            ("$5,000", 10),
+            ("5k", 10),
+        ),
+    },
+    # High-value services; ServiceType values and display labels
+    {
+        "field": "service_interested",
+        "kind": "contains",
+        "points": (
+            ("chatbot_llm", 10),
+            ("data_strategy", 10),
+            ("process_automation", 10),
+            ("Custom AI Chatbots", 10),
+            ("Data Strategy", 10),
+            ("Process Automation", 10),
+        ),
+    },
+    # Message quality (has detailed message)
+    {"field": "message", "kind": "min_length", "threshold": 100, "points": 5},
+)
+
+SCORED_FIELDS = tuple(dict.fromkeys(rule["field"] for rule in SCORING_RULES))
+
+# Distinct values memoized per field before the lookup map stops growing
+MAX_CACHED_VALUES = 4096
+
+# Rule kinds over enumerated values (form options), worth memoizing per value;
+# free-text fields such as company names rarely repeat and are scored directly
+MEMOIZED_KINDS = {"exact", "contains"}
+
+
+def _normalize(value: Any) -> Optional[str]:
+    """Reduce enums and empty strings so equal inputs share a lookup key"""
+    if value is None:
+        return None
+    value = getattr(value, "value", value)
+    return value if value != "" else None
+
+
+def _compile_rule(rule: Mapping[str, Any]) -> Callable[[Optional[str]], int]:
+    """Turn one rule table entry into a value -> points function"""
+    kind = rule["kind"]
+    points = rule["points"]
+
+    if kind == "present":
+        return lambda value: points if value else 0
+    if kind == "exact":
+        table = dict(points)
+        return lambda value: table.get(value, 0) if value else 0
+    if kind == "contains":
+        patterns = tuple(points)
+
+        def contains(value: Optional[str]) -> int:
+            if value:
+                for pattern, award in patterns:
+                    if pattern in value:
+                        return award
+            return 0
+
+        return contains
+    if kind == "min_length":
+        threshold = rule["threshold"]
+        return lambda value: points if value and len(value) > threshold else 0
+    raise ValueError(f"Unknown scoring rule kind: {kind}")
+
+
+class LeadScorer:
+    """Scores inquiries against a compiled SCORING_RULES table"""
+
+    def __init__(self, rules: Sequence[Mapping[str, Any]] = SCORING_RULES):
+        self.fields: Dict[str, List[Callable[[Optional[str]], int]]] = {}
+        kinds: Dict[str, set] = {}
+        for rule in rules:
+            self.fields.setdefault(rule["field"], []).append(_compile_rule(rule))
+            kinds.setdefault(rule["field"], set()).add(rule["kind"])
+        # Per-field value -> points maps for enumerated fields, filled as
+        # values are seen
+        self._lookups: Dict[str, Dict[Optional[str], int]] = {
+            field: {} for field in self.fields if kinds[field] <= MEMOIZED_KINDS
+        }
+
+    def field_points(self, field: str, value: Any) -> int:
+        """Points a single field value contributes"""
+        value = _normalize(value)
+        lookup = self._lookups.get(field)
+        if lookup is not None:
+            points = lookup.get(value)
+            if points is not None:
+                return points
+
+        points = sum(rule(value) for rule in self.fields[field])
+        if lookup is not None and len(lookup) < MAX_CACHED_VALUES:
+            lookup[value] = points
+        return points
+
+    def score(self, data: Any) -> int:
+        """Score one inquiry (a model, schema object or dict)"""
+        get = data.get if isinstance(data, Mapping) else lambda f: getattr(data, f, None)
+        score = BASE_SCORE
+        for field in self.fields:
+            score += self.field_points(field, get(field))
+        return min(score, MAX_SCORE)
+
+    def score_batch(self, columns: Mapping[str, Sequence[Any]]) -> List[int]:
+        """
+        Score many inquiries given as columns, e.g. {"company_size": [...], ...}
+
+        Each distinct value in a column is scored once and broadcast back to
+        every row, so cost grows with the number of distinct values rather
+        than rows times rules. Missing columns score as empty.
+        """
+        length = max((len(values) for values in columns.values()), default=0)
+
+        if np is not None:
+            totals = np.full(length, BASE_SCORE, dtype=np.int64)
+            for field in self.fields:
+                values = columns.get(field)
+                if values is None:
+                    totals += self.field_points(field, None)
+                    continue
+                keys = [_normalize(value) for value in values]
+                distinct = {key: self.field_points(field, key) for key in set(keys)}
+                totals += np.fromiter(
+                    (distinct[key] for key in keys), dtype=np.int64, count=length
+                )
+            return np.minimum(totals, MAX_SCORE).tolist()
+
+        totals = [BASE_SCORE] * length
+        for field in self.fields:
+            values = columns.get(field)
+            if values is None:
+                points = self.field_points(field, None)
+                totals = [total + points for total in totals]
+                continue
+            distinct: Dict[Optional[str], int] = {}
+            for i, value in enumerate(values):
+                key = _normalize(value)
+                points = distinct.get(key)
+                if points is None:
+                    points = distinct[key] = self.field_points(field, key)
+                totals[i] += points
+        return [min(total, MAX_SCORE) for total in totals]
+
+
+# Create global lead scorer instance
+lead_scorer = LeadScorer()
+
+
+def rescore(chunk_size: int = 1000, session_factory=None, progress=None) -> int:
+    """
+    Recompute lead_score for every stored inquiry
+
+    Walks the table in primary-key order one chunk at a time, scores each
+    chunk in batch mode and writes back only the scores that changed, with
+    a single bulk UPDATE per chunk, committing as it goes. Unchanged rows
+    are left alone so their updated_at still reflects real edits.
+    `progress` is called with the number of rows checked so far. Returns
+    the number of rows whose score changed.
+    """
+    from sqlalchemy import select, update
+
+    from database import SessionLocal
+    from models import ContactInquiry
+
+    session_factory = session_factory or SessionLocal
+    columns = [getattr(ContactInquiry, field) for field in SCORED_FIELDS]
+    last_id = 0
+    total = 0
+    changed = 0
+
+    with session_factory() as db:
+        while True:
+            rows = db.execute(
+                select(ContactInquiry.id, ContactInquiry.lead_score, *columns)
+                .where(ContactInquiry.id > last_id)
+                .order_by(ContactInquiry.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+
+            batch = {
+                field: [row[i + 2] for row in rows]
+                for i, field in enumerate(SCORED_FIELDS)
+            }
+            scores = lead_scorer.score_batch(batch)
+            updates = [
+                {"id": row[0], "lead_score": float(score)}
+                for row, score in zip(rows, scores)
+                if row[1] != score
+            ]
+            if updates:
+                db.execute(update(ContactInquiry), updates)
+                db.commit()
+
+            last_id = rows[-1][0]
+            total += len(rows)
+            changed += len(updates)
+            if progress:
+                progress(total)
+
+    return changed
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Chuco AI lead scoring")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rescore_parser = subparsers.add_parser(
+        "rescore", help="Recompute lead scores for every stored inquiry"
+    )
+    rescore_parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "rescore":
+        count = rescore(
+            chunk_size=args.chunk_size,
+            progress=lambda done: logger.info(f"Rescored {done} inquiries"),
+        )
+        logger.info(f"✅ Updated {count} changed lead scores")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Structured, non-blocking logging
+
+Application loggers hand records to a bounded in-memory queue through a
+QueueHandler; a QueueListener thread formats them (JSON by default) and
+writes them to stderr, so the event loop never waits on terminal or file
+I/O. On the calling side a record only picks up the current request ID and
+goes through per-logger sampling before being enqueued; message
+interpolation, PII redaction and JSON encoding all happen on the listener
+thread. If the queue is full, records are dropped and counted rather than
+blocking the request.
+
+RequestIdMiddleware assigns each request an ID (or keeps a sane incoming
+X-Request-ID), echoes it in the response and tags every record logged while
+handling it. Fields passed via `extra=` become top-level JSON keys:
+
+    logger.info("New inquiry #%s", inquiry_id, extra={"lead_score": 85})
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+
+REQUEST_ID_HEADER = "x-request-id"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Incoming request IDs are kept only if they look like an ID
+_REQUEST_ID_RE = re.compile(r"^[\w.:-]{1,64}$")
+
+EMAIL_RE = re.compile(r"\b([\w.+-]+)@([\w-]+(?:\.[\w-]+)+)\b")
+# North American numbers: 9155550123, (915) 555-0123, +1 915.555.0123
+PHONE_RE = re.compile(
+    r"(?<![\w+])(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\w)"
+)
+
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+def redact(text: str) -> str:
+    """Mask email local parts and phone numbers in a string"""
+    text = EMAIL_RE.sub(r"***@\2", text)
+    return PHONE_RE.sub("[phone]", text)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the ID of the request being handled"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of INFO and DEBUG records for configured loggers
+
+    `rates` maps logger names to the fraction kept (0.1 keeps one in ten);
+    a name also covers its child loggers. Warnings and errors always pass.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            parts = name.split(".")
+            for i in range(len(parts), 0, -1):
+                prefix = ".".join(parts[:i])
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that defers formatting to the listener and never blocks"""
+
+    def __init__(self, log_queue: queue.SimpleQueue, max_size: int):
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue is in-process, so the record is passed as-is and the
+        # listener thread does the formatting
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with extra fields at the top level"""
+
+    def __init__(self, redact_pii: bool = True):
+        super().__init__()
+        self.redact_pii = redact_pii
+
+    def _clean(self, value: Any) -> Any:
+        if self.redact_pii and isinstance(value, str):
+            return redact(value)
+        return value
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": self._clean(record.getMessage()),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                data[key] = self._clean(value)
+        if record.exc_info:
+            data["exception"] = self._clean(self.formatException(record.exc_info))
+        return json.dumps(data, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development, with the same redaction"""
+
+    def __init__(self, redact_pii: bool = True):
+        super().__init__(
+            "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+        )
+        self.redact_pii = redact_pii
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        text = super().format(record)
+        return redact(text) if self.redact_pii else text
+
+
+class LogPipeline:
+    """Owns the root queue handler and the listener thread that drains it"""
+
+    def __init__(self):
+        self.handler: Optional[NonBlockingQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped if self.handler else 0
+
+    def start(
+        self,
+        level: Optional[str] = None,
+        fmt: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        sample_rates: Optional[Dict[str, float]] = None,
+        redact_pii: Optional[bool] = None,
+    ):
+        """Route the root logger through the queue (idempotent)"""
+        if self.listener is not None:
+            return
+
+        redact_pii = settings.LOG_REDACT_PII if redact_pii is None else redact_pii
+        formatter_class = JsonFormatter if (fmt or settings.LOG_FORMAT) == "json" else TextFormatter
+        output = logging.StreamHandler(sys.stderr)
+        output.setFormatter(formatter_class(redact_pii))
+
+        log_queue = queue.SimpleQueue()
+        self.handler = NonBlockingQueueHandler(log_queue, queue_size or settings.LOG_QUEUE_SIZE)
+        self.handler.addFilter(RequestIdFilter())
+        self.handler.addFilter(
+            SamplingFilter(settings.LOG_SAMPLE_RATES if sample_rates is None else sample_rates)
+        )
+        self.listener = QueueListener(log_queue, output, respect_handler_level=True)
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(self.handler)
+        root.setLevel(level or settings.LOG_LEVEL)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Write out everything queued and detach from the root logger"""
+        if self.listener is None:
+            return
+        self.listener.stop()
+        logging.getLogger().removeHandler(self.handler)
+        self.listener = None
+
+
+class RequestIdMiddleware:
+    """ASGI middleware that sets the request ID for logging and the response"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        if incoming and _REQUEST_ID_RE.match(incoming):
+            request_id = incoming
+        else:
+            request_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+
+# Create global log pipeline instance
+log_pipeline = LogPipeline()
+
+
+def configure_logging(**options):
+    """Set up the non-blocking logging pipeline from settings"""
+    log_pipeline.start(**options)
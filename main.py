@@ -2,20 +2,57 @@
 Main FastAPI application for Chuco AI
 """
 
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request, Response, HTTPException, Query
+from contextlib import asynccontextmanager
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
+import asyncio
 import logging
 import os
-import httpx
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+import recaptcha
+from assets import AssetFiles, static_assets
+from conditional import not_modified, set_validators, weak_etag
+from config import settings
+from database import dispose_async_engine, init_db
+from email_queue import email_queue
+from email_service import email_service
+from email_templates import email_templates
+from export import EXPORT_FORMATS, stream_email_logs, stream_inquiries
+from health import health_monitor
+from images import ImageFiles, image_variants, modern_formats
+from import_leads import lead_importer
+from inquiry_stats import inquiry_stats
+from inquiry_store import (
+    inquiry_store,
+    encode_cursor,
+    InvalidCursor,
+    MAX_PAGE_SIZE,
+    VALID_STATUSES,
+)
+from lead_scoring import lead_scorer
+from log_pipeline import RequestIdMiddleware, configure_logging
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    honeypot_hits_total,
+    lead_scoring_seconds,
+    metrics_registry,
+    rate_limited_total,
+)
+from page_cache import PageCache
+from rate_limit import rate_limiter
+from schemas import HealthCheckResponse
+from search import inquiry_search
+from starlette.concurrency import run_in_threadpool
+from write_behind import inquiry_write_buffer
+
+# Configure logging (JSON records written by a background thread)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # ============= CONFIGURATION =============
@@ -24,11 +61,64 @@ RECAPTCHA_ENABLED = True  # Set to True to enable reCAPTCHA
 RECAPTCHA_SITE_KEY = "6LfK3LkrAAAAAOTdm__jSIA-iwQT5fvXFdaO4k66"  # Replace with your site key
 RECAPTCHA_SECRET_KEY = "6LfK3LkrAAAAAPwgail8-m8eQYNFS681KrP3qwdh"  # Replace with your secret key
 
+
+async def warm_up():
+    """
+    Build lazily created resources once the app is serving
+
+    Each of these is also created on first use, so a request that arrives
+    before the warm-up reaches it only pays the cost itself.
+    """
+    steps = (
+        ("reCAPTCHA client", lambda: run_in_threadpool(recaptcha.get_client)),
+        ("email templates", lambda: run_in_threadpool(email_templates.warm)),
+        ("image formats", lambda: run_in_threadpool(modern_formats)),
+        ("inquiry stats", inquiry_stats.rebuild),
+    )
+    for name, step in steps:
+        attempt = asyncio.ensure_future(step())
+        try:
+            await asyncio.shield(attempt)
+        except asyncio.CancelledError:
+            # Cancelling does not stop a step running on a worker thread, so
+            # let it finish before shutdown closes what it is building
+            await asyncio.gather(attempt, return_exceptions=True)
+            raise
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare what requests need before serving; warm the rest in the background"""
+    init_db()
+    static_assets.load()
+    await email_queue.start()
+    if settings.INQUIRY_WRITE_BEHIND_ENABLED:
+        await inquiry_write_buffer.start()
+    await health_monitor.start()
+    warm_up_task = asyncio.create_task(warm_up())
+    yield
+    # Wait for the warm-up to stop before closing what it may be building
+    warm_up_task.cancel()
+    try:
+        await warm_up_task
+    except asyncio.CancelledError:
+        pass
+    await health_monitor.stop()
+    await inquiry_write_buffer.stop()
+    await email_queue.stop()
+    email_service.transport.close()
+    await recaptcha.close_client()
+    await dispose_async_engine()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Chuco AI",
     description="AI Consulting Platform for Small & Mid-Size Businesses",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -40,11 +130,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Record per-route latency, status counts and in-flight requests
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Tag log records and responses with a request ID
+app.add_middleware(RequestIdMiddleware)
+
+# Mount static files (fingerprinted names are served precompressed and immutable)
+app.mount("/static/img", ImageFiles(image_variants), name="images")
+app.mount("/static", AssetFiles(static_assets), name="static")
 
 # Templates
 templates = Jinja2Templates(directory="templates")
+templates.env.globals.update(
+    asset_url=static_assets.url,
+    image_url=image_variants.url,
+    image_srcset=image_variants.srcset,
+)
+
+# Rendered HTML for pages that depend only on settings
+page_cache = PageCache(templates)
 
 
 # ============= MODELS =============
@@ -74,40 +180,6 @@ class ContactForm(BaseModel):
     honeypot: Optional[str] = None  # Honeypot field for spam protection
 
 
-# ============= RATE LIMITING =============
-
-from collections import defaultdict
-import time
-
-
-class RateLimiter:
-    def __init__(self):
-        self.requests = defaultdict(list)
-
-    def is_allowed(
-        self, ip: str, max_requests: int = 10, window_minutes: int = 1
-    ) -> bool:
-        """Check if request is allowed based on rate limit"""
-        now = time.time()
-        window = window_minutes * 60
-
-        # Clean old requests
-        self.requests[ip] = [
-            req_time for req_time in self.requests[ip] if now - req_time < window
-        ]
-
-        # Check if limit exceeded
-        if len(self.requests[ip]) >= max_requests:
-            return False
-
-        # Add current request
-        self.requests[ip].append(now)
-        return True
-
-
-rate_limiter = RateLimiter()
-
-
 # ============= RECAPTCHA VERIFICATION =============
 
 async def verify_recaptcha(token: str) -> bool:
@@ -119,49 +191,67 @@ async def verify_recaptcha(token: str) -> bool:
         return False
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://www.google.com/recaptcha/api/siteverify",
-                data={
-                    "secret": RECAPTCHA_SECRET_KEY,
-                    "response": token
-                }
-            )
-            result = response.json()
-            return result.get("success", False)
+        # Reuse the pooled client shared with recaptcha.py
+        return await recaptcha.siteverify(token, RECAPTCHA_SECRET_KEY)
     except Exception as e:
         logger.error(f"reCAPTCHA verification error: {str(e)}")
         return False
 
 
-# ============= STORAGE =============
-# Simple in-memory storage for inquiries (replace with database in production)
-inquiries_storage = []
-
-
 # ============= PAGE ROUTES =============
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
-    """Render home page"""
+    """Render home page (served from the rendered-page cache)"""
     context = {
-        "request": request,
         "recaptcha_enabled": RECAPTCHA_ENABLED,
         "recaptcha_site_key": RECAPTCHA_SITE_KEY if RECAPTCHA_ENABLED else None
     }
-    return templates.TemplateResponse("index.html", context)
+    return page_cache.response(request, "index.html", context)
+
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (this worker's metrics)"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
 
-@app.get("/health")
+
+@app.get("/health", response_model=HealthCheckResponse)
 async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "message": "Chuco AI is running",
-        "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0",
-        "recaptcha_enabled": RECAPTCHA_ENABLED,
-    }
+    """Health check endpoint (dependency results from the last background check)"""
+    report = health_monitor.report
+    return HealthCheckResponse(
+        status=report.status,
+        message="Chuco AI is running",
+        timestamp=report.checked_at or datetime.now(),
+        version="1.0.0",
+        database_connected=report.database_connected,
+        recaptcha_enabled=RECAPTCHA_ENABLED,
+        checks=report.checks,
+    )
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the database is reachable and checks are current"""
+    report = health_monitor.report
+    return JSONResponse(
+        status_code=200 if health_monitor.ready else 503,
+        content={
+            "ready": health_monitor.ready,
+            "status": report.status,
+            "checked_at": report.checked_at.isoformat() if report.checked_at else None,
+            "checks": report.checks,
+        }
+    )
 
 
 # ============= API ROUTES =============
@@ -180,6 +270,7 @@ async def submit_contact_form(
     # Check honeypot field (if filled, it's likely a bot)
     if form_data.honeypot:
         logger.warning(f"Honeypot triggered from IP: {client_ip}")
+        honeypot_hits_total.inc()
         # Return success to confuse bots, but don't process
         return JSONResponse(
             status_code=200,
@@ -189,8 +280,13 @@ async def submit_contact_form(
             }
         )
 
-    # Check rate limit (10 requests per minute)
-    if not rate_limiter.is_allowed(client_ip, max_requests=10):
+    # Check rate limit (RATE_LIMIT_PER_MINUTE requests per minute)
+    if rate_limiter.blocking:
+        allowed = await run_in_threadpool(rate_limiter.is_allowed, client_ip)
+    else:
+        allowed = rate_limiter.is_allowed(client_ip)
+    if not allowed:
+        rate_limited_total.inc()
         raise HTTPException(
             status_code=429, 
             detail="Too many requests. Please try again later."
@@ -211,8 +307,6 @@ async def submit_contact_form(
         
         # Create inquiry record
         inquiry = {
-            "id": len(inquiries_storage) + 1,
-            "timestamp": datetime.now().isoformat(),
             "first_name": form_data.first_name,
             "last_name": form_data.last_name,
             "email": form_data.email,
@@ -235,23 +329,29 @@ async def submit_contact_form(
             "lead_score": lead_score,
             "ip_address": client_ip,
             "user_agent": request.headers.get("user-agent"),
-            "status": "new"
         }
         
-        # Store inquiry (in production, save to database)
-        inquiries_storage.append(inquiry)
+        # Store inquiry in the database (batched with concurrent submissions
+        # when write-behind is enabled), queueing its admin notification and
+        # confirmation emails in the same transaction
+        inquiry = await inquiry_write_buffer.submit(inquiry)
+        inquiry_stats.record_created(inquiry)
         
         # Log the inquiry
-        logger.info(f"New inquiry #{inquiry['id']} from {form_data.first_name} {form_data.last_name}")
-        logger.info(f"Email: {form_data.email} | Phone: {form_data.phone}")
-        logger.info(f"Company: {form_data.company_name} | Service: {form_data.service_interested}")
-        logger.info(f"Timeline: {form_data.project_timeline} | Lead Score: {lead_score}")
+        logger.info(
+            "New inquiry #%s", inquiry["id"],
+            extra={
+                "inquiry_id": inquiry["id"],
+                "email": form_data.email,
+                "company": form_data.company_name,
+                "service": form_data.service_interested,
+                "timeline": form_data.project_timeline,
+                "lead_score": lead_score,
+            }
+        )
         
         # TODO: In production, you would also:
-        # 1. Save to database
-        # 2. Send email notification to admin
-        # 3. Send confirmation email to user
-        # 4. Integrate with CRM (HubSpot, Salesforce, etc.)
+        # 1. Integrate with CRM (HubSpot, Salesforce, etc.)
         
         return JSONResponse(
             status_code=200,
@@ -275,99 +375,197 @@ async def submit_contact_form(
 
 def calculate_lead_score(form_data: ContactForm) -> int:
     """Calculate lead score based on form data"""
-    score = 50  # Base score
-    
-    # Company information
-    if form_data.company_name:
-        score += 10
-    if form_data.company_website:
-        score += 5
-    
-    # Company size scoring
-    if form_data.company_size:
-        if "50+" in form_data.company_size or "100+" in form_data.company_size:
-            score += 15
-        elif "20-49" in form_data.company_size:
-            score += 10
-        elif "10-19" in form_data.company_size:
-            score += 5
-    
-    # Timeline scoring (urgency)
-    if form_data.project_timeline == "Immediate (ASAP)":
-        score += 25
-    elif form_data.project_timeline == "1-2 months":
-        score += 20
-    elif form_data.project_timeline == "3-6 months":
-        score += 10
-    elif form_data.project_timeline == "6+ months":
-        score += 5
-    
-    # Budget scoring
-    if form_data.budget_range:
-        if "$100,000+" in form_data.budget_range:
-            score += 30
-        elif "$50,000" in form_data.budget_range:
-            score += 25
-        elif "$25,000" in form_data.budget_range:
-            score += 20
-        elif "$10,000" in form_data.budget_range:
-            score += 15
-        elif "$5,000" in form_data.budget_range:
-            score += 10
-    
-    # Service interest scoring
-    if form_data.service_interested:
-        high_value_services = ["Custom AI Chatbots", "Data Strategy", "Process Automation"]
-        if any(service in form_data.service_interested for service in high_value_services):
-            score += 10
-    
-    # Message quality (has detailed message)
-    if form_data.message and len(form_data.message) > 100:
-        score += 5
-    
-    # Cap score at 100
-    return min(score, 100)
+    with lead_scoring_seconds.time():
+        return lead_scorer.score(form_data)
 
 
 # ============= ADMIN ENDPOINTS =============
 
+async def store_not_modified(request: Request, response: Response, *tag) -> Optional[Response]:
+    """
+    Validate a request against the inquiry store's change counter
+    Returns a 304 if the client's copy is current, otherwise sets the validators on response
+    """
+    version = await inquiry_store.version()
+    if version is None:
+        return None
+
+    etag = weak_etag(*tag, version.version)
+    cached = not_modified(request, etag, version.changed_at)
+    if cached is None:
+        set_validators(response, etag, version.changed_at)
+    return cached
+
+
 @app.get("/api/inquiries")
 async def get_inquiries(
+    request: Request,
+    response: Response,
     status: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
 ):
     """
     Get list of inquiries (admin endpoint)
+    Pass the returned next_cursor as `cursor` to page without offsets
+    Supports If-None-Match / If-Modified-Since (304 when nothing changed)
     Note: In production, protect with authentication
     """
-    # Filter by status if provided
-    filtered_inquiries = inquiries_storage
-    if status:
-        filtered_inquiries = [inq for inq in inquiries_storage if inq.get("status") == status]
-    
-    # Sort by timestamp (newest first)
-    filtered_inquiries.sort(key=lambda x: x['timestamp'], reverse=True)
-    
-    # Apply pagination
-    paginated = filtered_inquiries[offset:offset + limit]
+    cached = await store_not_modified(request, response, "inquiries")
+    if cached:
+        return cached
+
+    if cursor:
+        # Keyset pagination: seek past the cursor instead of counting rows
+        try:
+            paginated, next_cursor = await inquiry_store.page(
+                status=status, limit=limit, cursor=cursor
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return {
+            "success": True,
+            "limit": limit,
+            "cursor": cursor,
+            "next_cursor": next_cursor,
+            "inquiries": paginated
+        }
+
+    # Filter by status and paginate (newest first) in the database
+    total, paginated = await inquiry_store.list(status=status, limit=limit, offset=offset)
+
+    next_cursor = None
+    if paginated and offset + len(paginated) < total:
+        last = paginated[-1]
+        next_cursor = encode_cursor(datetime.fromisoformat(last["timestamp"]), last["id"])
     
     return {
         "success": True,
-        "total": len(filtered_inquiries),
+        "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
         "inquiries": paginated
     }
 
 
+def export_response(name: str, format: str, stream_rows, **filters) -> StreamingResponse:
+    """Stream an export as a CSV or NDJSON file download"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format. Must be one of: {list(EXPORT_FORMATS)}"
+        )
+    try:
+        body = stream_rows(format, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@app.get("/api/inquiries/export")
+async def export_inquiries(
+    format: str = "csv",
+    status: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    Export inquiries as CSV or NDJSON (admin endpoint)
+    Rows are streamed from a server-side cursor; both dates are inclusive
+    Note: In production, protect with authentication
+    """
+    return export_response(
+        "inquiries", format, stream_inquiries,
+        status=status, start_date=start_date, end_date=end_date
+    )
+
+
+@app.get("/api/email-logs/export")
+async def export_email_logs(
+    format: str = "csv",
+    status: Optional[str] = None,
+    email_type: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    Export email logs as CSV or NDJSON (admin endpoint)
+    status is "sent" or "failed"; both dates are inclusive
+    Note: In production, protect with authentication
+    """
+    return export_response(
+        "email-logs", format, stream_email_logs,
+        status=status, email_type=email_type,
+        start_date=start_date, end_date=end_date
+    )
+
+
+@app.get("/api/inquiries/search")
+async def search_inquiries(
+    q: str,
+    status: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Keyword search over message, company name, industry and email (admin endpoint)
+    Results are ranked best match first; every word must match (as a prefix)
+    Note: In production, protect with authentication
+    """
+    total, results = await inquiry_search.search(
+        q, status=status, limit=limit, offset=offset
+    )
+
+    return {
+        "success": True,
+        "query": q,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "inquiries": results
+    }
+
+
+@app.post("/api/inquiries/import")
+async def import_inquiries(request: Request, format: str = "csv"):
+    """
+    Bulk import legacy leads from a CSV or NDJSON request body (admin endpoint)
+    Rows are validated, scored and inserted in batches; bad rows are reported
+    Note: In production, protect with authentication
+    """
+    try:
+        result = await lead_importer.import_upload(request.stream(), format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Imported rows bypass the incremental counters
+    await inquiry_stats.rebuild()
+
+    logger.info(f"Imported {result.imported} leads ({result.failed} failed)")
+    return {"success": True, **result.to_dict()}
+
+
 @app.get("/api/inquiries/{inquiry_id}")
-async def get_inquiry(inquiry_id: int):
+async def get_inquiry(inquiry_id: int, request: Request, response: Response):
     """
     Get single inquiry by ID (admin endpoint)
+    Supports If-None-Match / If-Modified-Since (304 when nothing changed)
     Note: In production, protect with authentication
     """
-    inquiry = next((inq for inq in inquiries_storage if inq['id'] == inquiry_id), None)
+    cached = await store_not_modified(request, response, "inquiry", inquiry_id)
+    if cached:
+        return cached
+
+    inquiry = await inquiry_store.get(inquiry_id)
     
     if not inquiry:
         raise HTTPException(status_code=404, detail="Inquiry not found")
@@ -387,19 +585,20 @@ async def update_inquiry_status(
     Update inquiry status (admin endpoint)
     Note: In production, protect with authentication
     """
-    inquiry = next((inq for inq in inquiries_storage if inq['id'] == inquiry_id), None)
+    if status not in VALID_STATUSES:
+        if await inquiry_store.get(inquiry_id) is None:
+            raise HTTPException(status_code=404, detail="Inquiry not found")
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {VALID_STATUSES}")
+    
+    # Update status (bracketed so a concurrent stats rebuild can tell)
+    with inquiry_stats.status_change():
+        previous_status, inquiry = await inquiry_store.update_status(inquiry_id, status)
+        if inquiry:
+            inquiry_stats.record_status_change(previous_status, status)
     
     if not inquiry:
         raise HTTPException(status_code=404, detail="Inquiry not found")
     
-    # Update status
-    valid_statuses = ["new", "contacted", "qualified", "proposal_sent", "won", "lost"]
-    if status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
-    
-    inquiry["status"] = status
-    inquiry["updated_at"] = datetime.now().isoformat()
-    
     return {
         "success": True,
         "message": f"Inquiry status updated to {status}",
@@ -408,29 +607,24 @@ async def update_inquiry_status(
 
 
 @app.get("/api/stats")
-async def get_stats():
+async def get_stats(request: Request, response: Response):
     """
     Get inquiry statistics (admin endpoint)
+    Supports If-None-Match (304 when the numbers are unchanged)
     """
-    total = len(inquiries_storage)
-    today_count = sum(1 for inq in inquiries_storage 
-                     if inq['timestamp'].startswith(datetime.now().strftime('%Y-%m-%d')))
-    
-    status_counts = {}
-    for inq in inquiries_storage:
-        status = inq.get('status', 'new')
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
-    avg_lead_score = sum(inq.get('lead_score', 0) for inq in inquiries_storage) / max(total, 1)
-    
+    stats = await inquiry_stats.snapshot()
+
+    # Counters live in memory and roll over at midnight, so the tag is
+    # their values rather than the store version
+    etag = weak_etag("stats", inquiry_stats.digest(stats))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_validators(response, etag)
+
     return {
         "success": True,
-        "stats": {
-            "total_inquiries": total,
-            "today_inquiries": today_count,
-            "average_lead_score": round(avg_lead_score, 1),
-            "by_status": status_counts
-        }
+        "stats": stats
     }
 
 
@@ -444,7 +638,7 @@ async def not_found_handler(request: Request, exc: HTTPException):
             status_code=404, 
             content={"success": False, "message": "Endpoint not found"}
         )
-    return templates.TemplateResponse("index.html", {"request": request})
+    return page_cache.response(request, "index.html")
 
 
 @app.exception_handler(500)
@@ -456,7 +650,7 @@ async def internal_error_handler(request: Request, exc: Exception):
             status_code=500,
             content={"success": False, "message": "Internal server error"}
         )
-    return templates.TemplateResponse("index.html", {"request": request})
+    return page_cache.response(request, "index.html")
 
 
 if __name__ == "__main__":
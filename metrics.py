@@ -0,0 +1,335 @@
+"""
+Prometheus-style metrics for request latency and the contact form hot path
+
+A small, dependency-free implementation of counters, gauges and histograms
+rendered in the Prometheus text exposition format at GET /metrics.
+MetricsMiddleware records per-route latency, response counts and in-flight
+requests; the module-level children below (recaptcha_seconds,
+db_write_seconds, ...) are labelled once at import so instrumented code only
+takes a lock and bumps a number:
+
+    with smtp_send_seconds.time():
+        server.send_message(msg)
+
+Values are kept per process; with several workers each scrape sees the
+worker that served it, so scrape every worker or run a single one.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Starlette appends "; charset=utf-8" to text/* media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Latency buckets in seconds, from a fast template render to a slow SMTP send
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Value:
+    """A single counter or gauge value"""
+
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "_HistogramValue"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class _HistogramValue:
+    """Bucket counts and sum for one label set"""
+
+    __slots__ = ("_lock", "upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # Last is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> _Timer:
+        """Context manager that observes the elapsed seconds"""
+        return _Timer(self)
+
+
+class Metric:
+    """A named metric family; labels() returns the child for one label set"""
+
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["MetricsRegistry"] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        (registry or metrics_registry).register(self)
+
+    def _new_child(self):
+        return _Value()
+
+    def labels(self, *values) -> Any:
+        """Return the child for a label set, creating it on first use"""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """Yield (name, formatted labels, value) for every child"""
+        for key, child in list(self._children.items()):
+            yield self.name, _format_labels(self.labelnames, key), child.value
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(
+            f"{name}{labels} {_format_value(value)}"
+            for name, labels, value in self.samples()
+        )
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    type = "counter"
+
+
+class Gauge(Metric):
+    """Value that goes up and down"""
+
+    type = "gauge"
+
+
+class Histogram(Metric):
+    """Distribution of observed values over cumulative buckets"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional["MetricsRegistry"] = None,
+    ):
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        names = self.labelnames + ("le",)
+        bounds = [_format_value(bound) for bound in self.upper_bounds] + ["+Inf"]
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(names, key + (bound,)), cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """Text exposition of every registered metric"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Request methods labelled as themselves; anything else is "other", since
+# the method is client-controlled and would otherwise grow the label set
+KNOWN_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, status counts and in-flight requests
+
+    Routes are labelled by their path template (/api/inquiries/{inquiry_id})
+    or mount path and methods outside KNOWN_METHODS as "other", so label
+    cardinality is bounded by the app's routes. Children are cached per
+    (endpoint, method) after the first request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_names: Optional[Dict[Any, str]] = None
+        self._children: Dict[Tuple[Any, str], Tuple[str, _HistogramValue, Dict[int, _Value]]] = {}
+
+    def _route_name(self, scope: Scope) -> str:
+        if self._route_names is None:
+            routes = getattr(scope.get("app"), "routes", ())
+            self._route_names = {
+                getattr(route, "endpoint", None) or getattr(route, "app", None): route.path
+                for route in routes
+                if hasattr(route, "path")
+            }
+        return self._route_names.get(scope.get("endpoint"), "unmatched")
+
+    def _record(self, scope: Scope, status: int, elapsed: float):
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "other"
+        key = (scope.get("endpoint"), method)
+        children = self._children.get(key)
+        if children is None:
+            route = self._route_name(scope)
+            children = self._children[key] = (
+                route,
+                http_request_seconds.labels(route, method),
+                {},
+            )
+        route, latency, by_status = children
+        latency.observe(elapsed)
+        counter = by_status.get(status)
+        if counter is None:
+            counter = by_status[status] = http_requests_total.labels(
+                route, method, status
+            )
+        counter.inc()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_progress.dec()
+            self._record(scope, status, time.perf_counter() - start)
+
+
+# Create global metrics registry
+metrics_registry = MetricsRegistry()
+
+# HTTP request metrics (recorded by MetricsMiddleware)
+http_request_seconds = Histogram(
+    "chucoai_http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ("route", "method"),
+)
+http_requests_total = Counter(
+    "chucoai_http_requests_total",
+    "HTTP responses sent",
+    ("route", "method", "status"),
+)
+http_requests_in_progress = Gauge(
+    "chucoai_http_requests_in_progress",
+    "HTTP requests currently being handled",
+).labels()
+
+# Contact form hot path, one preallocated child per stage
+stage_seconds = Histogram(
+    "chucoai_stage_duration_seconds",
+    "Time spent in each stage of handling an inquiry",
+    ("stage",),
+)
+recaptcha_seconds = stage_seconds.labels("recaptcha")
+lead_scoring_seconds = stage_seconds.labels("lead_scoring")
+db_write_seconds = stage_seconds.labels("db_write")
+template_render_seconds = stage_seconds.labels("template_render")
+smtp_send_seconds = stage_seconds.labels("smtp_send")
+
+# Spam protection outcomes
+rate_limited_total = Counter(
+    "chucoai_rate_limited_total",
+    "Contact form submissions rejected by the rate limiter",
+).labels()
+honeypot_hits_total = Counter(
+    "chucoai_honeypot_hits_total",
+    "Contact form submissions that filled in the honeypot field",
+).labels()
@@ -2,7 +2,17 @@
 Database models for Chuco AI application
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, Enum
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    Boolean,
+    Float,
+    Enum,
+    Index,
+)
 from sqlalchemy.sql import func
 from database import Base
 import enum
@@ -18,6 +28,9 @@ class InquiryStatus(str, enum.Enum):
     NOT_QUALIFIED = "not_qualified"
     CONVERTED = "converted"
     CLOSED = "closed"
+    PROPOSAL_SENT = "proposal_sent"
+    WON = "won"
+    LOST = "lost"
 
 
 class ServiceType(str, enum.Enum):
@@ -36,6 +49,11 @@ class ContactInquiry(Base):
     """Model for storing contact form submissions and inquiries"""
 
     __tablename__ = "contact_inquiries"
+    __table_args__ = (
+        # Keyset pagination indexes, newest first by (created_at, id)
+        Index("ix_contact_inquiries_created_at_id", "created_at", "id"),
+        Index("ix_contact_inquiries_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -68,7 +86,7 @@ class ContactInquiry(Base):
     referral_source = Column(String(255), nullable=True)  # Specific referral details
 
     # Status and Tracking
-    status = Column(Enum(InquiryStatus), default=InquiryStatus.NEW)
+    status = Column(Enum(InquiryStatus), default=InquiryStatus.NEW, index=True)
     assigned_to = Column(String(100), nullable=True)  # Team member assigned
 
     # Technical Information
@@ -79,7 +97,7 @@ class ContactInquiry(Base):
     utm_campaign = Column(String(100), nullable=True)
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     contacted_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -100,60 +118,10 @@ class ContactInquiry(Base):
         return f"{self.first_name} {self.last_name}"
 
     def calculate_lead_score(self):
-        """Calculate lead score based on various factors"""
-        score = 0.0
-
-        # Company size scoring
-        if self.company_size:
-            if "50" in self.company_size:
-                score += 20
-            elif "10" in self.company_size:
-                score += 15
-            else:
-                score += 10
-
-        # Budget scoring
-        if self.budget_range:
-            if "50k" in self.budget_range or "100k" in self.budget_range:
-                score += 30
-            elif "25k" in self.budget_range:
-                score += 20
-            elif "10k" in self.budget_range:
-                score += 15
-            else:
-                score += 5
-
-        # Timeline scoring
-        if self.project_timeline:
-            if "immediate" in self.project_timeline.lower():
-                score += 25
-            elif "1-3" in self.project_timeline:
-                score += 20
-            elif "3-6" in self.project_timeline:
-                score += 10
-            else:
-                score += 5
-
-        # Service type scoring
-        if self.service_interested in [
-            ServiceType.CHATBOT_LLM,
-            ServiceType.DATA_STRATEGY,
-        ]:
-            score += 15
-        elif self.service_interested == ServiceType.AI_AUDIT:
-            score += 10
-        else:
-            score += 5
-
-        # Has company website
-        if self.company_website:
-            score += 5
-
-        # Has phone number
-        if self.phone:
-            score += 5
-
-        self.lead_score = min(score, 100)  # Cap at 100
+        """Calculate lead score using the shared scoring rule table"""
+        from lead_scoring import lead_scorer
+
+        self.lead_score = float(lead_scorer.score(self))
         return self.lead_score
 
 
@@ -186,3 +154,57 @@ class EmailLog(Base):
 
     def __repr__(self):
         return f"<EmailLog {self.email_type} to {self.recipient_email}>"
+
+
+class EmailJobStatus(str, enum.Enum):
+    """Delivery states for queued email jobs"""
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailJob(Base):
+    """Model for email deliveries waiting in the background queue"""
+
+    __tablename__ = "email_jobs"
+    __table_args__ = (
+        # Workers claim the oldest due pending job
+        Index("ix_email_jobs_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Job Details
+    email_type = Column(
+        String(50), nullable=False
+    )  # e.g., "inquiry_notification", "inquiry_confirmation"
+    inquiry_id = Column(Integer, nullable=False)  # Reference to ContactInquiry
+
+    # Delivery State
+    status = Column(Enum(EmailJobStatus), default=EmailJobStatus.PENDING)
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<EmailJob {self.email_type} for inquiry {self.inquiry_id} - {self.status}>"
+
+
+class ChangeCounter(Base):
+    """Per-table write counters, bumped by database triggers on every change"""
+
+    __tablename__ = "change_counters"
+
+    name = Column(String(50), primary_key=True)  # Table being tracked
+    version = Column(Integer, nullable=False, default=0)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<ChangeCounter {self.name} v{self.version}>"
@@ -0,0 +1,146 @@
+"""
+Rendered-page cache for HTML routes
+
+Pages whose output depends only on their template context (the landing page
+and the HTML 404/500 fallback) are rendered once per distinct context and
+kept as body bytes, a strong ETag and precompressed variants. Serving one is
+a dictionary lookup; conditional requests get a 304 with no body. Entries
+are dropped when a template or the static asset manifest changes on disk
+(checked at most every PAGE_CACHE_CHECK_SECONDS), and changed settings
+produce a different context and therefore a separate entry.
+
+Cached templates must not depend on the request (no url_for / request.*).
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+from fastapi.templating import Jinja2Templates
+from starlette.requests import Request
+from starlette.responses import Response
+
+from assets import StaticAssets, preferred_encoding, static_assets
+from config import settings
+from metrics import template_render_seconds
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are kept without it
+    brotli = None
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    """A rendered page and its precompressed variants"""
+
+    body: bytes
+    digest: str
+    encoded: Dict[str, bytes]
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+
+class PageCache:
+    """Caches rendered template output keyed by template name and context"""
+
+    def __init__(
+        self,
+        templates: Jinja2Templates,
+        assets: StaticAssets = static_assets,
+        check_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.env = templates.env
+        self.assets = assets
+        self.check_seconds = (
+            settings.PAGE_CACHE_CHECK_SECONDS if check_seconds is None else check_seconds
+        )
+        self.enabled = settings.PAGE_CACHE_ENABLED if enabled is None else enabled
+        self._pages: Dict[Tuple[str, Hashable], CachedPage] = {}
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple] = None
+        self._checked_at = 0.0
+
+    def _sources_stamp(self) -> Tuple:
+        """Modification times of every template and the asset manifest"""
+        mtimes = []
+        for directory in getattr(self.env.loader, "searchpath", ()):
+            for path in sorted(Path(directory).rglob("*")):
+                if path.is_file():
+                    mtimes.append(path.stat().st_mtime_ns)
+        try:
+            mtimes.append(self.assets.manifest_path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return tuple(mtimes)
+
+    def _check_fresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_seconds:
+            return
+        self._checked_at = now
+        stamp = self._sources_stamp()
+        if stamp != self._stamp:
+            with self._lock:
+                self._pages.clear()
+                self._stamp = stamp
+
+    def render(self, name: str, context: Mapping[str, Any]) -> CachedPage:
+        """Render a template and precompress the result"""
+        template = self.env.get_template(name)
+        with template_render_seconds.time():
+            body = template.render(**context).encode()
+        encoded = {"gzip": gzip.compress(body, 9, mtime=0)}
+        if brotli is not None:
+            encoded["br"] = brotli.compress(body, quality=11)
+        return CachedPage(body, hashlib.sha256(body).hexdigest()[:32], encoded)
+
+    def get(self, name: str, context: Mapping[str, Any]) -> CachedPage:
+        """Return the cached page for a context, rendering it on first use"""
+        if not self.enabled:
+            return self.render(name, context)
+        self._check_fresh()
+        key = (name, tuple(sorted(context.items())))
+        page = self._pages.get(key)
+        if page is None:
+            page = self.render(name, context)
+            with self._lock:
+                self._pages[key] = page
+        return page
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+    def response(
+        self,
+        request: Request,
+        name: str,
+        context: Optional[Mapping[str, Any]] = None,
+        status_code: int = 200,
+    ) -> Response:
+        """Serve a cached page, honouring If-None-Match and Accept-Encoding"""
+        page = self.get(name, context or {})
+        encoding = preferred_encoding(
+            request.headers.get("accept-encoding", ""), tuple(page.encoded)
+        )
+        headers = {
+            "etag": page.etag(encoding),
+            "vary": "Accept-Encoding",
+            "cache-control": "no-cache",
+        }
+        if status_code == 200 and page.digest in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["content-encoding"] = encoding
+            body = page.encoded[encoding]
+        else:
+            body = page.body
+        return Response(body, status_code=status_code, media_type="text/html", headers=headers)
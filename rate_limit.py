@@ -0,0 +1,297 @@
+"""
+Rate limiting for public form submissions
+
+The limiter keeps a sliding-window counter per key in a pluggable backend:
+
+- "memory": per-process dict, the fastest option for a single worker
+- "sqlite": a shared SQLite file, for several workers on one host
+- "redis": a networked store shared by every worker on every host
+
+Each check is a single atomic check-and-increment round trip to the
+backend. Only allowed requests are counted, so a client that keeps retrying
+while limited is let back in as soon as its earlier requests age out.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import settings
+
+
+class RateLimitBackend:
+    """Interface for rate limit counter storage"""
+
+    # True when hit() does blocking I/O and should run off the event loop
+    blocking = False
+
+    def hit(
+        self,
+        key: str,
+        window: int,
+        window_seconds: int,
+        limit: int,
+        previous_weight: float,
+    ) -> bool:
+        """
+        Atomically count one request for `key` in fixed window number `window`
+
+        The request is counted only if `previous_weight` times the previous
+        window's count plus the current count, including this request, stays
+        within `limit`. Returns True if it was counted (allowed).
+        """
+        raise NotImplementedError
+
+
+class _Window:
+    """Sliding-window counter state for a single key"""
+
+    __slots__ = ("window", "count", "previous")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self.previous = 0
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    In-process counters kept in LRU order
+
+    Idle keys are evicted as they age out and `max_keys` caps how many are
+    tracked, so memory stays bounded under a flood of distinct IPs.
+    """
+
+    def __init__(self, max_keys: Optional[int] = None):
+        self.max_keys = max_keys or settings.RATE_LIMIT_MAX_TRACKED_KEYS
+        self.windows: "OrderedDict[str, _Window]" = OrderedDict()
+
+    def hit(
+        self,
+        key: str,
+        window: int,
+        window_seconds: int,
+        limit: int,
+        previous_weight: float,
+    ) -> bool:
+        state = self.windows.get(key)
+        if state is None:
+            state = self.windows[key] = _Window(window)
+        else:
+            self.windows.move_to_end(key)
+            if state.window != window:
+                # Roll over: last window's count becomes the previous one
+                state.previous = state.count if state.window == window - 1 else 0
+                state.count = 0
+                state.window = window
+
+        allowed = state.previous * previous_weight + state.count + 1 <= limit
+        if allowed:
+            state.count += 1
+        self._evict(window)
+        return allowed
+
+    def _evict(self, window: int):
+        """Drop keys that have gone idle or exceed the tracked-key cap"""
+        windows = self.windows
+        while len(windows) > self.max_keys:
+            windows.popitem(last=False)
+
+        # Least recently used keys sit at the front; stop at the first live one
+        while windows:
+            key, state = next(iter(windows.items()))
+            if state.window >= window - 1:
+                break
+            del windows[key]
+
+    def __len__(self) -> int:
+        return len(self.windows)
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Counters in a SQLite file shared by every worker on the host
+
+    The check and increment run in one BEGIN IMMEDIATE transaction, which
+    SQLite serializes across processes. Rows older than the previous window
+    are pruned once per window by each process.
+    """
+
+    blocking = True
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.RATE_LIMIT_SQLITE_PATH
+        self._local = threading.local()
+        self._pruned_window = None
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " key TEXT NOT NULL,"
+                " window INTEGER NOT NULL,"
+                " count INTEGER NOT NULL,"
+                " PRIMARY KEY (key, window))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_rate_limits_window"
+                " ON rate_limits (window)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(
+        self,
+        key: str,
+        window: int,
+        window_seconds: int,
+        limit: int,
+        previous_weight: float,
+    ) -> bool:
+        conn = self._connect()
+        if self._pruned_window != window:
+            self._pruned_window = window
+            conn.execute("DELETE FROM rate_limits WHERE window < ?", (window - 1,))
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            counts = dict(conn.execute(
+                "SELECT window, count FROM rate_limits"
+                " WHERE key = ? AND window IN (?, ?)",
+                (key, window, window - 1),
+            ).fetchall())
+            allowed = (
+                counts.get(window - 1, 0) * previous_weight + counts.get(window, 0) + 1
+                <= limit
+            )
+            if allowed:
+                conn.execute(
+                    "INSERT INTO rate_limits (key, window, count) VALUES (?, ?, 1)"
+                    " ON CONFLICT (key, window) DO UPDATE SET count = count + 1",
+                    (key, window),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Counters in Redis (or any server speaking its protocol)
+
+    The check and the INCR/EXPIRE run server-side in one Lua script (sent
+    with EVALSHA), so a check is atomic and costs a single round trip. Any
+    client exposing redis-py's register_script() can be passed in, e.g. for
+    a local stand-in.
+    """
+
+    # KEYS: current window, previous window
+    # ARGV: previous window weight, limit, expiry in seconds
+    HIT_SCRIPT = """
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * tonumber(ARGV[1]) + count + 1 > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+    blocking = True
+
+    def __init__(self, url: Optional[str] = None, client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "RATE_LIMIT_BACKEND=redis requires the 'redis' package"
+                ) from e
+            client = redis.Redis.from_url(
+                url or settings.RATE_LIMIT_REDIS_URL,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        self.client = client
+        self._hit_script = client.register_script(self.HIT_SCRIPT)
+
+    def hit(
+        self,
+        key: str,
+        window: int,
+        window_seconds: int,
+        limit: int,
+        previous_weight: float,
+    ) -> bool:
+        allowed = self._hit_script(
+            keys=[f"ratelimit:{key}:{window}", f"ratelimit:{key}:{window - 1}"],
+            args=[repr(previous_weight), limit, window_seconds * 2],
+        )
+        return bool(int(allowed))
+
+
+def create_backend(name: Optional[str] = None) -> RateLimitBackend:
+    """Build the backend named by RATE_LIMIT_BACKEND"""
+    name = (name or settings.RATE_LIMIT_BACKEND).lower()
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        return SQLiteBackend()
+    if name == "redis":
+        return RedisBackend()
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+class RateLimiter:
+    """
+    Sliding-window counter rate limiter
+
+    The backend stores one counter per key for the current fixed window and
+    one for the window before it. The previous count is weighted by how much
+    of it still overlaps the sliding window, so checks are O(1).
+    """
+
+    def __init__(
+        self,
+        backend: Optional[RateLimitBackend] = None,
+        max_requests: Optional[int] = None,
+        window_seconds: int = 60,
+        enabled: Optional[bool] = None,
+    ):
+        self.backend = create_backend() if backend is None else backend
+        self.max_requests = (
+            settings.RATE_LIMIT_PER_MINUTE if max_requests is None else max_requests
+        )
+        self.window_seconds = window_seconds
+        self.enabled = settings.RATE_LIMIT_ENABLED if enabled is None else enabled
+
+    @property
+    def blocking(self) -> bool:
+        """True when checks do blocking I/O and belong in the threadpool"""
+        return self.enabled and self.backend.blocking
+
+    def is_allowed(self, ip: str, max_requests: Optional[int] = None) -> bool:
+        """Check if request is allowed based on rate limit"""
+        if not self.enabled:
+            return True
+
+        limit = self.max_requests if max_requests is None else max_requests
+        now = time.time()
+        window, offset = divmod(now, self.window_seconds)
+        overlap = 1 - offset / self.window_seconds
+        return self.backend.hit(ip, int(window), self.window_seconds, limit, overlap)
+
+
+# Create global rate limiter instance
+rate_limiter = RateLimiter()
@@ -1,29 +1,87 @@
-import httpx
+import importlib.util
+import threading
+from typing import TYPE_CHECKING, Optional
 from config import settings
+from metrics import recaptcha_seconds
 import logging
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
+# Shared, connection-pooled client; created on first use (or by the startup
+# warm-up) and closed by the app lifespan
+_client: Optional["httpx.AsyncClient"] = None
+_client_lock = threading.Lock()
+
+
+def create_client() -> "httpx.AsyncClient":
+    """Build a keep-alive client for the verification endpoint"""
+    # httpx (with httpcore, anyio backends and the CA bundle) is imported
+    # here rather than at module level, keeping it off the app's import path
+    import httpx
+
+    # HTTP/2 needs the optional h2 package (httpx[http2])
+    http2 = settings.RECAPTCHA_HTTP2 and importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(
+            settings.RECAPTCHA_READ_TIMEOUT,
+            connect=settings.RECAPTCHA_CONNECT_TIMEOUT,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.RECAPTCHA_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.RECAPTCHA_MAX_CONNECTIONS,
+            keepalive_expiry=settings.RECAPTCHA_KEEPALIVE_SECONDS,
+        ),
+    )
+
+
+def get_client() -> "httpx.AsyncClient":
+    """Return the shared client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        # The warm-up builds the client on a worker thread
+        with _client_lock:
+            if _client is None or _client.is_closed:
+                _client = create_client()
+    return _client
+
+
+async def close_client():
+    """Close the shared client and its pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def siteverify(token: str, secret_key: str) -> bool:
+    """Check a token against the verification endpoint over the shared client"""
+    with recaptcha_seconds.time():
+        response = await get_client().post(
+            settings.RECAPTCHA_VERIFY_URL,
+            data={
+                "secret": secret_key,
+                "response": token
+            }
+        )
+    result = response.json()
+    return result.get("success", False)
+
+
 async def verify_recaptcha(token: str) -> bool:
     """Verify reCAPTCHA token with Google"""
-    
+
     if not settings.RECAPTCHA_ENABLED:
         return True  # Skip if disabled
-    
+
     if not token:
         return False
-    
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://www.google.com/recaptcha/api/siteverify",
-                data={
-                    "secret": settings.RECAPTCHA_SECRET_KEY,
-                    "response": token
-                }
-            )
-            result = response.json()
-            return result.get("success", False)
+        return await siteverify(token, settings.RECAPTCHA_SECRET_KEY)
     except Exception as e:
         logger.error(f"reCAPTCHA verification failed: {e}")
         return False
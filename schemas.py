@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation
 """
 
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from models import InquiryStatus, ServiceType
 
@@ -155,3 +155,5 @@ class HealthCheckResponse(BaseModel):
     timestamp: datetime
     version: str
     database_connected: bool = False
+    recaptcha_enabled: bool = False
+    checks: Dict[str, Dict[str, Any]] = {}
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Batch email throughput benchmark
+
+Re-sends confirmations for a backlog of inquiries against a local SMTP
+stand-in, first one at a time (send_inquiry_confirmation: one send and one
+EmailLog commit each) and then as one batch (send_inquiry_emails: one SMTP
+session and one bulk EmailLog insert), and reports throughput for each.
+
+    python scripts/bench_email_batch.py --inquiries 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from smtp_standin import SMTPStandIn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--inquiries", type=int, default=500)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every SMTP reply"
+    )
+    args = parser.parse_args()
+
+    with SMTPStandIn(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(
+            DATABASE_URL=f"sqlite:///{tmp}/bench.db",
+            SMTP_HOST=server.host,
+            SMTP_PORT=str(server.port),
+            SMTP_USE_TLS="False",
+            SMTP_USER="",
+            SMTP_PASSWORD="",
+            SEND_EMAIL_NOTIFICATIONS="True",
+        )
+        from database import Base, SessionLocal, engine
+        from email_service import EmailService
+        from models import ContactInquiry, EmailLog, ServiceType
+
+        Base.metadata.create_all(bind=engine)
+        inquiries = [
+            ContactInquiry(
+                id=i + 1,
+                first_name="Lead",
+                last_name=str(i),
+                email=f"lead{i}@example.com",
+                company_name="Example Co",
+                service_interested=ServiceType.CHATBOT_LLM,
+                message="Interested in an AI chatbot for customer service.",
+                created_at=datetime.now(),
+            )
+            for i in range(args.inquiries)
+        ]
+
+        service = EmailService()
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            for inquiry in inquiries:
+                service.send_inquiry_confirmation(inquiry, db)
+            single = time.perf_counter() - started
+        service.transport.close()
+        single_connections = server.connections
+
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            results = service.send_inquiry_emails(inquiries, db)
+            batch = time.perf_counter() - started
+            logged = db.query(EmailLog).count()
+        service.transport.close()
+
+        n = args.inquiries
+        print(f"single  {n} emails in {single:.3f}s ({n / single:,.0f} emails/s)")
+        print(f"batch   {n} emails in {batch:.3f}s ({n / batch:,.0f} emails/s)")
+        print(
+            f"batch sent {sum(results)}/{n}; "
+            f"connections single={single_connections} "
+            f"batch={server.connections - single_connections}; "
+            f"EmailLog rows={logged}; speedup {single / batch:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
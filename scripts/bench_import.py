@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Bulk lead import throughput benchmark
+
+Generates a CSV of synthetic legacy leads and loads it into a temporary
+SQLite database twice: row by row the way POST /api/contact stores them
+(validate, score, one INSERT and commit each), then through LeadImporter
+(batched validation and scoring, one multi-row INSERT and commit per batch),
+and reports throughput for each.
+
+    python scripts/bench_import.py --rows 20000 --batch-size 1000
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SIZES = ("1-9", "10-19", "20-49", "50+")
+TIMELINES = ("Immediate (ASAP)", "1-3 months", "3-6 months", "6+ months")
+BUDGETS = ("$5,000 - $10,000", "$25,000 - $50,000", "$100,000+", "")
+SERVICES = ("chatbot_llm", "data_strategy", "process_automation", "other")
+
+
+def generate_csv(rows: int) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(
+        [
+            "first_name",
+            "last_name",
+            "email",
+            "phone",
+            "company_name",
+            "company_size",
+            "service_interested",
+            "project_timeline",
+            "budget_range",
+            "message",
+        ]
+    )
+    for i in range(rows):
+        writer.writerow(
+            [
+                "Lead",
+                str(i),
+                f"lead{i}@example.com",
+                "(915) 555-0123",
+                f"Company {i % 500}" if i % 3 else "",
+                SIZES[i % len(SIZES)],
+                SERVICES[i % len(SERVICES)],
+                TIMELINES[i % len(TIMELINES)],
+                BUDGETS[i % len(BUDGETS)],
+                "Legacy lead imported from the old CRM export.",
+            ]
+        )
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--single-rows",
+        type=int,
+        default=2000,
+        help="Rows loaded one at a time for the baseline",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        from database import Base, SessionLocal, engine
+        from import_leads import LeadImporter, read_rows, ImportResult
+        from inquiry_store import InquiryStore
+        from lead_scoring import lead_scorer
+        from models import ContactInquiry
+        from schemas import ContactFormCreate
+
+        Base.metadata.create_all(bind=engine)
+        data = generate_csv(max(args.rows, args.single_rows))
+
+        # Baseline: one validated, scored, committed row at a time
+        rows = read_rows(io.StringIO(data), "csv", ImportResult())
+        single_n = args.single_rows
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            for _, (_, row) in zip(range(single_n), rows):
+                form = ContactFormCreate.model_validate(row)
+                values = form.model_dump()
+                values["lead_score"] = lead_scorer.score(form)
+                db.add(InquiryStore.build(values))
+                db.commit()
+            single = time.perf_counter() - started
+
+        with SessionLocal() as db:
+            db.query(ContactInquiry).delete()
+            db.commit()
+
+        head = "\n".join(data.splitlines()[: args.rows + 1]) + "\n"
+        importer = LeadImporter(batch_size=args.batch_size)
+        result = importer.import_file(io.StringIO(head), "csv")
+
+        with SessionLocal() as db:
+            stored = db.query(ContactInquiry).count()
+
+        batch_rate = result.rows_per_second
+        print(f"single  {single_n} rows in {single:.3f}s ({single_n / single:,.0f} rows/s)")
+        print(
+            f"batch   {result.imported} rows in {result.elapsed:.3f}s "
+            f"({batch_rate:,.0f} rows/s, batch size {args.batch_size})"
+        )
+        print(
+            f"failed {result.failed}; stored {stored}; "
+            f"speedup {batch_rate / (single_n / single):.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
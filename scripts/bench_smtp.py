@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+SMTP transport benchmark
+
+Sends the same messages through a fresh connection per message (the old
+EmailService behaviour) and through the pooled transport, against a local
+SMTP stand-in, and reports throughput for each.
+
+    python scripts/bench_smtp.py --messages 200 --latency 0.005
+"""
+
+import argparse
+import smtplib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from smtp_pool import SMTPConnectionPool
+from smtp_standin import SMTPStandIn
+
+
+def build_message(i: int) -> MIMEText:
+    msg = MIMEText(f"<p>Benchmark message {i}</p>", "html")
+    msg["Subject"] = f"Benchmark {i}"
+    msg["From"] = "Chuco AI <yo@chuco.ai>"
+    msg["To"] = "lead@example.com"
+    return msg
+
+
+def send_unpooled(server: SMTPStandIn, msg: MIMEText):
+    with smtplib.SMTP(server.host, server.port) as smtp:
+        smtp.send_message(msg)
+
+
+def run(label: str, send, messages: int, concurrency: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, (build_message(i) for i in range(messages))))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<10} {messages} messages in {elapsed:.3f}s ({messages / elapsed:,.0f} msg/s)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--latency", type=float, default=0.002, help="Seconds added to every SMTP reply"
+    )
+    args = parser.parse_args()
+
+    with SMTPStandIn(latency=args.latency) as server:
+        unpooled = run(
+            "unpooled",
+            lambda msg: send_unpooled(server, msg),
+            args.messages,
+            args.concurrency,
+        )
+        connections = server.connections
+
+        pool = SMTPConnectionPool(
+            host=server.host,
+            port=server.port,
+            user="",
+            password="",
+            use_tls=False,
+            max_size=args.concurrency,
+        )
+        pooled = run("pooled", pool.send_message, args.messages, args.concurrency)
+        pool.close()
+
+        print(
+            f"connections: unpooled={connections} "
+            f"pooled={server.connections - connections}; "
+            f"speedup {unpooled / pooled:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+"""
+HTTP load test for the request hot paths
+
+Starts the app under uvicorn against a throwaway SQLite database, with
+reCAPTCHA and SMTP pointed at local stand-ins, then drives a weighted mix of
+POST /api/contact, GET /api/inquiries and GET / from concurrent httpx
+clients. Reports throughput and p50/p90/p99 latency per route, and can save
+the result as a baseline or compare against one:
+
+    python scripts/load_test.py --duration 20 --save tests/baselines/load.json
+    python scripts/load_test.py --duration 20 --compare tests/baselines/load.json
+
+Everything runs on 127.0.0.1; nothing leaves the machine.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from recaptcha_standin import RecaptchaStandIn
+from smtp_standin import SMTPStandIn
+
+# Route -> relative share of requests
+SCENARIOS = {
+    "POST /api/contact": 2,
+    "GET /api/inquiries": 3,
+    "GET /": 5,
+}
+
+SERVICES = ("ai_audit", "chatbot_llm", "data_strategy", "process_automation")
+TIMELINES = ("immediately", "1-3 months", "3-6 months", "exploring")
+
+
+def contact_payload(rng: random.Random, i: int) -> Dict[str, str]:
+    return {
+        "first_name": "Load",
+        "last_name": f"Test{i}",
+        "email": f"load{i}@example.com",
+        "phone": "(915) 555-0123",
+        "company_name": f"Load Co {i % 50}",
+        "company_size": rng.choice(("1-10", "11-50", "51-200")),
+        "industry": rng.choice(("Logistics", "Healthcare", "Retail")),
+        "service_interested": rng.choice(SERVICES),
+        "project_timeline": rng.choice(TIMELINES),
+        "budget_range": rng.choice(("10k-25k", "25k-50k", "50k+")),
+        "message": "Looking to automate intake and reporting with AI.",
+        "recaptcha_token": "load-test-token",
+    }
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(port: int, env: Dict[str, str]) -> subprocess.Popen:
+    """Run the app under uvicorn and wait until it answers"""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=ROOT,
+        env={**os.environ, **env},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health/live").status_code == 200:
+                return process
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("App did not start within 30s")
+
+
+async def drive(base_url: str, duration: float, concurrency: int, seed: int):
+    """Run the request mix; returns per-route latencies (seconds) and error counts"""
+    latencies: Dict[str, List[float]] = {name: [] for name in SCENARIOS}
+    errors: Dict[str, int] = {name: 0 for name in SCENARIOS}
+    names = list(SCENARIOS)
+    weights = list(SCENARIOS.values())
+    deadline = time.perf_counter() + duration
+    counter = 0
+
+    async def worker(client: httpx.AsyncClient, rng: random.Random):
+        nonlocal counter
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path = name.split(" ", 1)
+            counter += 1
+            kwargs = {"json": contact_payload(rng, counter)} if method == "POST" else {}
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies[name].append(time.perf_counter() - started)
+            if not ok:
+                errors[name] += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await asyncio.gather(
+            *(worker(client, random.Random(seed + i)) for i in range(concurrency))
+        )
+    return latencies, errors
+
+
+def summarize(latencies, errors, duration: float) -> Dict[str, Dict[str, float]]:
+    results = {}
+    everything = []
+    for name, values in latencies.items():
+        values.sort()
+        everything.extend(values)
+        results[name] = _stats(values, errors[name], duration)
+    everything.sort()
+    results["all"] = _stats(everything, sum(errors.values()), duration)
+    return results
+
+
+def _stats(values: List[float], errors: int, duration: float) -> Dict[str, float]:
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / duration, 1),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p90_ms": round(percentile(values, 90) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round((values[-1] if values else 0) * 1000, 2),
+    }
+
+
+def report(results, baseline=None):
+    print(f"{'route':<22}{'reqs':>8}{'errs':>6}{'rps':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+    for name, stats in results.items():
+        print(
+            f"{name:<22}{stats['requests']:>8}{stats['errors']:>6}{stats['rps']:>9}"
+            f"{stats['p50_ms']:>9}{stats['p90_ms']:>9}{stats['p99_ms']:>9}"
+        )
+        previous = (baseline or {}).get(name)
+        if previous:
+            deltas = "  ".join(
+                f"{key} {_delta(stats[key], previous[key])}"
+                for key in ("rps", "p50_ms", "p99_ms")
+            )
+            print(f"{'  vs baseline':<22}{deltas}")
+
+
+def _delta(current: float, previous: float) -> str:
+    if not previous:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds first")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--recaptcha-latency", type=float, default=0.02, help="Seconds per siteverify reply"
+    )
+    parser.add_argument(
+        "--smtp-latency", type=float, default=0.002, help="Seconds per SMTP reply"
+    )
+    parser.add_argument("--save", type=Path, help="Write the results as a baseline")
+    parser.add_argument("--compare", type=Path, help="Baseline to compare against")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text())["results"] if args.compare else None
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            RecaptchaStandIn(latency=args.recaptcha_latency) as recaptcha, \
+            SMTPStandIn(latency=args.smtp_latency) as smtp:
+        port = free_port()
+        app = start_app(port, {
+            "DATABASE_URL": f"sqlite:///{workdir}/load.db",
+            "RECAPTCHA_VERIFY_URL": recaptcha.url,
+            "RECAPTCHA_HTTP2": "False",
+            "SMTP_HOST": smtp.host,
+            "SMTP_PORT": str(smtp.port),
+            "SMTP_USER": "",
+            "SMTP_PASSWORD": "",
+            "SMTP_USE_TLS": "False",
+            "SEND_EMAIL_NOTIFICATIONS": "True",
+            "RATE_LIMIT_ENABLED": "False",
+            "STATIC_BUILD_DIR": f"{workdir}/static",
+            "IMAGE_CACHE_DIR": f"{workdir}/images",
+            "LOG_LEVEL": "WARNING",
+        })
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            if args.warmup:
+                asyncio.run(drive(base_url, args.warmup, args.concurrency, args.seed))
+            latencies, errors = asyncio.run(
+                drive(base_url, args.duration, args.concurrency, args.seed)
+            )
+        finally:
+            app.terminate()
+            app.wait(timeout=10)
+        print(
+            f"stand-ins: {recaptcha.verifications} verifications, "
+            f"{smtp.messages} emails over {smtp.connections} SMTP connections"
+        )
+
+    results = summarize(latencies, errors, args.duration)
+    report(results, baseline)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps({
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "machine": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+            },
+            "settings": {
+                key: getattr(args, key)
+                for key in ("duration", "concurrency", "recaptcha_latency", "smtp_latency")
+            },
+            "results": results,
+        }, indent=2) + "\n")
+        print(f"Saved baseline to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
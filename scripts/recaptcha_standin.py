@@ -0,0 +1,123 @@
+"""
+Local reCAPTCHA siteverify stand-in for benchmarks
+
+A minimal asyncio HTTP/1.1 server that answers every POST with
+{"success": true} (or false for the token "invalid"), keeping connections
+alive like the real endpoint. `latency` delays each reply to mimic the
+round trip to Google. Point the app at it with
+RECAPTCHA_VERIFY_URL=http://127.0.0.1:<port>/siteverify.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Optional
+from urllib.parse import parse_qs
+
+
+class RecaptchaStandIn:
+    """In-process siteverify endpoint running on a background event loop thread"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.connections = 0
+        self.verifications = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._writers = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/siteverify"
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, payload: dict):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: keep-alive\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value.strip())
+                body = await reader.readexactly(length) if length else b""
+
+                if not request_line.startswith(b"POST"):
+                    await self._respond(writer, "405 Method Not Allowed", {"success": False})
+                    continue
+                self.verifications += 1
+                token = parse_qs(body.decode()).get("response", [""])[0]
+                await self._respond(
+                    writer,
+                    "200 OK",
+                    {"success": token != "invalid", "hostname": "localhost"},
+                )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def start(self) -> "RecaptchaStandIn":
+        """Start serving on a background thread and return self"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        """Stop the server thread"""
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "RecaptchaStandIn":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
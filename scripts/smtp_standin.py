@@ -0,0 +1,120 @@
+"""
+Local SMTP stand-in for benchmarks
+
+A minimal asyncio SMTP server (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP,
+QUIT) that accepts and discards every message while counting connections
+and deliveries. `latency` adds a delay to each reply to mimic a remote
+provider's round trip. No STARTTLS or AUTH, so point the app at it with
+SMTP_USE_TLS=False and empty SMTP_USER/SMTP_PASSWORD.
+"""
+
+import asyncio
+import threading
+from typing import Optional
+
+
+class SMTPStandIn:
+    """In-process SMTP sink running on a background event loop thread"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.connections = 0
+        self.messages = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._writers = set()
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: str):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            await self._reply(writer, "220 localhost SMTP stand-in ready")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip().upper()
+
+                if command.startswith("EHLO"):
+                    writer.write(b"250-localhost\r\n250-8BITMIME\r\n")
+                    await self._reply(writer, "250 SMTPUTF8")
+                elif command.startswith(("HELO", "MAIL", "RCPT", "RSET", "NOOP")):
+                    await self._reply(writer, "250 OK")
+                elif command == "DATA":
+                    await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        pass
+                    self.messages += 1
+                    await self._reply(writer, "250 OK: queued")
+                elif command == "QUIT":
+                    await self._reply(writer, "221 Bye")
+                    break
+                else:
+                    await self._reply(writer, "502 Command not implemented")
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def start(self) -> "SMTPStandIn":
+        """Start serving on a background thread and return self"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        """Stop the server thread"""
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            self._server.close()
+            # Closing client sockets lets each handler see EOF and return
+            for writer in list(self._writers):
+                writer.close()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+
+    def drop_connections(self):
+        """Close every client connection, as a provider does to idle sessions"""
+
+        async def drop():
+            for writer in list(self._writers):
+                writer.close()
+                await writer.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(drop(), self._loop).result(timeout=5)
+
+    def __enter__(self) -> "SMTPStandIn":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
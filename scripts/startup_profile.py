@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Startup-time profile for the app
+
+Imports the app in a fresh interpreter under `python -X importtime` and
+summarizes where the time goes: total import time, the top-level packages
+with the most self time, and the slowest modules by cumulative time.
+With --first-request it also starts the app under uvicorn (throwaway
+SQLite database and build directories) and times how long after launch
+the first request is answered and the readiness probe turns green:
+
+    python scripts/startup_profile.py
+    python scripts/startup_profile.py --top 25 --first-request --runs 5
+
+Everything runs on 127.0.0.1; nothing leaves the machine.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class ImportRecord:
+    """One line of -X importtime output (times in microseconds)"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse the `import time: self | cumulative | module` lines"""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        records.append(ImportRecord(
+            module=module,
+            self_us=int(fields[0]),
+            cumulative_us=int(fields[1]),
+            depth=(len(name) - len(module)) // 2,
+        ))
+    return records
+
+
+def profile_imports(module: str, runs: int) -> List[ImportRecord]:
+    """Import `module` in `runs` fresh interpreters; keep the fastest run"""
+    best: Optional[List[ImportRecord]] = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+        records = parse_importtime(result.stderr)
+        if best is None or total_us(records) < total_us(best):
+            best = records
+    return best
+
+
+def total_us(records: List[ImportRecord]) -> int:
+    return sum(record.cumulative_us for record in records if record.depth == 0)
+
+
+def by_package(records: List[ImportRecord]) -> List[Tuple[str, int, int]]:
+    """(top-level package, self time, module count), slowest first"""
+    totals: Dict[str, int] = defaultdict(int)
+    counts: Dict[str, int] = defaultdict(int)
+    for record in records:
+        package = record.module.split(".")[0]
+        totals[package] += record.self_us
+        counts[package] += 1
+    return sorted(
+        ((name, totals[name], counts[name]) for name in totals),
+        key=lambda row: row[1],
+        reverse=True,
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(
+    client: httpx.Client,
+    url: str,
+    process: subprocess.Popen,
+    deadline: float,
+    status: int = 200,
+) -> float:
+    """Poll `url` until it returns `status`; return the monotonic time it did"""
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited with code {process.returncode}")
+        try:
+            if client.get(url).status_code == status:
+                return time.monotonic()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise RuntimeError(f"No {status} from {url} before the deadline")
+
+
+def time_first_request(timeout: float) -> Dict[str, float]:
+    """Launch the app once; seconds until it first serves / and is ready"""
+    with tempfile.TemporaryDirectory() as workdir:
+        port = free_port()
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{workdir}/startup.db",
+            "STATIC_BUILD_DIR": f"{workdir}/static",
+            "IMAGE_CACHE_DIR": f"{workdir}/images",
+            "LOG_LEVEL": "WARNING",
+        }
+        started = time.monotonic()
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--host", "127.0.0.1", "--port", str(port),
+                "--log-level", "warning", "--no-access-log",
+            ],
+            cwd=ROOT,
+            env=env,
+        )
+        # One client for every poll, ignoring proxy settings from the environment
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            with httpx.Client(base_url=base_url, timeout=1, trust_env=False) as client:
+                deadline = started + timeout
+                live = wait_for(client, "/health/live", process, deadline)
+                page = wait_for(client, "/", process, deadline)
+                ready = wait_for(client, "/health/ready", process, deadline)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+    return {
+        "first request": live - started,
+        "first page": page - started,
+        "ready": ready - started,
+    }
+
+
+def report_imports(module: str, records: List[ImportRecord], top: int):
+    total = total_us(records)
+    print(f"import {module}: {total / 1e6:.3f}s across {len(records)} modules\n")
+
+    print(f"{'package':<32}{'self s':>9}{'share':>8}{'modules':>9}")
+    for name, self_us, count in by_package(records)[:top]:
+        print(f"{name:<32}{self_us / 1e6:>9.3f}{self_us / total:>8.1%}{count:>9}")
+
+    print(f"\n{'module (cumulative)':<48}{'cumul s':>9}{'self s':>9}")
+    slowest = sorted(records, key=lambda record: record.cumulative_us, reverse=True)
+    for record in slowest[:top]:
+        print(
+            f"{record.module:<48}{record.cumulative_us / 1e6:>9.3f}"
+            f"{record.self_us / 1e6:>9.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main", help="Module to import")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table")
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Fresh interpreters per measurement"
+    )
+    parser.add_argument(
+        "--first-request",
+        action="store_true",
+        help="Also time app launch to first response under uvicorn",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Seconds to wait for the app"
+    )
+    args = parser.parse_args()
+
+    report_imports(args.module, profile_imports(args.module, args.runs), args.top)
+
+    if args.first_request:
+        timings = [time_first_request(args.timeout) for _ in range(args.runs)]
+        print(f"\n{'uvicorn launch to':<32}{'median s':>9}{'min s':>9}{'max s':>9}")
+        for name in timings[0]:
+            values = [timing[name] for timing in timings]
+            print(
+                f"{name:<32}{statistics.median(values):>9.3f}"
+                f"{min(values):>9.3f}{max(values):>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
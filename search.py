@@ -0,0 +1,203 @@
+"""
+Full-text search over inquiry messages, company fields and email
+
+SQLite databases get an FTS5 index stored alongside contact_inquiries and
+kept in sync by triggers. PostgreSQL gets a generated tsvector column with a
+GIN index. Either way every write path (API, write-behind, bulk import,
+status updates) maintains the index without application code, and searches
+are ranked (bm25 / ts_rank_cd) with limit/offset pagination.
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import AsyncSessionLocal
+from inquiry_store import inquiry_to_dict, VALID_STATUSES
+from models import ContactInquiry, InquiryStatus
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "contact_inquiries_fts"
+SEARCH_VECTOR = "search_vector"
+
+# Searched columns and their rank weights (higher counts more)
+SEARCH_FIELDS = (
+    ("company_name", 4.0, "A"),
+    ("email", 4.0, "A"),
+    ("industry", 2.0, "B"),
+    ("message", 1.0, "C"),
+)
+
+_FIELD_NAMES = ", ".join(name for name, _, _ in SEARCH_FIELDS)
+
+
+def _sqlite_ddl() -> List[str]:
+    new_values = ", ".join(f"new.{name}" for name, _, _ in SEARCH_FIELDS)
+    old_values = ", ".join(f"old.{name}" for name, _, _ in SEARCH_FIELDS)
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FIELD_NAMES}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f"INSERT INTO {FTS_TABLE}(rowid, {_FIELD_NAMES}) "
+        f"VALUES (new.id, {new_values});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{_FIELD_NAMES}, content='contact_inquiries', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON "
+        f"contact_inquiries BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON "
+        f"contact_inquiries BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF "
+        f"{_FIELD_NAMES} ON contact_inquiries BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _postgres_ddl() -> List[str]:
+    # Email is split on punctuation so its parts are searchable words
+    vectors = " || ".join(
+        "setweight(to_tsvector('simple', coalesce("
+        + (
+            f"regexp_replace({name}, '\\W+', ' ', 'g')"
+            if name == "email"
+            else name
+        )
+        + f", '')), '{label}')"
+        for name, _, label in SEARCH_FIELDS
+    )
+    return [
+        f"ALTER TABLE contact_inquiries ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR} "
+        f"tsvector GENERATED ALWAYS AS ({vectors}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_contact_inquiries_{SEARCH_VECTOR} "
+        f"ON contact_inquiries USING GIN ({SEARCH_VECTOR})",
+    ]
+
+
+def search_terms(q: str) -> List[str]:
+    """Split a query into words; punctuation (e.g. in emails) separates them"""
+    return re.findall(r"\w+", q.lower())
+
+
+def install_search_index(engine: Engine):
+    """Create the full-text index for the engine's dialect (idempotent)"""
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+                {"name": FTS_TABLE},
+            ).first()
+            for statement in _sqlite_ddl():
+                conn.execute(text(statement))
+            if not exists:
+                # Index inquiries stored before the index existed
+                conn.execute(
+                    text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+                )
+        elif dialect == "postgresql":
+            for statement in _postgres_ddl():
+                conn.execute(text(statement))
+        else:
+            logger.warning(f"Full-text search is not supported on {dialect}")
+
+
+class InquirySearch:
+    """
+    Ranked keyword search over inquiries
+
+    Ranking scores every candidate, so on very common words it is bounded to
+    the newest `rank_window` matches (plus the requested page); the total
+    still counts every match. Selective queries rank all of their matches.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        rank_window: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.rank_window = rank_window or settings.SEARCH_RANK_WINDOW
+
+    @staticmethod
+    def _sqlite_query(terms: List[str], status: Optional[str]):
+        fts = table(FTS_TABLE, column("rowid"))
+        # Whole words, except the last which may still be being typed
+        expression = " ".join(f'"{term}"' for term in terms) + "*"
+        matches = select(fts.c.rowid).where(
+            literal_column(FTS_TABLE).op("MATCH")(expression)
+        )
+        if status:
+            matches = matches.join(
+                ContactInquiry, ContactInquiry.id == fts.c.rowid
+            ).where(ContactInquiry.status == InquiryStatus(status))
+        rank = func.bm25(
+            literal_column(FTS_TABLE), *(weight for _, weight, _ in SEARCH_FIELDS)
+        )
+        return matches, fts.c.rowid, rank.asc()
+
+    @staticmethod
+    def _postgres_query(terms: List[str], status: Optional[str]):
+        vector = literal_column(f"contact_inquiries.{SEARCH_VECTOR}")
+        query = func.to_tsquery("simple", " & ".join(terms) + ":*")
+        matches = select(ContactInquiry.id).where(vector.op("@@")(query))
+        if status:
+            matches = matches.where(ContactInquiry.status == InquiryStatus(status))
+        return matches, ContactInquiry.id, func.ts_rank_cd(vector, query).desc()
+
+    async def search(
+        self,
+        q: str,
+        status: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return (total matches, page) for a keyword query, best match first"""
+        terms = search_terms(q)
+        if not terms or (status and status not in VALID_STATUSES):
+            return 0, []
+
+        async with self.session_factory() as db:
+            if db.bind.dialect.name == "sqlite":
+                matches, match_id, rank = self._sqlite_query(terms, status)
+            else:
+                matches, match_id, rank = self._postgres_query(terms, status)
+
+            total = await db.scalar(
+                select(func.count()).select_from(matches.subquery())
+            ) or 0
+            if total <= offset:
+                return total, []
+
+            window = max(self.rank_window, offset + limit)
+            if total > window:
+                # Lowest id among the newest `window` matches
+                cutoff = await db.scalar(
+                    matches.order_by(match_id.desc()).offset(window - 1).limit(1)
+                )
+                matches = matches.where(match_id >= cutoff)
+
+            # Rank on the index alone, then load just the page's rows
+            ids = list(
+                await db.scalars(
+                    matches.order_by(rank, match_id.desc()).offset(offset).limit(limit)
+                )
+            )
+            rows = {
+                inquiry.id: inquiry
+                for inquiry in await db.scalars(
+                    select(ContactInquiry).where(ContactInquiry.id.in_(ids))
+                )
+            }
+            return total, [inquiry_to_dict(rows[i]) for i in ids if i in rows]
+
+
+# Create global inquiry search instance
+inquiry_search = InquirySearch()
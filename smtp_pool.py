@@ -0,0 +1,196 @@
+"""
+Pooled SMTP transport for the email service
+"""
+
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from email.message import Message
+from typing import Deque, Iterator, Optional, Tuple
+
+from config import settings
+from metrics import smtp_send_seconds
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the connection itself is gone and a fresh one may succeed
+DISCONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError)
+
+
+class PoolExhausted(TimeoutError):
+    """No pooled connection became free within the allowed wait"""
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of authenticated SMTP connections
+
+    Connections are opened (connect, STARTTLS, login) on demand, returned to
+    the pool after each message and reused, so the handshake is paid once per
+    connection instead of once per email. At most `max_size` connections are
+    open at a time. Idle connections are health-checked with NOOP before reuse
+    and dropped after `idle_timeout`; a send that hits a dropped connection is
+    retried once on a fresh one.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: Optional[bool] = None,
+        max_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        noop_after: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.host = host or settings.SMTP_HOST
+        self.port = port or settings.SMTP_PORT
+        self.user = settings.SMTP_USER if user is None else user
+        self.password = settings.SMTP_PASSWORD if password is None else password
+        self.use_tls = settings.SMTP_USE_TLS if use_tls is None else use_tls
+        self.max_size = max_size or settings.SMTP_POOL_SIZE
+        self.idle_timeout = idle_timeout or settings.SMTP_POOL_IDLE_TIMEOUT
+        self.noop_after = (
+            settings.SMTP_POOL_NOOP_AFTER_SECONDS if noop_after is None else noop_after
+        )
+        self.timeout = timeout or settings.SMTP_TIMEOUT
+        self._idle: Deque[Tuple[smtplib.SMTP, float]] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+
+    def _connect(self, timeout: Optional[float] = None) -> smtplib.SMTP:
+        """Open and authenticate a new connection"""
+        server = smtplib.SMTP(self.host, self.port, timeout=timeout or self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        """Close a connection, ignoring errors from an already dead socket"""
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _set_timeout(server: smtplib.SMTP, timeout: float):
+        """Change the socket timeout of an open connection"""
+        server.timeout = timeout
+        if server.sock is not None:
+            server.sock.settimeout(timeout)
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _checkout(
+        self, wait: Optional[float] = None, timeout: Optional[float] = None
+    ) -> Tuple[smtplib.SMTP, bool]:
+        """
+        Take a healthy connection, returning (connection, was_reused)
+
+        Waits up to `wait` seconds for a free slot (forever if None) and
+        raises PoolExhausted if none frees up. `timeout` overrides the socket
+        timeout for connecting and for commands on the returned connection.
+        """
+        if not self._slots.acquire(timeout=wait):
+            raise PoolExhausted(
+                f"All {self.max_size} SMTP connections busy for {wait}s"
+            )
+        try:
+            while True:
+                with self._lock:
+                    item = self._idle.pop() if self._idle else None
+                if item is None:
+                    return self._connect(timeout), False
+
+                server, last_used = item
+                if timeout is not None:
+                    self._set_timeout(server, timeout)
+                idle = time.monotonic() - last_used
+                if idle > self.idle_timeout or (
+                    idle > self.noop_after and not self._is_alive(server)
+                ):
+                    self._close(server)
+                    continue
+                return server, True
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _checkin(self, server: smtplib.SMTP):
+        if server.timeout != self.timeout:
+            self._set_timeout(server, self.timeout)
+        with self._lock:
+            self._idle.append((server, time.monotonic()))
+        self._slots.release()
+
+    def _discard(self, server: smtplib.SMTP):
+        self._close(server)
+        self._slots.release()
+
+    @contextmanager
+    def connection(
+        self, wait: Optional[float] = None, timeout: Optional[float] = None
+    ) -> Iterator[smtplib.SMTP]:
+        """
+        Borrow a connection; it is discarded if the block raises
+
+        `wait` bounds the wait for a free slot and `timeout` each socket
+        operation while connecting and while borrowed (SMTP_TIMEOUT if None).
+        """
+        server, _ = self._checkout(wait, timeout)
+        try:
+            yield server
+        except Exception:
+            self._discard(server)
+            raise
+        else:
+            self._checkin(server)
+
+    def send_message(self, msg: Message):
+        """Send one message, reconnecting transparently if the server dropped us"""
+        server, reused = self._checkout()
+        try:
+            with smtp_send_seconds.time():
+                server.send_message(msg)
+        except DISCONNECT_ERRORS:
+            self._discard(server)
+            if not reused:
+                raise
+            logger.info("Pooled SMTP connection dropped, reconnecting")
+            with self.connection() as server, smtp_send_seconds.time():
+                server.send_message(msg)
+        except Exception:
+            self._discard(server)
+            raise
+        else:
+            self._checkin(server)
+
+    def close(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for server, _ in idle:
+            self._close(server)
+
+    def __len__(self) -> int:
+        return len(self._idle)
@@ -0,0 +1,102 @@
+"""
+Shared fixtures for the test and benchmark suites
+
+Settings are pinned before any app module is imported so tests never touch
+a real database, SMTP server or reCAPTCHA; tests that need a database get a
+throwaway SQLite file from the `db` fixture, and tests that need SMTP or
+reCAPTCHA get the local stand-ins from scripts/.
+"""
+
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SEND_EMAIL_NOTIFICATIONS", "False")
+os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+# Add the project root and the stand-ins in scripts/ to the Python path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from database import Base, async_database_url
+from models import ContactInquiry, InquiryStatus, ServiceType
+from recaptcha_standin import RecaptchaStandIn
+from smtp_standin import SMTPStandIn
+
+
+@pytest.fixture
+def db(tmp_path):
+    """(sync, async) session factories on a fresh SQLite file with every table"""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    # NullPool: each test drives its own event loops
+    async_engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    yield (
+        sessionmaker(bind=engine, autoflush=False),
+        async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False),
+    )
+    engine.dispose()
+
+
+@pytest.fixture
+def smtp_standin():
+    """A local SMTP sink counting connections and messages"""
+    with SMTPStandIn() as server:
+        yield server
+
+
+@pytest.fixture
+def recaptcha_standin():
+    """A local siteverify endpoint; the token "invalid" fails"""
+    with RecaptchaStandIn() as server:
+        yield server
+
+
+@pytest.fixture
+def contact_payload():
+    """A complete, valid contact form submission"""
+    return {
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "john.doe@company.com",
+        "phone": "(915) 555-0123",
+        "company_name": "Acme Logistics",
+        "company_website": "https://acme.example.com",
+        "company_size": "51-200",
+        "industry": "Logistics",
+        "annual_revenue": "10m-50m",
+        "service_interested": "process_automation",
+        "message": "We want to automate intake, routing and weekly reporting.",
+        "project_timeline": "1-3 months",
+        "budget_range": "50k+",
+        "preferred_contact_method": "email",
+        "lead_source": "website",
+        "utm_source": "google",
+        "utm_medium": "cpc",
+        "utm_campaign": "automation",
+    }
+
+
+@pytest.fixture
+def inquiry(contact_payload):
+    """A stored-looking ContactInquiry built from the payload"""
+    values = dict(contact_payload, service_interested=ServiceType.PROCESS_AUTOMATION)
+    return ContactInquiry(
+        id=1,
+        status=InquiryStatus.NEW,
+        lead_score=85.0,
+        created_at=datetime(2025, 1, 15, 9, 30),
+        **values,
+    )
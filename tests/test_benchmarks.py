@@ -0,0 +1,68 @@
+"""
+Micro-benchmarks for the contact form hot path
+
+Requires pytest-benchmark (requirements-dev.txt). Save a baseline and
+compare later runs against it with:
+
+    pytest tests/test_benchmarks.py --benchmark-storage=tests/baselines --benchmark-save=baseline
+    pytest tests/test_benchmarks.py --benchmark-storage=tests/baselines --benchmark-compare
+
+The end-to-end HTTP load test lives in scripts/load_test.py.
+"""
+
+import itertools
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from email_service import email_service
+from email_templates import email_templates
+from main import ContactForm, calculate_lead_score
+from rate_limit import MemoryBackend, RateLimiter
+from schemas import ContactFormCreate
+
+
+def test_calculate_lead_score(benchmark, contact_payload):
+    form = ContactForm(**contact_payload)
+    score = benchmark(calculate_lead_score, form)
+    assert score > 0
+
+
+def test_rate_limiter_is_allowed(benchmark):
+    limiter = RateLimiter(MemoryBackend(), max_requests=10**9, enabled=True)
+    ips = itertools.cycle([f"10.0.{i // 256}.{i % 256}" for i in range(1000)])
+    assert benchmark(lambda: limiter.is_allowed(next(ips)))
+
+
+def test_rate_limiter_rejects(benchmark):
+    limiter = RateLimiter(MemoryBackend(), max_requests=1, enabled=True)
+    limiter.is_allowed("203.0.113.7")
+    assert benchmark(limiter.is_allowed, "203.0.113.7") is False
+
+
+def test_validate_contact_form(benchmark, contact_payload):
+    form = benchmark(ContactForm.model_validate, contact_payload)
+    assert form.email == contact_payload["email"]
+
+
+def test_validate_contact_form_create(benchmark, contact_payload):
+    form = benchmark(ContactFormCreate.model_validate, contact_payload)
+    assert form.service_interested.value == "process_automation"
+
+
+def test_render_inquiry_notification(benchmark, inquiry):
+    email = benchmark(email_service.build_inquiry_notification, inquiry)
+    assert inquiry.company_name in email.body_html
+
+
+def test_render_inquiry_confirmation(benchmark, inquiry):
+    html = benchmark(
+        email_templates.render,
+        "inquiry_confirmation",
+        first_name=inquiry.first_name,
+        company_name=inquiry.company_name,
+        service_interested=inquiry.service_interested.value,
+        service_name="Process Automation",
+    )
+    assert inquiry.first_name in html
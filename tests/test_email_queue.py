@@ -0,0 +1,213 @@
+"""
+Email queue delivery, retry and backoff against the SMTP stand-in
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from email_queue import EmailQueue
+from email_service import EmailService
+from models import EmailJob, EmailJobStatus, EmailLog
+from smtp_pool import SMTPConnectionPool
+
+
+def smtp_transport(server) -> SMTPConnectionPool:
+    return SMTPConnectionPool(
+        server.host, server.port, user="", password="", use_tls=False, timeout=2.0
+    )
+
+
+@pytest.fixture
+def service(smtp_standin):
+    service = EmailService()
+    service.enabled = True
+    service.transport = smtp_transport(smtp_standin)
+    yield service
+    service.transport.close()
+
+
+@pytest.fixture
+def queue(db, service):
+    SessionLocal, AsyncSessionLocal = db
+    queue = EmailQueue(
+        service, session_factory=SessionLocal, async_session_factory=AsyncSessionLocal
+    )
+    queue.max_attempts = 3
+    queue.retry_base_seconds = 30
+    return queue
+
+
+@pytest.fixture
+def add_job(db, inquiry):
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        session.add(inquiry)
+        session.commit()
+
+    def add_job(email_type: str = "inquiry_notification", inquiry_id: int = 1) -> int:
+        with SessionLocal() as session:
+            job = EmailJob(
+                email_type=email_type,
+                inquiry_id=inquiry_id,
+                status=EmailJobStatus.PENDING,
+                attempts=0,
+                next_attempt_at=datetime.now(),
+            )
+            session.add(job)
+            session.commit()
+            return job.id
+
+    return add_job
+
+
+def get_job(db, job_id: int) -> EmailJob:
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        return session.get(EmailJob, job_id)
+
+
+def make_due(db, job_id: int):
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        session.execute(
+            update(EmailJob)
+            .where(EmailJob.id == job_id)
+            .values(next_attempt_at=datetime.now() - timedelta(seconds=1))
+        )
+        session.commit()
+
+
+def test_delivers_a_due_job(db, queue, add_job, smtp_standin):
+    job_id = add_job()
+    assert queue.claim() == job_id
+    assert get_job(db, job_id).status == EmailJobStatus.SENDING
+    assert queue.claim() is None
+
+    assert queue.deliver(job_id) is True
+    job = get_job(db, job_id)
+    assert job.status == EmailJobStatus.SENT
+    assert job.attempts == 1
+    assert job.completed_at is not None
+    assert smtp_standin.messages == 1
+
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        assert session.scalar(select(EmailLog.sent_successfully)) is True
+
+
+def test_failed_delivery_backs_off_exponentially(db, queue, add_job, smtp_standin):
+    job_id = add_job()
+    smtp_standin.stop()
+
+    delays = []
+    for attempt in range(1, queue.max_attempts):
+        assert queue.claim() == job_id
+        before = datetime.now()
+        assert queue.deliver(job_id) is False
+
+        job = get_job(db, job_id)
+        assert job.status == EmailJobStatus.PENDING
+        assert job.attempts == attempt
+        assert job.last_error
+        delays.append(round((job.next_attempt_at - before).total_seconds()))
+
+        # Not due again until the backoff has passed
+        assert queue.claim() is None
+        make_due(db, job_id)
+
+    assert delays == [30, 60]
+
+
+def test_gives_up_after_max_attempts(db, queue, add_job, smtp_standin):
+    job_id = add_job()
+    smtp_standin.stop()
+    for _ in range(queue.max_attempts):
+        make_due(db, job_id)
+        assert queue.claim() == job_id
+        queue.deliver(job_id)
+
+    job = get_job(db, job_id)
+    assert job.status == EmailJobStatus.FAILED
+    assert job.attempts == queue.max_attempts
+    assert job.completed_at is not None
+    make_due(db, job_id)
+    assert queue.claim() is None
+
+
+def test_retry_succeeds_once_smtp_recovers(db, queue, add_job, service):
+    job_id = add_job()
+    live = service.transport
+    service.transport = SMTPConnectionPool(
+        "127.0.0.1", 1, user="", password="", use_tls=False, timeout=2.0
+    )
+    assert queue.claim() == job_id
+    assert queue.deliver(job_id) is False
+
+    service.transport = live
+    make_due(db, job_id)
+    assert queue.claim() == job_id
+    assert queue.deliver(job_id) is True
+    job = get_job(db, job_id)
+    assert job.status == EmailJobStatus.SENT
+    assert job.attempts == 2
+    assert job.last_error is None
+
+
+def test_missing_inquiry_is_a_failed_attempt(db, queue, add_job):
+    job_id = add_job(inquiry_id=999)
+    assert queue.claim() == job_id
+    assert queue.deliver(job_id) is False
+    assert "999" in get_job(db, job_id).last_error
+
+
+def test_depth_counts_pending_and_sending_jobs(db, queue, add_job):
+    sent, failed, sending, _ = add_job(), add_job(), add_job(), add_job()
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        for job_id, status in ((sent, EmailJobStatus.SENT), (failed, EmailJobStatus.FAILED)):
+            session.execute(update(EmailJob).where(EmailJob.id == job_id).values(status=status))
+        session.commit()
+    assert queue.claim() == sending
+    assert asyncio.run(queue.depth()) == 2
+
+
+def test_recover_requeues_stalled_jobs(db, queue, add_job):
+    stalled, fresh = add_job(), add_job("inquiry_confirmation")
+    assert queue.claim() == stalled
+    assert queue.claim() == fresh
+
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        session.execute(
+            update(EmailJob)
+            .where(EmailJob.id == stalled)
+            .values(locked_at=datetime.now() - queue.lock_timeout - timedelta(seconds=1))
+        )
+        session.commit()
+
+    queue.recover()
+    assert get_job(db, stalled).status == EmailJobStatus.PENDING
+    assert get_job(db, fresh).status == EmailJobStatus.SENDING
+
+
+def test_workers_drain_the_queue(db, queue, add_job, smtp_standin):
+    job_ids = [add_job(), add_job("inquiry_confirmation")]
+    queue.poll_seconds = 0.05
+
+    async def run():
+        await queue.start()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            statuses = {get_job(db, job_id).status for job_id in job_ids}
+            if statuses == {EmailJobStatus.SENT}:
+                break
+            await asyncio.sleep(0.02)
+        await queue.stop()
+
+    asyncio.run(run())
+    assert {get_job(db, job_id).status for job_id in job_ids} == {EmailJobStatus.SENT}
+    assert smtp_standin.messages == 2
@@ -0,0 +1,64 @@
+"""
+Streaming CSV/NDJSON exports
+"""
+
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+import export
+from inquiry_store import InquiryStore
+from models import EmailLog
+
+
+@pytest.fixture
+def session_factory(db, monkeypatch):
+    _, AsyncSessionLocal = db
+    monkeypatch.setattr(export, "AsyncSessionLocal", AsyncSessionLocal)
+    return AsyncSessionLocal
+
+
+def collect(stream) -> str:
+    async def run():
+        return b"".join([chunk async for chunk in stream]).decode()
+
+    return asyncio.run(run())
+
+
+def test_empty_csv_export_has_a_header(session_factory):
+    body = collect(export.stream_inquiries("csv"))
+    assert body.splitlines() == [",".join(export.INQUIRY_EXPORT_FIELDS)]
+
+    body = collect(export.stream_email_logs("csv"))
+    assert body.splitlines() == [",".join(export.EMAIL_LOG_EXPORT_FIELDS)]
+
+
+def test_empty_ndjson_export_is_empty(session_factory):
+    assert collect(export.stream_inquiries("ndjson")) == ""
+
+
+def test_csv_export_has_one_header_and_every_row(
+    session_factory, contact_payload, monkeypatch
+):
+    monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 2)
+    rows = asyncio.run(
+        InquiryStore(session_factory).create_many([contact_payload] * 5)
+    )
+    records = list(csv.DictReader(io.StringIO(collect(export.stream_inquiries("csv")))))
+    assert [int(record["id"]) for record in records] == [row["id"] for row in rows]
+    assert records[0]["email"] == contact_payload["email"]
+
+
+def test_export_fields_match_the_serializers(session_factory, contact_payload, db):
+    row = asyncio.run(InquiryStore(session_factory).create(contact_payload))
+    assert list(row) == export.INQUIRY_EXPORT_FIELDS
+
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        session.add(EmailLog(recipient_email="a@b.com", subject="Hi", body="", email_type="x"))
+        session.commit()
+    (line,) = collect(export.stream_email_logs("ndjson")).splitlines()
+    assert list(json.loads(line)) == export.EMAIL_LOG_EXPORT_FIELDS
@@ -0,0 +1,106 @@
+"""
+Dependency checks behind the health probes
+"""
+
+import asyncio
+import smtplib
+import time
+from datetime import datetime
+
+import pytest
+
+from email_queue import EmailQueue
+from email_service import EmailService
+from health import DEGRADED, DISABLED, ERROR, OK, HealthMonitor
+from models import EmailJob, EmailJobStatus
+from smtp_pool import SMTPConnectionPool
+from smtp_standin import SMTPStandIn
+
+
+def monitor_for(db, server=None, timeout: float = 1.0, **options) -> HealthMonitor:
+    SessionLocal, AsyncSessionLocal = db
+    service = EmailService()
+    service.enabled = server is not None
+    if server is not None:
+        service.transport = SMTPConnectionPool(
+            server.host, server.port, user="", password="", use_tls=False, max_size=1
+        )
+    queue = EmailQueue(
+        service, session_factory=SessionLocal, async_session_factory=AsyncSessionLocal
+    )
+    return HealthMonitor(
+        queue, service, session_factory=AsyncSessionLocal, timeout=timeout, **options
+    )
+
+
+def test_all_dependencies_healthy(db, smtp_standin):
+    monitor = monitor_for(db, smtp_standin)
+    report = asyncio.run(monitor.refresh())
+    assert {name: check["status"] for name, check in report.checks.items()} == {
+        "database": OK,
+        "smtp": OK,
+        "email_queue": OK,
+    }
+    assert report.status == "healthy"
+    assert report.checks["email_queue"]["depth"] == 0
+
+
+def test_smtp_disabled(db):
+    report = asyncio.run(monitor_for(db).refresh())
+    assert report.checks["smtp"]["status"] == DISABLED
+    assert report.status == "healthy"
+
+
+def test_backed_up_queue_is_degraded(db):
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        session.add_all(
+            EmailJob(
+                email_type="inquiry_notification",
+                inquiry_id=1,
+                status=EmailJobStatus.PENDING,
+                next_attempt_at=datetime.now(),
+            )
+            for _ in range(3)
+        )
+        session.commit()
+    report = asyncio.run(monitor_for(db, max_queue_depth=2).refresh())
+    assert report.checks["email_queue"] == {
+        "status": DEGRADED,
+        "depth": 3,
+        "latency_ms": report.checks["email_queue"]["latency_ms"],
+    }
+    assert report.status == DEGRADED
+
+
+def test_smtp_check_is_bounded_by_the_check_timeout(db):
+    # The stand-in answers slower than the check allows but well inside SMTP_TIMEOUT
+    with SMTPStandIn(latency=1.5) as server:
+        monitor = monitor_for(db, server, timeout=0.4)
+        started = time.monotonic()
+        with pytest.raises((TimeoutError, smtplib.SMTPServerDisconnected)):
+            monitor._smtp_noop()
+        assert time.monotonic() - started < 0.5
+
+
+def test_smtp_check_restores_the_pool_timeout(db, smtp_standin):
+    monitor = monitor_for(db, smtp_standin, timeout=0.4)
+    assert monitor._smtp_noop() == {"status": OK}
+    pool = monitor.service.transport
+    assert len(pool) == 1
+    server, _ = pool._idle[0]
+    assert server.timeout == pool.timeout == server.sock.gettimeout()
+
+
+def test_smtp_check_on_a_busy_pool_is_degraded(db, smtp_standin):
+    monitor = monitor_for(db, smtp_standin, timeout=0.2)
+    with monitor.service.transport.connection():
+        assert monitor._smtp_noop()["status"] == DEGRADED
+
+
+def test_unreachable_smtp_is_an_error(db):
+    server = SMTPStandIn().start()
+    server.stop()
+    report = asyncio.run(monitor_for(db, server).refresh())
+    assert report.checks["smtp"]["status"] == ERROR
+    assert report.status == DEGRADED
@@ -0,0 +1,98 @@
+"""
+Bulk lead import: validation, error reporting and status handling
+"""
+
+import csv
+import io
+
+from sqlalchemy import select
+
+import import_leads
+from import_leads import LeadImporter
+from models import ContactInquiry, InquiryStatus
+
+COLUMNS = [
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "company_name",
+    "service_interested",
+    "message",
+    "project_timeline",
+    "status",
+    "created_at",
+]
+
+
+def to_csv(rows) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+def lead(contact_payload, **values):
+    return {**contact_payload, **values}
+
+
+def stored(db):
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        return session.execute(
+            select(ContactInquiry.email, ContactInquiry.status).order_by(ContactInquiry.id)
+        ).all()
+
+
+def test_imports_valid_rows_and_keeps_their_status(db, contact_payload):
+    rows = [
+        lead(contact_payload, email="a@example.com", status="qualified"),
+        lead(contact_payload, email="b@example.com", status="CONVERTED"),
+        lead(contact_payload, email="c@example.com", status=""),
+    ]
+    result = LeadImporter(session_factory=db[0]).import_file(to_csv(rows))
+    assert (result.imported, result.failed) == (3, 0)
+    assert stored(db) == [
+        ("a@example.com", InquiryStatus.QUALIFIED),
+        ("b@example.com", InquiryStatus.CONVERTED),
+        ("c@example.com", InquiryStatus.NEW),
+    ]
+
+
+def test_unknown_status_is_a_row_error(db, contact_payload):
+    rows = [
+        lead(contact_payload, email="a@example.com", status="archived"),
+        lead(contact_payload, email="b@example.com"),
+    ]
+    result = LeadImporter(session_factory=db[0]).import_file(to_csv(rows))
+    assert (result.imported, result.failed) == (1, 1)
+    assert result.errors[0]["line"] == 2
+    assert result.errors[0]["error"].startswith("status:")
+    assert stored(db) == [("b@example.com", InquiryStatus.NEW)]
+
+
+def test_errors_are_reported_in_line_order(db, contact_payload):
+    # Different failure stages within one batch, listed out of stage order
+    rows = [
+        lead(contact_payload, email="not-an-email"),
+        lead(contact_payload, created_at="yesterday"),
+        lead(contact_payload),
+        lead(contact_payload, status="archived"),
+        lead(contact_payload, email="also-bad"),
+    ]
+    result = LeadImporter(batch_size=10, session_factory=db[0]).import_file(to_csv(rows))
+    assert result.failed == 4
+    assert [error["line"] for error in result.errors] == [2, 3, 5, 6]
+
+
+def test_reported_errors_keep_the_lowest_lines(db, contact_payload, monkeypatch):
+    monkeypatch.setattr(import_leads, "MAX_REPORTED_ERRORS", 3)
+    rows = [lead(contact_payload, status="archived")] * 2 + [
+        lead(contact_payload, email="bad")
+    ] * 3
+    rows = rows[2:] + rows[:2]  # Validation errors first, status errors last
+    result = LeadImporter(batch_size=10, session_factory=db[0]).import_file(to_csv(rows))
+    assert result.failed == 5
+    assert [error["line"] for error in result.errors] == [2, 3, 4]
@@ -0,0 +1,143 @@
+"""
+Incremental inquiry statistics stay exact while a rebuild is in flight
+"""
+
+import asyncio
+
+from inquiry_stats import InquiryStats
+from inquiry_store import InquiryStore
+
+
+def submission(i: int) -> dict:
+    return {
+        "first_name": "Race",
+        "last_name": f"Test{i}",
+        "email": f"race{i}@example.com",
+        "service_interested": "ai_audit",
+        "message": "Submitted while the stats were rebuilding",
+        "lead_score": 60,
+    }
+
+
+class RacingStore(InquiryStore):
+    """Runs callbacks right before and right after the aggregate query"""
+
+    def __init__(self, session_factory):
+        super().__init__(session_factory)
+        self.before = []
+        self.after = []
+
+    async def aggregates(self):
+        for callback in self.before:
+            await callback()
+        result = await super().aggregates()
+        for callback in self.after:
+            await callback()
+        return result
+
+
+def check_consistent(stats: dict, expected_total: int):
+    assert stats["total_inquiries"] == expected_total
+    assert stats["today_inquiries"] == expected_total
+    assert sum(stats["by_status"].values()) == expected_total
+
+
+def test_submissions_during_rebuild_are_counted_once(db):
+    _, async_factory = db
+    store = RacingStore(async_factory)
+    stats = InquiryStats(store, resync_seconds=0)
+    counter = iter(range(100))
+
+    async def submit():
+        stats.record_created(await store.create(submission(next(counter))))
+
+    async def run():
+        await submit()
+        await stats.rebuild()
+        # One row the query sees, one it misses, both recorded mid-rebuild
+        store.before.append(submit)
+        store.after.append(submit)
+        assert await stats.rebuild()
+        store.before.clear()
+        store.after.clear()
+        return await stats.snapshot()
+
+    check_consistent(asyncio.run(run()), 3)
+
+
+def test_record_after_rebuild_that_already_counted_it(db):
+    _, async_factory = db
+    store = InquiryStore(async_factory)
+    stats = InquiryStats(store, resync_seconds=0)
+
+    async def run():
+        inquiry = await store.create(submission(1))
+        # The rebuild sees the row before the request records it
+        await stats.rebuild()
+        stats.record_created(inquiry)
+        return await stats.snapshot()
+
+    check_consistent(asyncio.run(run()), 1)
+
+
+def test_concurrent_submissions_and_rebuilds(db):
+    _, async_factory = db
+    store = InquiryStore(async_factory)
+    stats = InquiryStats(store, resync_seconds=0)
+
+    async def submit(i):
+        stats.record_created(await store.create(submission(i)))
+
+    async def run():
+        await asyncio.gather(
+            *(submit(i) for i in range(20)),
+            *(stats.rebuild() for _ in range(5)),
+        )
+        return await stats.snapshot()
+
+    check_consistent(asyncio.run(run()), 20)
+
+
+def test_status_change_during_rebuild_retries(db):
+    _, async_factory = db
+    store = RacingStore(async_factory)
+    stats = InquiryStats(store, resync_seconds=0)
+
+    async def run():
+        inquiry = await store.create(submission(1))
+        await stats.rebuild()
+
+        async def change_status():
+            store.after.clear()  # Only the first attempt races with it
+            with stats.status_change():
+                previous, _ = await store.update_status(inquiry["id"], "contacted")
+                stats.record_status_change(previous, "contacted")
+
+        store.after.append(change_status)
+        assert await stats.rebuild()
+        return await stats.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["by_status"] == {"contacted": 1}
+    check_consistent(snapshot, 1)
+
+
+def test_rebuild_gives_up_and_keeps_live_counters(db):
+    _, async_factory = db
+    store = RacingStore(async_factory)
+    stats = InquiryStats(store, resync_seconds=0)
+
+    async def run():
+        stats.record_created(await store.create(submission(1)))
+
+        async def overlapping_change():
+            with stats.status_change():
+                pass
+
+        store.after.append(overlapping_change)
+        assert await stats.rebuild(attempts=2) is False
+        return stats.total, stats._synced_at
+
+    total, synced_at = asyncio.run(run())
+    assert total == 1
+    assert synced_at is None
@@ -0,0 +1,167 @@
+"""
+Sliding-window rate limiter behavior
+"""
+
+import threading
+
+import pytest
+
+import rate_limit
+from rate_limit import MemoryBackend, RateLimiter, SQLiteBackend
+
+WINDOW = 60
+START = 1_700_000_040.0  # Start of a 60 second window
+
+
+class Clock:
+    """Stands in for time.time() so tests can place requests in a window"""
+
+    def __init__(self, now: float = START):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteBackend(str(tmp_path / "rate_limit.db"))
+    return MemoryBackend(max_keys=100)
+
+
+def allowed(limiter: RateLimiter, count: int, ip: str = "203.0.113.7") -> int:
+    return sum(limiter.is_allowed(ip) for _ in range(count))
+
+
+def test_allows_up_to_the_limit_within_a_window(clock, backend):
+    limiter = RateLimiter(backend, max_requests=3, window_seconds=WINDOW, enabled=True)
+    assert allowed(limiter, 10) == 3
+    clock.now += WINDOW - 1
+    assert allowed(limiter, 1) == 0
+
+
+def test_previous_window_is_weighted_by_its_overlap(clock, backend):
+    limiter = RateLimiter(backend, max_requests=3, window_seconds=WINDOW, enabled=True)
+    assert allowed(limiter, 3) == 3
+
+    # 15s into the next window, 3/4 of the last window still overlaps: 2.25 + 1 > 3
+    clock.now = START + WINDOW + 15
+    assert allowed(limiter, 1) == 0
+
+    # 55s in, only 1/12 overlaps: 0.25 + 2 + 1 <= 3 but 0.25 + 3 > 3
+    clock.now = START + WINDOW + 55
+    assert allowed(limiter, 5) == 2
+
+
+def test_window_edge(clock, backend):
+    limiter = RateLimiter(backend, max_requests=3, window_seconds=WINDOW, enabled=True)
+    clock.now = START + WINDOW - 0.001
+    assert allowed(limiter, 3) == 3
+
+    # The previous window counts in full just after the boundary
+    clock.now = START + WINDOW
+    assert allowed(limiter, 1) == 0
+
+
+def test_counts_expire_after_two_windows(clock, backend):
+    limiter = RateLimiter(backend, max_requests=3, window_seconds=WINDOW, enabled=True)
+    assert allowed(limiter, 3) == 3
+    clock.now = START + 2 * WINDOW
+    assert allowed(limiter, 5) == 3
+
+
+def test_rejected_requests_are_not_counted(clock, backend):
+    limiter = RateLimiter(backend, max_requests=3, window_seconds=WINDOW, enabled=True)
+    assert allowed(limiter, 100) == 3
+
+    # Had the 97 rejections counted, the next window would stay blocked
+    clock.now = START + WINDOW + 40
+    assert allowed(limiter, 1) == 1
+
+
+def test_keys_are_independent(clock, backend):
+    limiter = RateLimiter(backend, max_requests=1, window_seconds=WINDOW, enabled=True)
+    assert allowed(limiter, 2, "198.51.100.1") == 1
+    assert allowed(limiter, 2, "198.51.100.2") == 1
+
+
+def test_zero_limit_rejects_everything(clock, backend):
+    limiter = RateLimiter(backend, max_requests=0, window_seconds=WINDOW, enabled=True)
+    assert allowed(limiter, 3) == 0
+    limiter = RateLimiter(backend, max_requests=5, window_seconds=WINDOW, enabled=True)
+    assert limiter.is_allowed("198.51.100.3", max_requests=0) is False
+
+
+def test_disabled_limiter_allows_everything(clock):
+    backend = MemoryBackend()
+    limiter = RateLimiter(backend, max_requests=0, window_seconds=WINDOW, enabled=False)
+    assert allowed(limiter, 3) == 3
+    assert len(backend) == 0
+
+
+def test_memory_backend_caps_tracked_keys(clock):
+    backend = MemoryBackend(max_keys=10)
+    limiter = RateLimiter(backend, max_requests=1, window_seconds=WINDOW, enabled=True)
+    for i in range(50):
+        limiter.is_allowed(f"10.0.0.{i}")
+    assert len(backend) == 10
+    # The most recent keys survive
+    assert "10.0.0.49" in backend.windows and "10.0.0.0" not in backend.windows
+
+
+def test_memory_backend_evicts_idle_keys(clock):
+    backend = MemoryBackend()
+    limiter = RateLimiter(backend, max_requests=1, window_seconds=WINDOW, enabled=True)
+    limiter.is_allowed("10.0.0.1")
+    clock.now = START + 2 * WINDOW
+    limiter.is_allowed("10.0.0.2")
+    assert list(backend.windows) == ["10.0.0.2"]
+
+
+def test_sqlite_backend_is_shared_between_workers(clock, tmp_path):
+    path = str(tmp_path / "rate_limit.db")
+    workers = [
+        RateLimiter(SQLiteBackend(path), max_requests=5, window_seconds=WINDOW, enabled=True)
+        for _ in range(2)
+    ]
+    assert allowed(workers[0], 3) == 3
+    assert allowed(workers[1], 3) == 2
+    assert allowed(workers[0], 1) == 0
+
+
+def test_sqlite_backend_counts_concurrent_hits_once(clock, tmp_path):
+    limiter = RateLimiter(
+        SQLiteBackend(str(tmp_path / "rate_limit.db")),
+        max_requests=20,
+        window_seconds=WINDOW,
+        enabled=True,
+    )
+    results = []
+
+    def hit():
+        results.append(allowed(limiter, 10))
+
+    threads = [threading.Thread(target=hit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(results) == 20
+
+
+def test_sqlite_backend_prunes_old_windows(clock, tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "rate_limit.db"))
+    limiter = RateLimiter(backend, max_requests=1, window_seconds=WINDOW, enabled=True)
+    limiter.is_allowed("10.0.0.1")
+    clock.now = START + 2 * WINDOW
+    limiter.is_allowed("10.0.0.2")
+    rows = backend._connect().execute("SELECT key FROM rate_limits").fetchall()
+    assert rows == [("10.0.0.2",)]
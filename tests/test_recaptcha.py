@@ -0,0 +1,62 @@
+"""
+reCAPTCHA verification over the shared client
+"""
+
+import asyncio
+
+import pytest
+
+import recaptcha
+from config import settings
+
+
+@pytest.fixture
+def verify(monkeypatch, recaptcha_standin):
+    """Run verify_recaptcha calls against the stand-in on one event loop"""
+    monkeypatch.setattr(settings, "RECAPTCHA_ENABLED", True)
+    monkeypatch.setattr(settings, "RECAPTCHA_SECRET_KEY", "secret")
+    monkeypatch.setattr(settings, "RECAPTCHA_VERIFY_URL", recaptcha_standin.url)
+
+    def verify(*tokens):
+        async def run():
+            try:
+                return [await recaptcha.verify_recaptcha(token) for token in tokens]
+            finally:
+                await recaptcha.close_client()
+
+        return asyncio.run(run())
+
+    return verify
+
+
+def test_verifies_tokens(verify, recaptcha_standin):
+    assert verify("valid", "invalid") == [True, False]
+    assert recaptcha_standin.verifications == 2
+
+
+def test_missing_token_is_rejected_without_a_request(verify, recaptcha_standin):
+    assert verify("") == [False]
+    assert recaptcha_standin.verifications == 0
+
+
+def test_disabled_skips_verification(verify, monkeypatch, recaptcha_standin):
+    monkeypatch.setattr(settings, "RECAPTCHA_ENABLED", False)
+    assert verify("invalid") == [True]
+    assert recaptcha_standin.verifications == 0
+
+
+def test_reuses_one_connection(verify, recaptcha_standin):
+    assert verify(*["valid"] * 5) == [True] * 5
+    assert recaptcha_standin.connections == 1
+
+
+def test_closed_client_is_recreated(verify, recaptcha_standin):
+    assert verify("valid") == [True]
+    assert recaptcha._client is None
+    assert verify("valid") == [True]
+    assert recaptcha_standin.connections == 2
+
+
+def test_unreachable_endpoint_fails_closed(verify, recaptcha_standin):
+    recaptcha_standin.stop()
+    assert verify("valid") == [False]
@@ -0,0 +1,127 @@
+"""
+Pooled SMTP transport against the local stand-in
+"""
+
+import threading
+import time
+from email.message import EmailMessage
+
+import pytest
+
+from smtp_pool import PoolExhausted, SMTPConnectionPool
+
+
+def message(n: int = 0) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "yo@chuco.ai"
+    msg["To"] = "lead@example.com"
+    msg["Subject"] = f"Message {n}"
+    msg.set_content("Hello")
+    return msg
+
+
+@pytest.fixture
+def make_pool(smtp_standin):
+    pools = []
+
+    def make_pool(**options) -> SMTPConnectionPool:
+        options = {"max_size": 2, "noop_after": 60.0, "timeout": 2.0, **options}
+        pool = SMTPConnectionPool(
+            smtp_standin.host,
+            smtp_standin.port,
+            user="",
+            password="",
+            use_tls=False,
+            **options,
+        )
+        pools.append(pool)
+        return pool
+
+    yield make_pool
+    for pool in pools:
+        pool.close()
+
+
+def test_reuses_one_connection(make_pool, smtp_standin):
+    pool = make_pool()
+    for n in range(5):
+        pool.send_message(message(n))
+    assert smtp_standin.messages == 5
+    assert smtp_standin.connections == 1
+    assert len(pool) == 1
+
+
+def test_concurrent_sends_stay_within_max_size(make_pool, smtp_standin):
+    pool = make_pool(max_size=2)
+    threads = [
+        threading.Thread(target=lambda: [pool.send_message(message()) for _ in range(5)])
+        for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert smtp_standin.messages == 30
+    assert smtp_standin.connections <= 2
+
+
+def test_reconnects_when_the_server_drops_a_pooled_connection(make_pool, smtp_standin):
+    pool = make_pool()
+    pool.send_message(message(1))
+    smtp_standin.drop_connections()
+
+    # No NOOP check this soon after use: the send fails and is retried once
+    pool.send_message(message(2))
+    assert smtp_standin.messages == 2
+    assert smtp_standin.connections == 2
+    assert len(pool) == 1
+
+
+def test_noop_check_replaces_a_dead_idle_connection(make_pool, smtp_standin):
+    pool = make_pool(noop_after=0.0)
+    pool.send_message(message(1))
+    smtp_standin.drop_connections()
+    pool.send_message(message(2))
+    assert smtp_standin.messages == 2
+    assert smtp_standin.connections == 2
+
+
+def test_closes_connections_idle_too_long(make_pool, smtp_standin):
+    pool = make_pool(idle_timeout=0.01)
+    pool.send_message(message(1))
+    time.sleep(0.05)
+    pool.send_message(message(2))
+    assert smtp_standin.connections == 2
+    assert len(pool) == 1
+
+
+def test_failed_connect_is_raised_and_frees_its_slot(make_pool, smtp_standin):
+    pool = make_pool(max_size=1)
+    smtp_standin.stop()
+    with pytest.raises(ConnectionError):
+        pool.send_message(message())
+    with pytest.raises(ConnectionError):
+        with pool.connection(wait=0.1):
+            pass
+
+
+def test_wait_for_a_busy_pool_is_bounded(make_pool):
+    pool = make_pool(max_size=1)
+    with pool.connection():
+        started = time.monotonic()
+        with pytest.raises(PoolExhausted):
+            with pool.connection(wait=0.05):
+                pass
+        assert time.monotonic() - started < 1
+    with pool.connection(wait=0.05) as server:
+        assert server.noop()[0] == 250
+
+
+def test_connection_is_discarded_when_the_block_raises(make_pool, smtp_standin):
+    pool = make_pool()
+    with pytest.raises(RuntimeError):
+        with pool.connection():
+            raise RuntimeError("boom")
+    assert len(pool) == 0
+    pool.send_message(message())
+    assert smtp_standin.connections == 2
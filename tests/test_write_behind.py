@@ -0,0 +1,94 @@
+"""
+Write-behind inserts and the email jobs queued with them
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from inquiry_store import InquiryStore
+from models import ContactInquiry, EmailJob, EmailJobStatus
+from write_behind import InquiryWriteBuffer
+
+EMAIL_TYPES = ("inquiry_notification", "inquiry_confirmation")
+
+
+class RecordingQueue:
+    """Counts wake-ups instead of running workers"""
+
+    def __init__(self):
+        self.notified = 0
+
+    def notify(self):
+        self.notified += 1
+
+
+def stored(db):
+    SessionLocal, _ = db
+    with SessionLocal() as session:
+        inquiries = session.scalar(select(func.count(ContactInquiry.id)))
+        jobs = session.execute(
+            select(EmailJob.inquiry_id, EmailJob.email_type, EmailJob.status)
+            .order_by(EmailJob.id)
+        ).all()
+    return inquiries, jobs
+
+
+def test_create_many_queues_jobs_in_the_same_transaction(db, contact_payload):
+    store = InquiryStore(db[1])
+    rows = asyncio.run(
+        store.create_many([contact_payload] * 3, email_types=EMAIL_TYPES)
+    )
+    inquiries, jobs = stored(db)
+    assert inquiries == 3
+    assert jobs == [
+        (row["id"], email_type, EmailJobStatus.PENDING)
+        for row in rows
+        for email_type in EMAIL_TYPES
+    ]
+
+
+def test_failed_job_insert_rolls_back_the_inquiries(db, contact_payload):
+    store = InquiryStore(db[1])
+    with pytest.raises(IntegrityError):
+        asyncio.run(store.create_many([contact_payload] * 2, email_types=(None,)))
+    assert stored(db) == (0, [])
+
+
+def test_create_without_email_types_queues_nothing(db, contact_payload):
+    store = InquiryStore(db[1])
+    asyncio.run(store.create(contact_payload))
+    assert stored(db) == (1, [])
+
+
+@pytest.mark.parametrize("running", [True, False])
+def test_buffer_queues_jobs_and_wakes_the_workers(db, contact_payload, running):
+    queue = RecordingQueue()
+    buffer = InquiryWriteBuffer(
+        InquiryStore(db[1]), max_delay_ms=5, queue=queue, email_types=EMAIL_TYPES
+    )
+
+    async def run():
+        if running:
+            await buffer.start()
+        rows = await asyncio.gather(*(buffer.submit(contact_payload) for _ in range(4)))
+        await buffer.stop()
+        return rows
+
+    rows = asyncio.run(run())
+    inquiries, jobs = stored(db)
+    assert inquiries == 4
+    assert sorted(job.inquiry_id for job in jobs) == sorted(
+        row["id"] for row in rows for _ in EMAIL_TYPES
+    )
+    assert queue.notified >= 1
+
+
+def test_buffer_without_notifications_does_not_wake_the_queue(db, contact_payload):
+    queue = RecordingQueue()
+    buffer = InquiryWriteBuffer(InquiryStore(db[1]), queue=queue, email_types=())
+    asyncio.run(buffer.submit(contact_payload))
+    assert stored(db) == (1, [])
+    assert queue.notified == 0
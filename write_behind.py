@@ -0,0 +1,142 @@
+"""
+Write-behind batching for contact form inserts
+
+Under a burst of submissions, one INSERT and commit per request makes the
+database commit rate the throughput ceiling. InquiryWriteBuffer coalesces
+submissions that arrive within a short window (or until a batch fills) into
+a single multi-row insert and one commit. The email jobs for each inquiry
+are inserted in the same transaction, so a stored lead always has its
+notifications queued. Each request still awaits its own row, so the
+response carries the assigned inquiry ID.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+from email_queue import INQUIRY_EMAIL_TYPES, EmailQueue, email_queue
+from inquiry_store import InquiryStore, inquiry_store
+
+logger = logging.getLogger(__name__)
+
+
+class InquiryWriteBuffer:
+    """Coalesces inquiry inserts into batched transactions"""
+
+    def __init__(
+        self,
+        store: InquiryStore = inquiry_store,
+        max_batch: Optional[int] = None,
+        max_delay_ms: Optional[float] = None,
+        durable: Optional[bool] = None,
+        queue: EmailQueue = email_queue,
+        email_types: Optional[Sequence[str]] = None,
+    ):
+        self.store = store
+        self.max_batch = max_batch or settings.INQUIRY_WRITE_BEHIND_MAX_BATCH
+        self.max_delay = (
+            max_delay_ms
+            if max_delay_ms is not None
+            else settings.INQUIRY_WRITE_BEHIND_MAX_DELAY_MS
+        ) / 1000
+        self.durable = (
+            settings.INQUIRY_WRITE_BEHIND_DURABLE if durable is None else durable
+        )
+        self.queue = queue
+        if email_types is None:
+            email_types = INQUIRY_EMAIL_TYPES if settings.SEND_EMAIL_NOTIFICATIONS else ()
+        self.email_types = tuple(email_types)
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._has_items: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def submit(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue an inquiry and wait until its batch is committed"""
+        if not self.running:
+            # Not started (or shutting down): write straight through
+            row = await self.store.create(data, email_types=self.email_types)
+            self._notify_queue()
+            return row
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((data, future))
+        self._has_items.set()
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+        return await future
+
+    async def flush(self):
+        """Write everything queued so far as one batch"""
+        batch, self._pending = self._pending, []
+        self._batch_full.clear()
+        if not batch:
+            return
+
+        try:
+            rows = await self.store.create_many(
+                [data for data, _ in batch],
+                durable=self.durable,
+                email_types=self.email_types,
+            )
+        except Exception as e:
+            logger.error(f"Failed to write batch of {len(batch)} inquiries: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._notify_queue()
+        for (_, future), row in zip(batch, rows):
+            if not future.done():
+                future.set_result(row)
+
+    def _notify_queue(self):
+        if self.email_types:
+            self.queue.notify()
+
+    async def _run(self):
+        """Flush whenever the window closes or a batch fills up"""
+        while True:
+            await self._has_items.wait()
+            if not self._stopping:
+                try:
+                    await asyncio.wait_for(
+                        self._batch_full.wait(), timeout=self.max_delay
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            self._has_items.clear()
+            await self.flush()
+            if self._stopping and not self._pending:
+                return
+            if self._pending:
+                self._has_items.set()
+
+    async def start(self):
+        """Start the background flusher on the running event loop"""
+        self._has_items = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush anything still queued and stop the flusher"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._batch_full.set()
+        self._has_items.set()
+        await self._task
+        self._task = None
+        await self.flush()
+
+
+# Create global write-behind buffer instance
+inquiry_write_buffer = InquiryWriteBuffer()